@@ -17,7 +17,9 @@ setup(
     author='Benedikt Schwering',
     author_email='bes9584@thi.de',
     license='MIT',
-    packages=find_packages(),
+    packages=find_packages(
+        exclude=['tests'],
+    ),
     install_requires=[
         'opencv-python',
         'pydantic',
@@ -28,12 +30,21 @@ setup(
         'numpy',
         'rich',
     ],
+    extras_require={
+        'arrow': [
+            'pyarrow',
+        ],
+        'dev': [
+            'pytest',
+        ],
+    },
     entry_points={
         'console_scripts': [
             'ipp_slow = src.slow.main:cli',
             'ipp_fast = src.fast.main:cli',
             'ipp_numpy = src.numpy.main:cli',
             'ipp_parser = src.parser.main:cli',
+            'ipp_bench = src.bench.main:cli',
         ],
     },
 )
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
\ No newline at end of file
@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.bench.utils.synthetic import parse_size, save_synthetic_images
+from src.bench.utils.run import run_command, summarize_samples
+from src.parser.utils.cache import warm_image_cache, clear_image_cache
+from src.parser.utils.log import start_trace
+from src.numpy.main import cli as numpy_cli
+from src.slow.main import cli as slow_cli
+from src.fast.main import cli as fast_cli
+from tempfile import TemporaryDirectory
+from itertools import product
+from pathlib import Path
+import pandas as pd
+import platform
+import click
+import json
+import os
+
+# CLI groups of the backends.
+BACKENDS = {
+    'slow': slow_cli,
+    'fast': fast_cli,
+    'numpy': numpy_cli,
+}
+
+# Algorithms, which are measured.
+ALGORITHMS = ['background_subtraction', 'erode', 'dilate']
+
+def __parse_size_argument(context: click.Context, parameter: click.Parameter, value: tuple[str, ...]) -> list[tuple[int, int]]:
+    """ Parse the image sizes of a CLI option.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Click context.
+            parameter (click.Parameter): Click parameter.
+            value (tuple[str, ...]): Image sizes in the format WIDTHxHEIGHT.
+
+        Returns:
+            list[tuple[int, int]]: Width and height of each image size.
+
+        Raises:
+            click.BadParameter: If an image size is invalid.
+    """
+    try:
+        return [
+            parse_size(
+                size=size,
+            )
+                for size in value
+        ]
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
+def __machine_info() -> dict:
+    """ Describe the machine, so results of different machine types can be compared.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Returns:
+            dict: Architecture, processor, number of CPUs and Python version.
+    """
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+@click.group()
+def cli():
+    """ Image Processing Performance - Benchmark
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+    """
+    pass
+
+@cli.command(
+    name='run',
+    help='Benchmark the backends and algorithms on synthetic images.'
+)
+@click.option(
+    '--backend',
+    '-b',
+    type=click.Choice(list(BACKENDS)),
+    default=list(BACKENDS),
+    show_default=True,
+    multiple=True,
+    help='Backends to measure.'
+)
+@click.option(
+    '--algorithm',
+    '-a',
+    type=click.Choice(ALGORITHMS),
+    default=ALGORITHMS,
+    show_default=True,
+    multiple=True,
+    help='Algorithms to measure.'
+)
+@click.option(
+    '--size',
+    '-s',
+    type=str,
+    default=['320x240'],
+    show_default=True,
+    multiple=True,
+    callback=__parse_size_argument,
+    help='Image sizes in the format WIDTHxHEIGHT.'
+)
+@click.option(
+    '--foreground',
+    '-f',
+    type=click.FloatRange(0, 1),
+    default=[0.2],
+    show_default=True,
+    multiple=True,
+    help='Ratios of the foreground pixels.'
+)
+@click.option(
+    '--noise',
+    '-n',
+    type=click.FloatRange(min=0),
+    default=[4.0],
+    show_default=True,
+    multiple=True,
+    help='Standard deviations of the noise on each channel.'
+)
+@click.option(
+    '--threshold',
+    '-t',
+    type=float,
+    default=[20.0],
+    show_default=True,
+    multiple=True,
+    help='Threshold values for background subtraction.'
+)
+@click.option(
+    '--hsv',
+    '-h',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Also measure the HSV mode of background subtraction.'
+)
+@click.option(
+    '--radius',
+    '-r',
+    type=int,
+    default=[2],
+    show_default=True,
+    multiple=True,
+    help='Radius values for erosion and dilation.'
+)
+@click.option(
+    '--threads',
+    '-m',
+    type=click.IntRange(min=1),
+    default=[1],
+    show_default=True,
+    multiple=True,
+    help='Numbers of threads of the numpy backend.'
+)
+@click.option(
+    '--warmup',
+    '-u',
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help='Number of unmeasured runs before the measurement.'
+)
+@click.option(
+    '--repeats',
+    '-k',
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help='Number of measured runs.'
+)
+@click.option(
+    '--seed',
+    '-d',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Seed of the synthetic images.'
+)
+@click.option(
+    '--image-cache',
+    '-c',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images of the commands, which is filled by the unmeasured runs.'
+)
+@click.option(
+    '--output',
+    '-o',
+    type=click.Path(
+        resolve_path=True,
+        dir_okay=False,
+        file_okay=True,
+    ),
+    default='bench.json',
+    show_default=True,
+    help='Result file in JSON or CSV format.'
+)
+def run(backend: tuple[str, ...], algorithm: tuple[str, ...], size: list[tuple[int, int]], foreground: tuple[float, ...], noise: tuple[float, ...], threshold: tuple[float, ...], hsv: bool, radius: tuple[int, ...], threads: tuple[int, ...], warmup: int, repeats: int, seed: int, image_cache: str | None, output: str):
+    """ Benchmark each backend, algorithm and parameter combination on synthetic images.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            backend (tuple[str, ...]): Backends to measure.
+            algorithm (tuple[str, ...]): Algorithms to measure.
+            size (list[tuple[int, int]]): Width and height of each image size.
+            foreground (tuple[float, ...]): Ratios of the foreground pixels.
+            noise (tuple[float, ...]): Standard deviations of the noise on each channel.
+            threshold (tuple[float, ...]): Threshold values for background subtraction.
+            hsv (bool): Also measure the HSV mode of background subtraction.
+            radius (tuple[int, ...]): Radius values for erosion and dilation.
+            threads (tuple[int, ...]): Numbers of threads of the numpy backend.
+            warmup (int): Number of unmeasured runs before the measurement.
+            repeats (int): Number of measured runs.
+            seed (int): Seed of the synthetic images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            output (str): Result file in JSON or CSV format.
+
+        Raises:
+            click.BadParameter: If the result file is neither JSON nor CSV.
+    """
+    output_path = Path(output)
+    if output_path.suffix not in ('.json', '.csv'):
+        raise click.BadParameter(
+            'The result file must end with .json or .csv.',
+            param_hint='--output',
+        )
+
+    # Record the time tracking events of the commands in the trace buffer.
+    start_trace(
+        trace_file=None,
+    )
+
+    # Let all commands map the decoded input images from the same cache directory.
+    cache_arguments = ['-I', image_cache] if image_cache is not None else []
+
+    machine = __machine_info()
+    results: list[dict] = []
+
+    with TemporaryDirectory() as directory:
+        for (width, height), foreground_ratio, noise_deviation in product(size, foreground, noise):
+            # Create the synthetic images once for all backends and algorithms.
+            reference_image_path, image_path, mask_path = save_synthetic_images(
+                directory=Path(directory),
+                width=width,
+                height=height,
+                foreground=foreground_ratio,
+                noise=noise_deviation,
+                seed=seed,
+            )
+
+            for backend_name in backend:
+                # Only the numpy backend uses threads.
+                backend_threads = threads if backend_name == 'numpy' else (None,)
+
+                for algorithm_name in algorithm:
+                    # Collect the parameters and arguments of each case.
+                    cases: list[tuple[dict, list[str]]] = []
+                    for thread_count in backend_threads:
+                        thread_arguments = ['-m', str(thread_count)] if thread_count is not None else []
+
+                        if algorithm_name == 'background_subtraction':
+                            for threshold_value in threshold:
+                                for hsv_mode in ((False, True) if hsv else (False,)):
+                                    cases.append((
+                                        {
+                                            'threshold': threshold_value,
+                                            'hsv': hsv_mode,
+                                            'threads': thread_count,
+                                        },
+                                        [
+                                            '-t', str(threshold_value),
+                                            *(['-h'] if hsv_mode else []),
+                                            *thread_arguments,
+                                            *cache_arguments,
+                                            str(reference_image_path),
+                                            str(image_path),
+                                        ],
+                                    ))
+                        else:
+                            for radius_value in radius:
+                                cases.append((
+                                    {
+                                        'radius': radius_value,
+                                        'threads': thread_count,
+                                    },
+                                    [
+                                        '-r', str(radius_value),
+                                        *thread_arguments,
+                                        *cache_arguments,
+                                        str(mask_path),
+                                    ],
+                                ))
+
+                    command = BACKENDS[backend_name].commands[algorithm_name]
+                    for parameters, arguments in cases:
+                        # Run the command without measuring it, for example to fill caches.
+                        for _ in range(warmup):
+                            run_command(
+                                command=command,
+                                arguments=arguments,
+                            )
+
+                        # Measure the wall time and the stages of each run.
+                        wall_samples: list[int] = []
+                        stage_samples: dict[str, list[int]] = {}
+                        for _ in range(repeats):
+                            wall_time, stages = run_command(
+                                command=command,
+                                arguments=arguments,
+                            )
+
+                            wall_samples.append(wall_time)
+                            for message, stage_time in stages.items():
+                                stage_samples.setdefault(message, []).append(stage_time)
+
+                        wall_median, wall_iqr = summarize_samples(
+                            samples=wall_samples,
+                        )
+
+                        result = {
+                            **machine,
+                            'backend': backend_name,
+                            'algorithm': algorithm_name,
+                            'width': width,
+                            'height': height,
+                            'foreground': foreground_ratio,
+                            'noise': noise_deviation,
+                            **parameters,
+                            'repeats': repeats,
+                            'wall_median_ms': wall_median,
+                            'wall_iqr_ms': wall_iqr,
+                            'megapixels_per_second': width * height / 1_000 / wall_median,
+                        }
+
+                        # Summarize each stage like the wall time.
+                        for message, samples in stage_samples.items():
+                            stage_median, stage_iqr = summarize_samples(
+                                samples=samples,
+                            )
+                            result[f'{message}_median_ms'] = stage_median
+                            result[f'{message}_iqr_ms'] = stage_iqr
+
+                        results.append(result)
+                        click.echo(
+                            f'{backend_name} {algorithm_name} {width}x{height} {parameters}: {wall_median:.3f} ms (IQR {wall_iqr:.3f} ms)',
+                            err=True,
+                        )
+
+    # Write the results with one row per case.
+    if output_path.suffix == '.csv':
+        pd.DataFrame(results).to_csv(
+            output_path,
+            index=False,
+        )
+    else:
+        with open(output_path, 'w') as file:
+            json.dump(
+                results,
+                file,
+                indent=4,
+            )
+
+@cli.group(
+    name='cache',
+    help='Manage the cache directory of decoded input images.'
+)
+def cache():
+    """ Image Processing Performance - Image Cache
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+    """
+    pass
+
+@cache.command(
+    name='warm',
+    help='Decode images into the cache directory, so the first measured run does not decode them.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.argument(
+    'image_cache',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    required=True,
+)
+@click.argument(
+    'image_files',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+    ),
+    required=True,
+    nargs=-1,
+)
+def warm(image_cache_size: int, image_cache: str, image_files: tuple[str, ...]):
+    """ Decode images into the cache directory, which are not cached yet.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            image_cache (str): Cache directory of the decoded input images.
+            image_files (tuple[str, ...]): List of image files.
+    """
+    decoded = warm_image_cache(
+        directory=Path(image_cache),
+        max_size=image_cache_size << 20,
+        image_paths=[Path(image_file) for image_file in image_files],
+    )
+
+    click.echo(
+        f'Decoded {decoded} of {len(image_files)} images into {image_cache}.',
+        err=True,
+    )
+
+@cache.command(
+    name='clear',
+    help='Delete all decoded images of the cache directory.'
+)
+@click.argument(
+    'image_cache',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    required=True,
+)
+def clear(image_cache: str):
+    """ Delete all decoded images of the cache directory.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_cache (str): Cache directory of the decoded input images.
+    """
+    deleted = clear_image_cache(
+        directory=Path(image_cache),
+    )
+
+    click.echo(
+        f'Deleted {deleted} images from {image_cache}.',
+        err=True,
+    )
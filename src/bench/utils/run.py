@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.log import collect_trace
+import numpy as np
+import click
+import time
+
+def run_command(command: click.Command, arguments: list[str]) -> tuple[int, dict[str, int]]:
+    """ Run a CLI command in the current process and measure it.
+        The events on layer 0 split the run into stages, each stage ends with its event.
+        The first stage also contains the initialization of the batch, for example opening the reference image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            command (click.Command): CLI command of a backend.
+            arguments (list[str]): Arguments of the command.
+
+        Returns:
+            (int, dict[str, int]): Wall time and time of each stage by its message in nanoseconds.
+    """
+    # Drop the events of previous runs.
+    collect_trace()
+
+    start = time.perf_counter_ns()
+    command.main(
+        args=arguments,
+        standalone_mode=False,
+    )
+    end = time.perf_counter_ns()
+
+    # Calculate the time between the events on layer 0.
+    # Repeated events, for example of multiple stages of a pipeline, are summed up.
+    stages: dict[str, int] = {}
+    previous = start
+    for timestamp, layer, _, message in collect_trace():
+        if layer == 0:
+            stages[message] = stages.get(message, 0) + timestamp - previous
+            previous = timestamp
+
+    return end - start, stages
+
+def summarize_samples(samples: list[int]) -> tuple[float, float]:
+    """ Summarize the samples of a measurement robust against outliers.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            samples (list[int]): Samples in nanoseconds.
+
+        Returns:
+            (float, float): Median and interquartile range in milliseconds.
+    """
+    first_quartile, median, third_quartile = np.percentile(
+        np.array(samples) / 1_000_000,
+        [25, 50, 75],
+    )
+
+    return float(median), float(third_quartile - first_quartile)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from PIL import Image as PILImage
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Size of a foreground blob in pixels.
+BLOB_SIZE = 16
+
+def parse_size(size: str) -> tuple[int, int]:
+    """ Parse an image size in the format WIDTHxHEIGHT.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            size (str): Image size, for example 640x480.
+
+        Returns:
+            (int, int): Width and height of the image.
+
+        Raises:
+            ValueError: If the size is not in the format WIDTHxHEIGHT with positive values.
+    """
+    width, separator, height = size.lower().partition('x')
+
+    if not separator or not width.isdigit() or not height.isdigit() or int(width) <= 0 or int(height) <= 0:
+        raise ValueError(f'Invalid image size "{size}", expected WIDTHxHEIGHT.')
+
+    return int(width), int(height)
+
+def create_foreground_mask(width: int, height: int, foreground: float, rng: np.random.Generator) -> npt.NDArray[np.bool_]:
+    """ Create a mask of smooth foreground blobs, which cover the given ratio of the pixels.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            width (int): Width of the mask.
+            height (int): Height of the mask.
+            foreground (float): Ratio of the foreground pixels in the range [0, 1].
+            rng (np.random.Generator): Seeded random number generator.
+
+        Returns:
+            np.array: Boolean mask, which is True for foreground pixels.
+    """
+    # Scale a coarse random field up to the image size, so neighboring pixels form blobs.
+    field = rng.random(
+        (max(height // BLOB_SIZE, 1) + 1, max(width // BLOB_SIZE, 1) + 1),
+        dtype=np.float32,
+    )
+    field = cv2.resize(
+        field,
+        (width, height),
+        interpolation=cv2.INTER_LINEAR,
+    )
+
+    # Threshold the field at the quantile of the foreground ratio.
+    if foreground <= 0:
+        return np.zeros((height, width), dtype=np.bool_)
+
+    return field >= np.quantile(field, 1 - min(foreground, 1))
+
+def create_synthetic_images(width: int, height: int, foreground: float, noise: float, seed: int) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8], npt.NDArray[np.uint8]]:
+    """ Create a deterministic reference image, an image with foreground blobs and its mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            width (int): Width of the images.
+            height (int): Height of the images.
+            foreground (float): Ratio of the foreground pixels in the range [0, 1].
+            noise (float): Standard deviation of the gaussian noise on each channel.
+            seed (int): Seed of the random number generator.
+
+        Returns:
+            (np.array, np.array, np.array): Reference image, image and mask as RGB images.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Create a smooth background with a horizontal and a vertical gradient.
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)
+    background = np.empty((height, width, 3), dtype=np.float32)
+    background[..., 0] = x[np.newaxis, :]
+    background[..., 1] = y[:, np.newaxis]
+    background[..., 2] = 128
+
+    # Create the foreground blobs with the inverted background color.
+    mask = create_foreground_mask(
+        width=width,
+        height=height,
+        foreground=foreground,
+        rng=rng,
+    )
+    scene = background.copy()
+    scene[mask] = 255 - scene[mask]
+
+    # Add independent noise to the reference image and the image.
+    reference_image = background + rng.normal(0, noise, background.shape)
+    image = scene + rng.normal(0, noise, scene.shape)
+
+    # Create the mask as black and white RGB image.
+    mask_image = np.zeros((height, width, 3), dtype=np.uint8)
+    mask_image[mask] = 255
+
+    return (
+        np.clip(reference_image, 0, 255).round().astype(np.uint8),
+        np.clip(image, 0, 255).round().astype(np.uint8),
+        mask_image,
+    )
+
+def save_synthetic_images(directory: Path, width: int, height: int, foreground: float, noise: float, seed: int) -> tuple[Path, Path, Path]:
+    """ Create deterministic synthetic images and save them as PNG files.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path): Directory of the image files.
+            width (int): Width of the images.
+            height (int): Height of the images.
+            foreground (float): Ratio of the foreground pixels in the range [0, 1].
+            noise (float): Standard deviation of the gaussian noise on each channel.
+            seed (int): Seed of the random number generator.
+
+        Returns:
+            (Path, Path, Path): Paths of the reference image, the image and the mask.
+    """
+    images = create_synthetic_images(
+        width=width,
+        height=height,
+        foreground=foreground,
+        noise=noise,
+        seed=seed,
+    )
+
+    # Save each image with a name unique for its parameters.
+    paths: list[Path] = []
+    for name, image in zip(('reference', 'image', 'mask'), images):
+        path = directory / f'{name}_{width}x{height}_{foreground}_{noise}.png'
+        PILImage.fromarray(image).save(
+            fp=path,
+        )
+        paths.append(path)
+
+    return paths[0], paths[1], paths[2]
@@ -9,14 +9,20 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.fast.utils.image import open_project_image, save_project_image
+from src.fast.utils.buffer import open_buffer_image, save_buffer_image
 from src.fast.utils.hsv import rgb_to_hsv_pixel, weighted_hsv_distance
+from src.parser.utils.roi import roi_spans, roi_indices, fill_outside_roi
 from src.parser.utils.log import log
 from pathlib import Path
 
 WHITE_PIXEL = (255, 255, 255)
 BLACK_PIXEL = (0, 0, 0)
 
-def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image_path: Path, input_image_path: Path, output_image_path: Path):
+# Pixels as 3 bytes for images with flat RGB buffer.
+WHITE_BYTES = bytes(WHITE_PIXEL)
+BLACK_BYTES = bytes(BLACK_PIXEL)
+
+def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image: tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None], input_image_path: Path, output_image_path: Path):
     """ Apply Background Subtraction on an image.
 
         Author:
@@ -26,17 +32,16 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): Flag to convert the image to HSV.
             hsv_weights (tuple[float, float, float]): Weights for the HSV values.
-            reference_image_path (Path): Reference path for image file.
+            reference_image (tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None]): Reference image opened once for the batch.
             input_image_path (Path): Input path for image file.
             output_image_path (Path): Output path for image file.
 
         Raises:
             ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the HSV flag is set but the reference image has no HSV pixels.
     """
-    # Open the reference image and the input image.
-    reference_image = open_project_image(
-        image_path=reference_image_path,
-    )
+    # Open the input image.
+    # The reference image is already opened once for the whole batch.
     image = open_project_image(
         image_path=input_image_path,
     )
@@ -46,13 +51,26 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     if reference_image[0] != image[0] or reference_image[1] != image[1]:
         raise ValueError('The reference image and the input image must have the same dimensions.')
 
-    # Iterate over each pixel in the image.
-    for index in range(image[0] * image[1]):
+    # Check if the reference pixels were converted to HSV if the flag is set.
+    if hsv and reference_image[3] is None:
+        raise ValueError('The reference image must be opened with HSV mode to use HSV mode.')
+
+    # Get the spans of the regions of interest, pixels outside are black.
+    spans = roi_spans(
+        width=image[0],
+        height=image[1],
+    )
+
+    # Iterate over each pixel in the regions of interest of the image.
+    for index in roi_indices(
+        spans=spans,
+        width=image[0],
+        height=image[1],
+    ):
         if hsv:
-            # Convert the RGB pixels to HSV without saving the whole image.
-            hsv_reference_pixel = rgb_to_hsv_pixel(
-                rgb_pixel=reference_image[2][index],
-            )
+            # Convert the RGB pixel to HSV without saving the whole image.
+            # The reference pixels are already converted once for the whole batch.
+            hsv_reference_pixel = reference_image[3][index]
             hsv_pixel = rgb_to_hsv_pixel(
                 rgb_pixel=image[2][index],
             )
@@ -76,6 +94,14 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             image[2][index] = WHITE_PIXEL
         else:
             image[2][index] = BLACK_PIXEL
+
+    # Set the pixels outside the regions of interest to black.
+    fill_outside_roi(
+        values=image[2],
+        spans=spans,
+        width=image[0],
+        fill=[BLACK_PIXEL],
+    )
     log('finish background subtraction')
 
     # Save the image to the output path.
@@ -84,3 +110,166 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
         project_image=image,
     )
     log('finish postprocessing')
+
+def background_subtraction_mask(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image: tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None], image: tuple[int, int, list[tuple[int, int, int]]]) -> list[bool]:
+    """ Calculate the foreground mask of an image in memory.
+        The mask is True where the output image of the background subtraction is white.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV values.
+            reference_image (tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None]): Reference image opened once for the batch.
+            image (tuple[int, int, list[tuple[int, int, int]]]): Image.
+
+        Returns:
+            list[bool]: Mask of the image.
+
+        Raises:
+            ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the HSV flag is set but the reference image has no HSV pixels.
+    """
+    # Check if the reference image and the input image have the same dimensions.
+    if reference_image[0] != image[0] or reference_image[1] != image[1]:
+        raise ValueError('The reference image and the input image must have the same dimensions.')
+
+    # Check if the reference pixels were converted to HSV if the flag is set.
+    if hsv and reference_image[3] is None:
+        raise ValueError('The reference image must be opened with HSV mode to use HSV mode.')
+
+    # Create an empty mask.
+    mask = [False] * (image[0] * image[1])
+
+    # Get the spans of the regions of interest, pixels outside stay False.
+    spans = roi_spans(
+        width=image[0],
+        height=image[1],
+    )
+
+    # Iterate over each pixel in the regions of interest of the image.
+    for index in roi_indices(
+        spans=spans,
+        width=image[0],
+        height=image[1],
+    ):
+        if hsv:
+            # Convert the RGB pixel to HSV without saving the whole image.
+            # The reference pixels are already converted once for the whole batch.
+            hsv_reference_pixel = reference_image[3][index]
+            hsv_pixel = rgb_to_hsv_pixel(
+                rgb_pixel=image[2][index],
+            )
+
+            # Calculate the difference between the HSV pixels.
+            difference = weighted_hsv_distance(
+                pixel1=hsv_reference_pixel,
+                pixel2=hsv_pixel,
+                weights=hsv_weights,
+            )
+        else:
+            reference_pixel = reference_image[2][index]
+            pixel = image[2][index]
+
+            # Calculate the difference between the RGB pixels.
+            difference = abs(reference_pixel[0] - pixel[0]) / 3 + abs(reference_pixel[1] - pixel[1]) / 3 + abs(reference_pixel[2] - pixel[2]) / 3
+
+        # If the difference is greater than the threshold, set the mask.
+        mask[index] = difference > threshold
+
+    return mask
+
+def background_subtraction_buffer(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image: tuple[int, int, bytearray, list[tuple[int, int, int]] | None], input_image_path: Path, output_image_path: Path):
+    """ Apply Background Subtraction on an image with flat RGB buffer.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV values.
+            reference_image (tuple[int, int, bytearray, list[tuple[int, int, int]] | None]): Reference image with flat RGB buffer opened once for the batch.
+            input_image_path (Path): Input path for image file.
+            output_image_path (Path): Output path for image file.
+
+        Raises:
+            ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the HSV flag is set but the reference image has no HSV pixels.
+    """
+    # Open the input image.
+    # The reference image is already opened once for the whole batch.
+    image = open_buffer_image(
+        image_path=input_image_path,
+    )
+    log('finish preprocessing')
+
+    # Check if the reference image and the input image have the same dimensions.
+    if reference_image[0] != image[0] or reference_image[1] != image[1]:
+        raise ValueError('The reference image and the input image must have the same dimensions.')
+
+    # Check if the reference pixels were converted to HSV if the flag is set.
+    if hsv and reference_image[3] is None:
+        raise ValueError('The reference image must be opened with HSV mode to use HSV mode.')
+
+    reference_buffer = reference_image[2]
+    buffer = image[2]
+
+    # Get the spans of the regions of interest, pixels outside are black.
+    spans = roi_spans(
+        width=image[0],
+        height=image[1],
+    )
+
+    # Iterate over each pixel in the regions of interest of the image.
+    # The channels of the pixel at index i start at offset 3 * i.
+    for index in roi_indices(
+        spans=spans,
+        width=image[0],
+        height=image[1],
+    ):
+        offset = 3 * index
+
+        if hsv:
+            # Convert the RGB pixel to HSV without saving the whole image.
+            # The reference pixels are already converted once for the whole batch.
+            hsv_reference_pixel = reference_image[3][index]
+            hsv_pixel = rgb_to_hsv_pixel(
+                rgb_pixel=buffer[offset:offset + 3],
+            )
+
+            # Calculate the difference between the HSV pixels.
+            difference = weighted_hsv_distance(
+                pixel1=hsv_reference_pixel,
+                pixel2=hsv_pixel,
+                weights=hsv_weights,
+            )
+        else:
+            # Calculate the difference between the RGB pixels.
+            difference = abs(reference_buffer[offset] - buffer[offset]) / 3 + abs(reference_buffer[offset + 1] - buffer[offset + 1]) / 3 + abs(reference_buffer[offset + 2] - buffer[offset + 2]) / 3
+
+        # If the difference is greater than the threshold, set the pixel to white.
+        # Otherwise, set the pixel to black.
+        if difference > threshold:
+            buffer[offset:offset + 3] = WHITE_BYTES
+        else:
+            buffer[offset:offset + 3] = BLACK_BYTES
+
+    # Set the pixels outside the regions of interest to black.
+    fill_outside_roi(
+        values=buffer,
+        spans=spans,
+        width=image[0],
+        fill=BLACK_BYTES,
+        size=3,
+    )
+    log('finish background subtraction')
+
+    # Save the image to the output path.
+    save_buffer_image(
+        image_path=output_image_path,
+        buffer_image=image,
+    )
+    log('finish postprocessing')
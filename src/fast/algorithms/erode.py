@@ -9,13 +9,16 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.fast.utils.image import open_project_image, save_project_image, create_project_image, any_neighbors_equal_pixel
+from src.fast.utils.buffer import open_buffer_image, save_buffer_image, create_buffer_image, buffer_pixel_matches, any_neighbors_equal_buffer_pixel
+from src.fast.utils.morphology import any_neighbors_equal_count, any_neighbors_count, crop_box, paste_box
+from src.parser.utils.roi import roi_spans, roi_indices, roi_bounds, fill_outside_roi
 from src.parser.utils.log import log
 from pathlib import Path
 
 WHITE_PIXEL = (255, 255, 255)
 BLACK_PIXEL = (0, 0, 0)
 
-def erode(radius: int, input_image_path: Path, output_image_path: Path):
+def erode(radius: int, engine: str, input_image_path: Path, output_image_path: Path):
     """ Apply Erosion on an image.
 
         Author:
@@ -23,6 +26,7 @@ def erode(radius: int, input_image_path: Path, output_image_path: Path):
 
         Args:
             radius (int): Radius value for erosion.
+            engine (str): Engine for the neighborhood check, window rescans the window of each pixel and count slides running counts.
             input_image_path (Path): Input path for image file.
             output_image_path (Path): Output path for image file.
     """
@@ -37,19 +41,71 @@ def erode(radius: int, input_image_path: Path, output_image_path: Path):
         height=input_image[1],
         init_pixel=WHITE_PIXEL,
     )
+
+    # Get the spans of the regions of interest, pixels outside are black.
+    spans = roi_spans(
+        width=input_image[0],
+        height=input_image[1],
+    )
+    fill_outside_roi(
+        values=output_image[2],
+        spans=spans,
+        width=input_image[0],
+        fill=[BLACK_PIXEL],
+    )
     log('finish preprocessing')
 
-    # Iterate over each pixel in the image.
-    for index in range(input_image[0] * input_image[1]):
-        # Check if any neighbor pixels is black.
-        if any_neighbors_equal_pixel(
-            image=input_image,
-            radius=radius,
-            index=index,
-            check_pixel=BLACK_PIXEL,
+    if engine == 'count':
+        # Check the neighborhood of the pixels in the regions of interest with running counts of the black pixels.
+        # Only the bounding box of the regions extended by the radius is counted.
+        box = roi_bounds(
+            spans=spans,
+            width=input_image[0],
+            height=input_image[1],
+            margin=radius,
+        )
+        neighbors = paste_box(
+            values=any_neighbors_equal_count(
+                width=box[2] - box[0],
+                height=box[3] - box[1],
+                values=crop_box(
+                    values=input_image[2],
+                    width=input_image[0],
+                    box=box,
+                ),
+                radius=radius,
+                check_value=BLACK_PIXEL,
+            ),
+            width=input_image[0],
+            height=input_image[1],
+            box=box,
+            fill=False,
+        )
+
+        # Set the pixels in the regions of interest with a black neighbor to black.
+        for index in roi_indices(
+            spans=spans,
+            width=input_image[0],
+            height=input_image[1],
+        ):
+            if neighbors[index]:
+                output_image[2][index] = BLACK_PIXEL
+    else:
+        # Iterate over each pixel in the regions of interest of the image.
+        for index in roi_indices(
+            spans=spans,
+            width=input_image[0],
+            height=input_image[1],
         ):
-            # Set the pixel to black.
-            output_image[2][index] = BLACK_PIXEL
+            # Check if any neighbor pixels is black.
+            if any_neighbors_equal_pixel(
+                image=input_image,
+                radius=radius,
+                index=index,
+                check_pixel=BLACK_PIXEL,
+            ):
+                # Set the pixel to black.
+                output_image[2][index] = BLACK_PIXEL
     log('finish erode')
 
     # Save the image to the output path.
@@ -58,3 +114,111 @@ def erode(radius: int, input_image_path: Path, output_image_path: Path):
         project_image=output_image,
     )
     log('finish postprocessing')
+
+def erode_buffer(radius: int, engine: str, input_image_path: Path, output_image_path: Path):
+    """ Apply Erosion on an image with flat RGB buffer.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            radius (int): Radius value for erosion.
+            engine (str): Engine for the neighborhood check, window rescans the window of each pixel and count slides running counts.
+            input_image_path (Path): Input path for image file.
+            output_image_path (Path): Output path for image file.
+    """
+    # Open the input image.
+    input_image = open_buffer_image(
+        image_path=input_image_path,
+    )
+
+    # Create a white project image as output image.
+    output_image = create_buffer_image(
+        width=input_image[0],
+        height=input_image[1],
+        init_pixel=WHITE_PIXEL,
+    )
+
+    # Get the spans of the regions of interest, pixels outside are black.
+    spans = roi_spans(
+        width=input_image[0],
+        height=input_image[1],
+    )
+    fill_outside_roi(
+        values=output_image[2],
+        spans=spans,
+        width=input_image[0],
+        fill=bytes(BLACK_PIXEL),
+        size=3,
+    )
+    log('finish preprocessing')
+
+    # The channels of a pixel are written together as 3 bytes.
+    check_pixel = bytes(BLACK_PIXEL)
+
+    if engine == 'count':
+        # Check the neighborhood of the pixels in the regions of interest with running counts of the black pixels.
+        # Only the bounding box of the regions extended by the radius is counted.
+        box = roi_bounds(
+            spans=spans,
+            width=input_image[0],
+            height=input_image[1],
+            margin=radius,
+        )
+        neighbors = paste_box(
+            values=any_neighbors_count(
+                width=box[2] - box[0],
+                height=box[3] - box[1],
+                matches=buffer_pixel_matches(
+                    buffer_image=(
+                        box[2] - box[0],
+                        box[3] - box[1],
+                        crop_box(
+                            values=input_image[2],
+                            width=input_image[0],
+                            box=box,
+                            size=3,
+                        ),
+                    ),
+                    check_pixel=BLACK_PIXEL,
+                ),
+                radius=radius,
+            ),
+            width=input_image[0],
+            height=input_image[1],
+            box=box,
+            fill=False,
+        )
+
+        # Set the pixels in the regions of interest with a black neighbor to black.
+        for index in roi_indices(
+            spans=spans,
+            width=input_image[0],
+            height=input_image[1],
+        ):
+            if neighbors[index]:
+                output_image[2][3 * index:3 * index + 3] = check_pixel
+    else:
+        # Iterate over each pixel in the regions of interest of the image.
+        for index in roi_indices(
+            spans=spans,
+            width=input_image[0],
+            height=input_image[1],
+        ):
+            # Check if any neighbor pixels is black.
+            if any_neighbors_equal_buffer_pixel(
+                buffer_image=input_image,
+                radius=radius,
+                index=index,
+                check_pixel=check_pixel,
+            ):
+                # Set the pixel to black.
+                output_image[2][3 * index:3 * index + 3] = check_pixel
+    log('finish erode')
+
+    # Save the image to the output path.
+    save_buffer_image(
+        image_path=output_image_path,
+        buffer_image=output_image,
+    )
+    log('finish postprocessing')
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.fast.utils.mask import project_image_to_mask, mask_to_project_image, any_neighbors_equal_value, WHITE_PIXEL, BLACK_PIXEL
+from src.fast.algorithms.background_subtraction import background_subtraction_mask
+from src.fast.utils.morphology import any_neighbors_equal_count, crop_box, paste_box
+from src.parser.utils.roi import roi_spans, roi_indices, roi_bounds, fill_outside_roi
+from src.fast.utils.image import open_project_image, save_project_image
+from src.parser.utils.log import log
+from pathlib import Path
+
+def pipeline(stages: list[tuple[str, dict]], hsv: bool, hsv_weights: tuple[float, float, float], engine: str, reference_image: tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None] | None, input_image_path: Path, output_image_path: Path):
+    """ Apply a pipeline of stages on an image.
+        All stages work in memory on a single mask, which is True for white pixels.
+        Only the input image is opened and only the output image of the last stage is saved.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            stages (list[tuple[str, dict]]): Name and parameters of each stage.
+            hsv (bool): Flag to convert the image to HSV for background subtraction.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV values.
+            engine (str): Engine for the neighborhood check.
+            reference_image (tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None] | None): Reference image opened once for the batch, required for background subtraction.
+            input_image_path (Path): Input path for image file.
+            output_image_path (Path): Output path for image file.
+
+        Raises:
+            ValueError: If background subtraction is used without a reference image.
+            ValueError: If the reference image does not match the input image.
+    """
+    # Open the input image.
+    input_image = open_project_image(
+        image_path=input_image_path,
+    )
+
+    # Convert the input image to a mask like the first stage would.
+    # Erosion keeps all pixels, which are not black, while dilation only keeps white pixels.
+    if stages[0][0] == 'erode':
+        mask = project_image_to_mask(
+            image=input_image,
+            check_pixel=BLACK_PIXEL,
+            equal=False,
+        )
+    elif stages[0][0] == 'dilate':
+        mask = project_image_to_mask(
+            image=input_image,
+            check_pixel=WHITE_PIXEL,
+            equal=True,
+        )
+
+    # Get the spans of the regions of interest.
+    # Only values inside are processed, values outside are False after each stage.
+    spans = roi_spans(
+        width=input_image[0],
+        height=input_image[1],
+    )
+    log('finish preprocessing')
+
+    for name, parameters in stages:
+        if name == 'bs':
+            if reference_image is None:
+                raise ValueError('Background subtraction requires a reference image.')
+
+            # Calculate the foreground mask of the input image.
+            mask = (
+                input_image[0],
+                input_image[1],
+                background_subtraction_mask(
+                    threshold=parameters['threshold'],
+                    hsv=hsv,
+                    hsv_weights=hsv_weights,
+                    reference_image=reference_image,
+                    image=input_image,
+                ),
+            )
+            log('finish background subtraction')
+        elif name in ('erode', 'dilate'):
+            # Erosion sets a value to False if any neighbor is False.
+            # Dilation sets a value to True if any neighbor is True.
+            check_value = name == 'dilate'
+
+            if engine == 'count':
+                # Check the neighborhood of the values in the regions of interest with running counts of the check value.
+                # Only the bounding box of the regions extended by the radius is counted.
+                box = roi_bounds(
+                    spans=spans,
+                    width=mask[0],
+                    height=mask[1],
+                    margin=parameters['radius'],
+                )
+                neighbors = paste_box(
+                    values=any_neighbors_equal_count(
+                        width=box[2] - box[0],
+                        height=box[3] - box[1],
+                        values=crop_box(
+                            values=mask[2],
+                            width=mask[0],
+                            box=box,
+                        ),
+                        radius=parameters['radius'],
+                        check_value=check_value,
+                    ),
+                    width=mask[0],
+                    height=mask[1],
+                    box=box,
+                    fill=False,
+                )
+
+                # Set the values with a matching neighbor to the check value.
+                values = [
+                    check_value if neighbor else not check_value
+                        for neighbor in neighbors
+                ]
+            else:
+                # Create a new mask, because the neighbors are read from the previous mask.
+                values = [not check_value] * (mask[0] * mask[1])
+
+                # Iterate over each value in the regions of interest of the mask.
+                for index in roi_indices(
+                    spans=spans,
+                    width=mask[0],
+                    height=mask[1],
+                ):
+                    if any_neighbors_equal_value(
+                        mask=mask,
+                        radius=parameters['radius'],
+                        index=index,
+                        check_value=check_value,
+                    ):
+                        values[index] = check_value
+
+            # Set the values outside the regions of interest to False.
+            fill_outside_roi(
+                values=values,
+                spans=spans,
+                width=mask[0],
+                fill=[False],
+            )
+
+            mask = (
+                mask[0],
+                mask[1],
+                values,
+            )
+            log(f'finish {name}')
+
+    # Convert the mask to a project image.
+    output_image = mask_to_project_image(
+        mask=mask,
+    )
+
+    # Save the image to the output path.
+    save_project_image(
+        image_path=output_image_path,
+        project_image=output_image,
+    )
+    log('finish postprocessing')
@@ -9,19 +9,276 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.fast.algorithms.background_subtraction import background_subtraction as background_subtraction_algorithm
+from src.fast.algorithms.background_subtraction import background_subtraction_buffer as background_subtraction_buffer_algorithm
 from src.fast.algorithms.dilate import dilate as dilate_algorithm
+from src.fast.algorithms.dilate import dilate_buffer as dilate_buffer_algorithm
 from src.fast.algorithms.erode import erode as erode_algorithm
+from src.fast.algorithms.erode import erode_buffer as erode_buffer_algorithm
+from src.fast.algorithms.pipeline import pipeline as pipeline_algorithm
+from src.fast.utils.reference import open_reference_image, open_reference_buffer_image
+from src.fast.utils.hsv import use_hsv_lut
+from src.fast.utils.buffer import open_buffer_image, LAYOUTS
+from src.fast.utils.image import open_project_image
+from src.fast.utils.morphology import ENGINES
+from src.parser.utils.log import set_log_base, start_trace
+from src.parser.utils.pipeline import parse_pipeline
+from src.parser.utils.codec import use_codec, output_image_path, CODECS
+from src.parser.utils.roi import use_roi, parse_roi
+from src.parser.utils.cache import use_image_cache
+from src.parser.utils.batch import run_batch
 from pathlib import Path
 import click
 
+# Shared parameters of a batch, set once per process by the batch initializer.
+batch_parameters = {}
+
+def __init_batch(**parameters):
+    """ Initialize the shared parameters of a batch.
+        The reference image file is opened once and replaced by the reference image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            parameters (dict): Shared parameters of the batch.
+    """
+    set_log_base()
+    batch_parameters.clear()
+    batch_parameters.update(parameters)
+
+    # Write all output images of the batch with the selected codec.
+    use_codec(
+        name=batch_parameters.pop('codec', 'pil'),
+        compression_level=batch_parameters.pop('compression', 6),
+    )
+
+    # Process only the regions of interest of all images of the batch.
+    use_roi(
+        roi=batch_parameters.pop('roi', ()),
+    )
+
+    # Map the decoded input images of the batch from the image cache.
+    image_cache = batch_parameters.pop('image_cache', None)
+    use_image_cache(
+        directory=Path(image_cache) if image_cache is not None else None,
+        max_size=batch_parameters.pop('image_cache_size', 1024) << 20,
+    )
+
+    # Use the HSV lookup table for all conversions of the batch.
+    # The table is built once into its cache directory and memory mapped by each process.
+    hsv_lut = batch_parameters.pop('hsv_lut', None)
+    if hsv_lut is not None and parameters['hsv']:
+        use_hsv_lut(
+            directory=Path(hsv_lut),
+        )
+
+    # Open the reference image once for the whole batch.
+    reference_image_file = batch_parameters.pop('reference_image_file', None)
+    if reference_image_file is not None:
+        # Open the reference image in the layout of the input images.
+        open_reference = open_reference_buffer_image if parameters.get('layout') == 'bytes' else open_reference_image
+
+        batch_parameters['reference_image'] = open_reference(
+            image_path=Path(reference_image_file),
+            hsv=parameters['hsv'],
+        )
+
+def __background_subtraction_job(image_file: str):
+    """ Background Subtraction on a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform background subtraction on the image in the selected layout.
+    algorithm = background_subtraction_buffer_algorithm if batch_parameters['layout'] == 'bytes' else background_subtraction_algorithm
+    algorithm(
+        threshold=batch_parameters['threshold'],
+        hsv=batch_parameters['hsv'],
+        hsv_weights=batch_parameters['hsv_weights'],
+        reference_image=batch_parameters['reference_image'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='background_subtraction',
+        ),
+    )
+
+def __erode_job(image_file: str):
+    """ Erode a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform erosion on the image in the selected layout.
+    algorithm = erode_buffer_algorithm if batch_parameters['layout'] == 'bytes' else erode_algorithm
+    algorithm(
+        radius=batch_parameters['radius'],
+        engine=batch_parameters['engine'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='erode',
+        ),
+    )
+
+def __dilate_job(image_file: str):
+    """ Dilate a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform dilation on the image in the selected layout.
+    algorithm = dilate_buffer_algorithm if batch_parameters['layout'] == 'bytes' else dilate_algorithm
+    algorithm(
+        radius=batch_parameters['radius'],
+        engine=batch_parameters['engine'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='dilate',
+        ),
+    )
+
+def __pipeline_job(image_file: str):
+    """ Pipeline of stages on a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform the pipeline on the image.
+    pipeline_algorithm(
+        stages=batch_parameters['stages'],
+        hsv=batch_parameters['hsv'],
+        hsv_weights=batch_parameters['hsv_weights'],
+        engine=batch_parameters['engine'],
+        reference_image=batch_parameters.get('reference_image'),
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='pipeline',
+        ),
+    )
+
+def __parse_pipeline_argument(context: click.Context, parameter: click.Parameter, value: str) -> list[tuple[str, dict]]:
+    """ Parse the pipeline argument of a CLI command.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Context of the CLI command.
+            parameter (click.Parameter): Pipeline argument.
+            value (str): Pipeline of stages.
+
+        Returns:
+            list[tuple[str, dict]]: Name and parameters of each stage.
+
+        Raises:
+            click.BadParameter: If the pipeline is invalid.
+    """
+    try:
+        return parse_pipeline(
+            pipeline=value,
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
+def __parse_roi_option(context: click.Context, parameter: click.Parameter, value: tuple[str, ...]) -> tuple[tuple[int, int, int, int] | str, ...]:
+    """ Parse the regions of interest of a CLI command.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Context of the CLI command.
+            parameter (click.Parameter): ROI option.
+            value (tuple[str, ...]): Rectangles as x,y,width,height or paths of binary ROI images.
+
+        Returns:
+            tuple[tuple[int, int, int, int] | str, ...]: Rectangles and paths of the ROI images.
+
+        Raises:
+            click.BadParameter: If a region is invalid.
+    """
+    try:
+        return tuple(
+            parse_roi(
+                value=region,
+            )
+                for region in value
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
 @click.group()
-def cli():
+@click.option(
+    '--console',
+    '-c',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Print the time tracking events directly with rich.'
+)
+@click.option(
+    '--trace-file',
+    '-T',
+    type=click.Path(
+        dir_okay=False,
+        file_okay=True,
+        allow_dash=True,
+    ),
+    default='-',
+    show_default=True,
+    help='File for the recorded time tracking events, written at exit.'
+)
+def cli(console: bool, trace_file: str):
     """ Image Processing Performance - Fast Implementation
 
         Author:
             Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            console (bool): Print the time tracking events directly with rich.
+            trace_file (str): File for the recorded time tracking events, written at exit.
     """
-    pass
+    # Record the time tracking events in the trace buffer unless the console is requested.
+    # This keeps the overhead of the time tracking low.
+    if not console:
+        start_trace(
+            trace_file=trace_file,
+        )
 
 @cli.command(
     name='background_subtraction',
@@ -51,6 +308,81 @@ def cli():
     show_default=True,
     help='HSV weights for background subtraction.'
 )
+@click.option(
+    '--hsv-lut',
+    '-L',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the HSV lookup table, which replaces the HSV conversion.'
+)
+@click.option(
+    '--layout',
+    '-l',
+    type=click.Choice(LAYOUTS),
+    default='tuples',
+    show_default=True,
+    help='Layout of the images, lists of pixel tuples or flat RGB buffers.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'reference_image_file',
     type=click.Path(
@@ -68,7 +400,7 @@ def cli():
     required=True,
     nargs=-1,
 )
-def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image_file: str, image_files: tuple[str, ...]):
+def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], hsv_lut: str | None, layout: str, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, reference_image_file: str, image_files: tuple[str, ...]):
     """ Background Subtraction on a set of images.
 
         Author:
@@ -78,25 +410,41 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): HSV mode for background subtraction.
             hsv_weights (tuple[float, float, float]): HSV weights for background subtraction.
+            hsv_lut (str | None): Cache directory of the HSV lookup table.
+            layout (str): Layout of the images, lists of pixel tuples or flat RGB buffers.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             reference_image_file (str): Reference image file.
             image_files (tuple[str, ...]): List of image files.
     """
-    # Convert the reference image file to a Path object.
-    reference_image_path = Path(reference_image_file)
-
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform background subtraction on the image.
-        background_subtraction_algorithm(
-            threshold=threshold,
-            hsv=hsv,
-            hsv_weights=hsv_weights,
-            reference_image_path=reference_image_path,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'background_subtraction_{image_path.name}',
-        )
+    # Perform background subtraction on each image.
+    # The reference image is opened once per process.
+    run_batch(
+        function=__background_subtraction_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'layout': layout,
+            'threshold': threshold,
+            'hsv': hsv,
+            'hsv_weights': hsv_weights,
+            'hsv_lut': hsv_lut,
+            'reference_image_file': reference_image_file,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_buffer_image if layout == 'bytes' else open_project_image,
+    )
 
 @cli.command(
     name='erode',
@@ -110,6 +458,79 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     show_default=True,
     help='Radius value for erosion.'
 )
+@click.option(
+    '--engine',
+    '-e',
+    type=click.Choice(ENGINES),
+    default='window',
+    show_default=True,
+    help='Engine for the neighborhood check.'
+)
+@click.option(
+    '--layout',
+    '-l',
+    type=click.Choice(LAYOUTS),
+    default='tuples',
+    show_default=True,
+    help='Layout of the images, lists of pixel tuples or flat RGB buffers.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'image_files',
     type=click.Path(
@@ -119,7 +540,7 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     required=True,
     nargs=-1,
 )
-def erode(radius: int, image_files: tuple[str, ...]):
+def erode(radius: int, engine: str, layout: str, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, image_files: tuple[str, ...]):
     """ Erode a set of images.
 
         Author:
@@ -127,18 +548,36 @@ def erode(radius: int, image_files: tuple[str, ...]):
 
         Args:
             radius (int): Radius value for erosion.
+            engine (str): Engine for the neighborhood check.
+            layout (str): Layout of the images, lists of pixel tuples or flat RGB buffers.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             image_files (tuple[str, ...]): List of image files.
     """
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform erosion on the image.
-        erode_algorithm(
-            radius=radius,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'erode_{image_path.name}',
-        )
+    # Perform erosion on each image.
+    run_batch(
+        function=__erode_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'layout': layout,
+            'radius': radius,
+            'engine': engine,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_buffer_image if layout == 'bytes' else open_project_image,
+    )
 
 @cli.command(
     name='dilate',
@@ -152,6 +591,79 @@ def erode(radius: int, image_files: tuple[str, ...]):
     show_default=True,
     help='Radius value for dilation.'
 )
+@click.option(
+    '--engine',
+    '-e',
+    type=click.Choice(ENGINES),
+    default='window',
+    show_default=True,
+    help='Engine for the neighborhood check.'
+)
+@click.option(
+    '--layout',
+    '-l',
+    type=click.Choice(LAYOUTS),
+    default='tuples',
+    show_default=True,
+    help='Layout of the images, lists of pixel tuples or flat RGB buffers.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'image_files',
     type=click.Path(
@@ -161,7 +673,7 @@ def erode(radius: int, image_files: tuple[str, ...]):
     required=True,
     nargs=-1,
 )
-def dilate(radius: int, image_files: tuple[str, ...]):
+def dilate(radius: int, engine: str, layout: str, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, image_files: tuple[str, ...]):
     """ Dilate a set of images.
 
         Author:
@@ -169,15 +681,202 @@ def dilate(radius: int, image_files: tuple[str, ...]):
 
         Args:
             radius (int): Radius value for dilation.
+            engine (str): Engine for the neighborhood check.
+            layout (str): Layout of the images, lists of pixel tuples or flat RGB buffers.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             image_files (tuple[str, ...]): List of image files.
     """
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform dilation on the image.
-        dilate_algorithm(
-            radius=radius,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'dilate_{image_path.name}',
-        )
+    # Perform dilation on each image.
+    run_batch(
+        function=__dilate_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'layout': layout,
+            'radius': radius,
+            'engine': engine,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_buffer_image if layout == 'bytes' else open_project_image,
+    )
+
+@cli.command(
+    name='pipeline',
+    help='Pipeline of stages like bs:t=20,erode:r=2,dilate:r=2 on a set of images.'
+)
+@click.option(
+    '--reference-image-file',
+    '-i',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Reference image file, required for background subtraction.'
+)
+@click.option(
+    '--hsv',
+    '-h',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='HSV mode for background subtraction.'
+)
+@click.option(
+    '--hsv-weights',
+    '-w',
+    type=(float, float, float),
+    default=(0.75, 0.3, 0.2),
+    show_default=True,
+    help='HSV weights for background subtraction.'
+)
+@click.option(
+    '--hsv-lut',
+    '-L',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the HSV lookup table, which replaces the HSV conversion.'
+)
+@click.option(
+    '--engine',
+    '-e',
+    type=click.Choice(ENGINES),
+    default='window',
+    show_default=True,
+    help='Engine for the neighborhood check.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
+@click.argument(
+    'stages',
+    callback=__parse_pipeline_argument,
+    required=True,
+)
+@click.argument(
+    'image_files',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+    ),
+    required=True,
+    nargs=-1,
+)
+def pipeline(reference_image_file: str | None, hsv: bool, hsv_weights: tuple[float, float, float], hsv_lut: str | None, engine: str, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, stages: list[tuple[str, dict]], image_files: tuple[str, ...]):
+    """ Pipeline of stages on a set of images without intermediate image files.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            reference_image_file (str | None): Reference image file, required for background subtraction.
+            hsv (bool): Flag to convert the image to HSV for background subtraction.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV values.
+            hsv_lut (str | None): Cache directory of the HSV lookup table.
+            engine (str): Engine for the neighborhood check.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
+            stages (list[tuple[str, dict]]): Name and parameters of each stage.
+            image_files (tuple[str, ...]): List of image files.
+    """
+    # Check if the reference image is given for background subtraction.
+    if stages[0][0] == 'bs' and reference_image_file is None:
+        raise click.UsageError('Background subtraction requires --reference-image-file.')
+
+    # Perform the pipeline on each image.
+    # The reference image is opened once per process.
+    run_batch(
+        function=__pipeline_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'stages': stages,
+            'hsv': hsv,
+            'hsv_weights': hsv_weights,
+            'hsv_lut': hsv_lut,
+            'engine': engine,
+            'reference_image_file': reference_image_file,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.codec import open_pil_image, save_pil_image
+from src.parser.utils.cache import open_cached_image
+from src.parser.utils.overlap import take_prefetched, write_behind
+from src.parser.utils.log import log
+from PIL import Image as PILImage
+from pathlib import Path
+
+# Layouts of the project images, tuples are lists of pixel tuples and bytes are flat RGB buffers.
+LAYOUTS = ['tuples', 'bytes']
+
+def open_buffer_image(image_path: Path) -> tuple[int, int, bytearray]:
+    """ Open a project image from a file as flat RGB buffer.
+        The channels of the pixel at index i are at the offsets 3 * i, 3 * i + 1 and 3 * i + 2.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            (int, int, bytearray): Width, height and RGB buffer of the project image.
+    """
+    # Take the image from the reader of the batch, if it was read ahead.
+    taken, buffer_image = take_prefetched(
+        read=open_buffer_image,
+        image_path=image_path,
+    )
+    if taken:
+        return buffer_image
+
+    # Copy the raw RGB data of the decoded image from the cache, if it is used.
+    cached_image = open_cached_image(
+        image_path=image_path,
+    )
+    if cached_image is not None:
+        return (
+            cached_image.shape[1],
+            cached_image.shape[0],
+            bytearray(cached_image),
+        )
+
+    # Open the image with the PIL library, NPY files are loaded with numpy.
+    pil_image = open_pil_image(
+        image_path=image_path,
+    )
+    log('finish open pil image')
+
+    # Convert the image to RGB if it is not already.
+    # This is necessary because the image is not always in RGB format.
+    # For example, the image could be in RGBA with an alpha channel in PNG format.
+    pil_image = pil_image.convert('RGB')
+    log('finish convert pil image')
+
+    # Create a new project image with the raw RGB data and return it.
+    return (
+        pil_image.width,
+        pil_image.height,
+        bytearray(pil_image.tobytes()),
+    )
+
+def save_buffer_image(image_path: Path, buffer_image: tuple[int, int, bytearray]):
+    """ Save a project image with flat RGB buffer to a file.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+            buffer_image (tuple[int, int, bytearray]): Project image with flat RGB buffer.
+    """
+    # Hand the image to the writer of the batch, if it writes behind.
+    if write_behind(
+        write=save_buffer_image,
+        image_path=image_path,
+        buffer_image=buffer_image,
+    ):
+        return
+
+    # Create a new PIL image, which uses the RGB buffer of the project image without copying it.
+    pil_image = PILImage.frombuffer(
+        'RGB',
+        (buffer_image[0], buffer_image[1]),
+        buffer_image[2],
+        'raw',
+        'RGB',
+        0,
+        1,
+    )
+    log('finish create pil image')
+
+    # Save the PIL image to the file with the codec of the batch.
+    save_pil_image(
+        image_path=image_path,
+        pil_image=pil_image,
+    )
+    log('finish save pil image')
+
+def create_buffer_image(width: int, height: int, init_pixel: tuple[int, int, int]) -> tuple[int, int, bytearray]:
+    """ Create an empty project image with flat RGB buffer.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            width (int): Width of the image.
+            height (int): Height of the image.
+            init_pixel (tuple[int, int, int]): Initial pixel value.
+
+        Returns:
+            (int, int, bytearray): Width, height and RGB buffer of the project image.
+    """
+    return (
+        width,
+        height,
+        bytearray(bytes(init_pixel) * width * height),
+    )
+
+def buffer_pixel_matches(buffer_image: tuple[int, int, bytearray], check_pixel: tuple[int, int, int]) -> list[int]:
+    """ Compare each pixel of a project image with flat RGB buffer to a given check pixel.
+        The channels are read with strided slices, so no pixel tuples are created.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            buffer_image (tuple[int, int, bytearray]): Project image with flat RGB buffer.
+            check_pixel (tuple[int, int, int]): Given check pixel.
+
+        Returns:
+            list[int]: 1 for each pixel, which is equal to the check pixel, 0 otherwise.
+    """
+    red, green, blue = check_pixel
+
+    return [
+        1 if r == red and g == green and b == blue else 0
+            for r, g, b in zip(buffer_image[2][0::3], buffer_image[2][1::3], buffer_image[2][2::3])
+    ]
+
+def any_neighbors_equal_buffer_pixel(buffer_image: tuple[int, int, bytearray], radius: int, index: int, check_pixel: bytes) -> bool:
+    """ Check if any neighbors of a pixel of a project image with flat RGB buffer are equal to a given check pixel.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            buffer_image (tuple[int, int, bytearray]): Project image with flat RGB buffer.
+            radius (int): Radius value.
+            index (int): Index of the pixel.
+            check_pixel (bytes): Given check pixel as 3 bytes.
+
+        Returns:
+            bool: True if any neighbor is equal, False otherwise.
+    """
+    # Get the width, height and buffer of the image.
+    width = buffer_image[0]
+    height = buffer_image[1]
+    buffer = buffer_image[2]
+
+    # Get the x and y position of the pixel.
+    x, y = index % width, index // width
+
+    # Get the x and y range for the neighbors.
+    x_range = range(max(x - radius, 0), min(x + radius + 1, width))
+    y_range = range(max(y - radius, 0), min(y + radius + 1, height))
+
+    # Check if any neighbor is equal to the check pixel.
+    for x_neighbor in x_range:
+        for y_neighbor in y_range:
+            offset = 3 * (y_neighbor * width + x_neighbor)
+            if buffer[offset:offset + 3] == check_pixel:
+                return True
+
+    return False
@@ -8,8 +8,40 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
+from src.parser.utils.lut import open_lut, build_float_hsv_lut
+from pathlib import Path
+import numpy as np
 import math
 
+# Lookup table of the HSV values, which replaces the conversion if it is set.
+# The three values of the RGB pixel index i are at the offsets 3 * i, 3 * i + 1 and 3 * i + 2.
+hsv_lut: memoryview | None = None
+
+def use_hsv_lut(directory: Path | None):
+    """ Use a lookup table from a cache directory for all following HSV conversions.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path | None): Cache directory of the lookup table or None to calculate the values.
+    """
+    global hsv_lut
+
+    if directory is None:
+        hsv_lut = None
+        return
+
+    lut = open_lut(
+        directory=directory,
+        name='hsv_lut_float',
+        dtype=np.float64,
+        build=build_float_hsv_lut,
+    )
+
+    # View the memory mapped table as flat floats, so no numpy scalars are created on lookup.
+    hsv_lut = memoryview(lut).cast('B').cast('d')
+
 def rgb_to_hsv_pixel(rgb_pixel: tuple[int, int, int]) -> tuple[int, int, int]:
     """ Convert an RGB pixel to an HSV pixel.
         Algorithm reference from http://alvyray.com/Papers/CG/color78.pdf.
@@ -24,6 +56,16 @@ def rgb_to_hsv_pixel(rgb_pixel: tuple[int, int, int]) -> tuple[int, int, int]:
         Returns:
             tuple[int, int, int]: HSV pixel.
     """
+    if hsv_lut is not None:
+        # Look up the HSV values with the index red << 16 | green << 8 | blue.
+        offset = 3 * (rgb_pixel[0] << 16 | rgb_pixel[1] << 8 | rgb_pixel[2])
+
+        return (
+            hsv_lut[offset],
+            hsv_lut[offset + 1],
+            hsv_lut[offset + 2],
+        )
+
     # Get the red, green, and blue values of the RGB pixel in the range [0, 1].
     red = rgb_pixel[0] / 255
     green = rgb_pixel[1] / 255
@@ -8,6 +8,9 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
+from src.parser.utils.codec import open_pil_image, save_pil_image
+from src.parser.utils.cache import open_cached_image
+from src.parser.utils.overlap import take_prefetched, write_behind
 from src.parser.utils.log import log
 from PIL import Image as PILImage
 from pathlib import Path
@@ -24,10 +27,29 @@ def open_project_image(image_path: Path) -> tuple[int, int, list[tuple[int, int,
         Returns:
             (int, int, list[tuple[int, int, int]]): Width, height and pixels of the project image.
     """
-    # Open the image with the PIL library.
-    pil_image = PILImage.open(
-        fp=image_path,
-        mode='r',
+    # Take the image from the reader of the batch, if it was read ahead.
+    taken, project_image = take_prefetched(
+        read=open_project_image,
+        image_path=image_path,
+    )
+    if taken:
+        return project_image
+
+    # Group the raw RGB data of the decoded image from the cache into pixels, if it is used.
+    cached_image = open_cached_image(
+        image_path=image_path,
+    )
+    if cached_image is not None:
+        data = cached_image.tobytes()
+        return (
+            cached_image.shape[1],
+            cached_image.shape[0],
+            list(zip(data[0::3], data[1::3], data[2::3])),
+        )
+
+    # Open the image with the PIL library, NPY files are loaded with numpy.
+    pil_image = open_pil_image(
+        image_path=image_path,
     )
     log('finish open pil image')
 
@@ -54,6 +76,14 @@ def save_project_image(image_path: Path, project_image: tuple[int, int, list[tup
             image_path (Path): Path to the image.
             project_image (tuple[int, int, list[tuple[int, int, int]]]): Project image.
     """
+    # Hand the image to the writer of the batch, if it writes behind.
+    if write_behind(
+        write=save_project_image,
+        image_path=image_path,
+        project_image=project_image,
+    ):
+        return
+
     # Create a new PIL image with the same width and height as the project image.
     pil_image = PILImage.new(
         mode='RGB',
@@ -67,9 +97,10 @@ def save_project_image(image_path: Path, project_image: tuple[int, int, list[tup
     )
     log('finish put data to pil image')
     
-    # Save the PIL image to the file.
-    pil_image.save(
-        fp=image_path,
+    # Save the PIL image to the file with the codec of the batch.
+    save_pil_image(
+        image_path=image_path,
+        pil_image=pil_image,
     )
     log('finish save pil image')
 
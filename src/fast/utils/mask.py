@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+
+WHITE_PIXEL = (255, 255, 255)
+BLACK_PIXEL = (0, 0, 0)
+
+def project_image_to_mask(image: tuple[int, int, list[tuple[int, int, int]]], check_pixel: tuple[int, int, int], equal: bool) -> tuple[int, int, list[bool]]:
+    """ Convert a project image to a mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image (tuple[int, int, list[tuple[int, int, int]]]): Project image.
+            check_pixel (tuple[int, int, int]): Given check pixel.
+            equal (bool): Set the mask where the pixels are equal to the check pixel, otherwise where they are not equal.
+
+        Returns:
+            (int, int, list[bool]): Width, height and values of the mask.
+    """
+    return (
+        image[0],
+        image[1],
+        [
+            (pixel == check_pixel) == equal
+                for pixel in image[2]
+        ],
+    )
+
+def mask_to_project_image(mask: tuple[int, int, list[bool]]) -> tuple[int, int, list[tuple[int, int, int]]]:
+    """ Convert a mask to a project image, which is white where the mask is set and black otherwise.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (tuple[int, int, list[bool]]): Mask.
+
+        Returns:
+            (int, int, list[tuple[int, int, int]]): Width, height and pixels of the project image.
+    """
+    return (
+        mask[0],
+        mask[1],
+        [
+            WHITE_PIXEL if value else BLACK_PIXEL
+                for value in mask[2]
+        ],
+    )
+
+def any_neighbors_equal_value(mask: tuple[int, int, list[bool]], radius: int, index: int, check_value: bool) -> bool:
+    """ Check if any neighbors of a mask value are equal to a given check value.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (tuple[int, int, list[bool]]): Mask.
+            radius (int): Radius value.
+            index (int): Index of the value.
+            check_value (bool): Given check value.
+
+        Returns:
+            bool: True if any neighbor is equal, False otherwise.
+    """
+    # Get the width and height of the mask.
+    width = mask[0]
+    height = mask[1]
+
+    # Get the x and y position of the value.
+    x, y = index % width, index // width
+
+    # Get the x and y range for the neighbors.
+    x_range = range(max(x - radius, 0), min(x + radius + 1, width))
+    y_range = range(max(y - radius, 0), min(y + radius + 1, height))
+
+    # Check if any neighbor is equal to the check value.
+    for y_neighbor in y_range:
+        for x_neighbor in x_range:
+            if mask[2][y_neighbor * width + x_neighbor] == check_value:
+                return True
+
+    return False
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from itertools import accumulate
+from typing import Any
+
+ENGINES = ['window', 'count']
+
+def any_neighbors_count(width: int, height: int, matches: list[int], radius: int) -> list[bool]:
+    """ Check for each pixel if any neighbor in the square window matches.
+        Running counts of the matches in the window of each column are slid down row by row.
+        Each row slides a window over these column counts, so each pixel costs a constant number of additions and subtractions.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            width (int): Width of the image.
+            height (int): Height of the image.
+            matches (list[int]): 1 for each matching pixel, 0 otherwise.
+            radius (int): Radius value.
+
+        Returns:
+            list[bool]: True for each pixel, where any neighbor matches, False otherwise.
+    """
+    window = 2 * radius + 1
+
+    # Count the matches of each column in the rows of the first window.
+    column_counts = [0] * width
+    for y in range(min(radius + 1, height)):
+        column_counts = [
+            count + match
+                for count, match in zip(column_counts, matches[y * width:(y + 1) * width])
+        ]
+
+    result: list[bool] = []
+    for y in range(height):
+        # Slide the window over the column counts of the row.
+        # The counts are padded by the radius, so the window ends at the image border.
+        # The sum of a window is the difference of the running sums at its ends.
+        running_sums = [0, *accumulate([0] * radius + column_counts + [0] * radius)]
+        result.extend(
+            end - start > 0
+                for start, end in zip(running_sums, running_sums[window:])
+        )
+
+        # Slide the column counts down by one row.
+        # Add the row entering the window and subtract the row leaving it.
+        if y + radius + 1 < height:
+            column_counts = [
+                count + match
+                    for count, match in zip(column_counts, matches[(y + radius + 1) * width:(y + radius + 2) * width])
+            ]
+        if y - radius >= 0:
+            column_counts = [
+                count - match
+                    for count, match in zip(column_counts, matches[(y - radius) * width:(y - radius + 1) * width])
+            ]
+
+    return result
+
+def any_neighbors_equal_count(width: int, height: int, values: list[Any], radius: int, check_value: Any) -> list[bool]:
+    """ Check for each value if any neighbor in the square window is equal to a given check value.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            width (int): Width of the image.
+            height (int): Height of the image.
+            values (list[Any]): Pixels of an image or values of a mask.
+            radius (int): Radius value.
+            check_value (Any): Given check pixel or check value.
+
+        Returns:
+            list[bool]: True for each value, where any neighbor is equal, False otherwise.
+    """
+    # Compare each value only once.
+    return any_neighbors_count(
+        width=width,
+        height=height,
+        matches=[
+            1 if value == check_value else 0
+                for value in values
+        ],
+        radius=radius,
+    )
+
+def crop_box(values: list[Any] | bytearray, width: int, box: tuple[int, int, int, int], size: int = 1) -> list[Any] | bytearray:
+    """ Crop the values of a box from the flat values of an image or a mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            values (list[Any] | bytearray): Flat values of an image or a mask.
+            width (int): Width of the image.
+            box (tuple[int, int, int, int]): Left, top, right and bottom of the box.
+            size (int): Number of values of a single pixel.
+
+        Returns:
+            list[Any] | bytearray: Flat values of the box, the values themselves if the box covers the whole image.
+    """
+    left, top, right, bottom = box
+
+    if left == 0 and right == width and top == 0 and len(values) == size * bottom * width:
+        return values
+
+    cropped = values[:0]
+    for row in range(top, bottom):
+        cropped += values[size * (row * width + left):size * (row * width + right)]
+
+    return cropped
+
+def paste_box(values: list[Any], width: int, height: int, box: tuple[int, int, int, int], fill: Any) -> list[Any]:
+    """ Paste the flat values of a box into a new list with the size of the image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            values (list[Any]): Flat values of the box.
+            width (int): Width of the image.
+            height (int): Height of the image.
+            box (tuple[int, int, int, int]): Left, top, right and bottom of the box.
+            fill (Any): Value outside of the box.
+
+        Returns:
+            list[Any]: Flat values of the image, the values themselves if the box covers the whole image.
+    """
+    left, top, right, bottom = box
+
+    if (left, top, right, bottom) == (0, 0, width, height):
+        return values
+
+    pasted = [fill] * (width * height)
+    box_width = right - left
+    for row in range(top, bottom):
+        offset = (row - top) * box_width
+        pasted[row * width + left:row * width + right] = values[offset:offset + box_width]
+
+    return pasted
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.fast.utils.image import open_project_image
+from src.fast.utils.buffer import open_buffer_image
+from src.fast.utils.hsv import rgb_to_hsv_pixel
+from pathlib import Path
+
+def open_reference_image(image_path: Path, hsv: bool) -> tuple[int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None]:
+    """ Open a reference image once for a whole batch of images.
+        The first three entries match a project image, so the reference image can be used like one.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the reference image.
+            hsv (bool): Flag to also convert the reference pixels to HSV.
+
+        Returns:
+            (int, int, list[tuple[int, int, int]], list[tuple[int, int, int]] | None): Width, height, pixels and optional HSV pixels of the reference image.
+    """
+    # Open the reference image.
+    image = open_project_image(
+        image_path=image_path,
+    )
+
+    # Convert the reference pixels to HSV if the flag is set.
+    hsv_pixels = None
+    if hsv:
+        hsv_pixels = [
+            rgb_to_hsv_pixel(
+                rgb_pixel=pixel,
+            )
+                for pixel in image[2]
+        ]
+
+    # Create a new reference image and return it.
+    return (
+        image[0],
+        image[1],
+        image[2],
+        hsv_pixels,
+    )
+
+def open_reference_buffer_image(image_path: Path, hsv: bool) -> tuple[int, int, bytearray, list[tuple[int, int, int]] | None]:
+    """ Open a reference image with flat RGB buffer once for a whole batch of images.
+        The first three entries match a project image with flat RGB buffer, so the reference image can be used like one.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the reference image.
+            hsv (bool): Flag to also convert the reference pixels to HSV.
+
+        Returns:
+            (int, int, bytearray, list[tuple[int, int, int]] | None): Width, height, RGB buffer and optional HSV pixels of the reference image.
+    """
+    # Open the reference image.
+    image = open_buffer_image(
+        image_path=image_path,
+    )
+
+    # Convert the reference pixels to HSV if the flag is set.
+    # The channels are read with strided slices of the buffer.
+    hsv_pixels = None
+    if hsv:
+        hsv_pixels = [
+            rgb_to_hsv_pixel(
+                rgb_pixel=pixel,
+            )
+                for pixel in zip(image[2][0::3], image[2][1::3], image[2][2::3])
+        ]
+
+    # Create a new reference image and return it.
+    return (
+        image[0],
+        image[1],
+        image[2],
+        hsv_pixels,
+    )
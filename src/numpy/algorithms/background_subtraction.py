@@ -8,18 +8,44 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
+from src.numpy.utils.stream import open_project_image_strips, save_project_image_strips
+from src.numpy.utils.video import open_frame_source, read_frames, frame_rate, open_frame_sink, write_frame
+from src.numpy.utils.background import create_background_model, update_background_chunk
 from src.numpy.utils.image import open_project_image, save_project_image
-from concurrent.futures import ThreadPoolExecutor
+from src.numpy.utils.pyramid import open_pyramid_image, downsample_image, upsample_mask, changed_tiles
+from src.numpy.utils.kernel import scratch_buffer, integer_threshold, integer_mask_chunk
+from src.numpy.utils.chunk import chunk_boundaries, split_chunks
+from src.numpy.utils.pool import map_chunks
+from src.numpy.utils.roi import roi_layout
+from src.numpy.utils.hsv import rgb_to_hsv
+from typing import Iterator
 from src.parser.utils.log import log
 import numpy.typing as npt
 from pathlib import Path
 import numpy as np
+import time
 import cv2
 
-WHITE_PIXEL = [255, 255, 255]
+WHITE_VALUE = np.uint8(255)
 
-def __process_chunk(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image_chunk: npt.NDArray[np.uint8], image_chunk: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
-    """ Process a chunk of an image.
+def __check_kernel(hsv: bool, kernel: str):
+    """ Check if the kernel supports the HSV flag.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            hsv (bool): Flag to convert the image to HSV.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+
+        Raises:
+            ValueError: If the integer kernel is used with HSV mode.
+    """
+    if hsv and kernel == 'integer':
+        raise ValueError('The integer kernel only supports RGB mode.')
+
+def __mask_chunk(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, reference_image_chunk: npt.NDArray[np.uint8], image_chunk: npt.NDArray[np.uint8], mask_chunk: npt.NDArray[np.bool_]):
+    """ Calculate the foreground mask of a chunk of an image.
 
         Author:
             Benedikt Schwering <bes9584@thi.de>
@@ -28,18 +54,29 @@ def __process_chunk(threshold: float, hsv: bool, hsv_weights: tuple[float, float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): Flag to convert the image to HSV.
             hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
-            reference_image_chunk (np.array): Chunk of the reference image.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            reference_image_chunk (np.array): Chunk of the reference image, already converted to HSV if the flag is set.
             image_chunk (np.array): Chunk of the image.
-
-        Returns:
-            np.array: Processed chunk of the image.
+            mask_chunk (np.array): Boolean mask of the chunk, which is set where the pixels differ from the reference image.
     """
+    if kernel == 'integer':
+        # Compare the summed differences in integer space.
+        integer_mask_chunk(
+            limit=integer_threshold(
+                threshold=threshold,
+            ),
+            reference_image_chunk=reference_image_chunk,
+            image_chunk=image_chunk,
+            mask_chunk=mask_chunk,
+        )
+        return
+
     if hsv:
-        # Convert the image chanks to HSV.
+        # Convert the image chunk to HSV.
+        # The reference image chunk is already converted once for the whole batch.
         # HUE values are in the range [0, 180].
         # SATURATION and VALUE values are in the range [0, 255].
-        reference_image_chunk = cv2.cvtColor(reference_image_chunk, cv2.COLOR_RGB2HSV)
-        image_chunk = cv2.cvtColor(image_chunk, cv2.COLOR_RGB2HSV)
+        image_chunk = rgb_to_hsv(image_chunk)
 
         # Calculate the difference between the HSV pixels.
         # Convert the pixel to int16 to avoid overflow.
@@ -72,18 +109,90 @@ def __process_chunk(threshold: float, hsv: bool, hsv_weights: tuple[float, float
         )
 
     # Create a binary mask based on the threshold.
-    binary_mask = pixel_differences > threshold
+    np.greater(pixel_differences, threshold, out=mask_chunk)
+
+def __process_chunk(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, reference_image_chunk: npt.NDArray[np.uint8], image_chunk: npt.NDArray[np.uint8], output_chunk: npt.NDArray[np.uint8]):
+    """ Process a chunk of an image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            reference_image_chunk (np.array): Chunk of the reference image, already converted to HSV if the flag is set.
+            image_chunk (np.array): Chunk of the image.
+            output_chunk (np.array): Chunk of the output image, which is filled.
+    """
+    # Calculate the foreground mask of the chunk into a scratch buffer of the thread.
+    binary_mask = scratch_buffer(
+        name='mask',
+        shape=image_chunk.shape[:2],
+        dtype=np.bool_,
+    )
+    __mask_chunk(
+        threshold=threshold,
+        hsv=hsv,
+        hsv_weights=hsv_weights,
+        kernel=kernel,
+        reference_image_chunk=reference_image_chunk,
+        image_chunk=image_chunk,
+        mask_chunk=binary_mask,
+    )
+
+    # Write white pixels where the binary mask is True and black pixels otherwise.
+    np.multiply(binary_mask[:, :, np.newaxis], WHITE_VALUE, out=output_chunk)
+
+def __roi_mask(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, reference_image: npt.NDArray[np.uint8], image: npt.NDArray[np.uint8], layout: tuple[npt.NDArray[np.bool_], tuple[tuple[int, int, int, int], ...]]) -> npt.NDArray[np.bool_]:
+    """ Calculate the foreground mask of an image only in the regions of interest.
+        Each box of the regions is cropped before it is split into chunks, so the cost follows the area of the regions.
 
-    # Create a new black image chunk with the same dimensions as the input image.
-    result_chunk = np.zeros_like(image_chunk)
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            reference_image (np.array): Reference image, already converted to HSV if the flag is set.
+            image (np.array): Image.
+            layout (tuple[np.array, tuple[(int, int, int, int), ...]]): Mask and boxes of the regions of interest.
 
-    # Set the pixels to white where the binary mask is True.
-    result_chunk[binary_mask] = WHITE_PIXEL
+        Returns:
+            np.array: Boolean mask of the image, which is False outside the regions.
+    """
+    roi_mask, boxes = layout
+    mask = np.zeros(image.shape[:2], dtype=np.bool_)
+
+    for top, bottom, left, right in boxes:
+        # Split the box into chunks along the height (axis=0).
+        boundaries = chunk_boundaries(
+            length=bottom - top,
+            chunks=min(threads, bottom - top),
+        )
 
-    # Return the processed chunk.
-    return result_chunk
+        # Calculate the mask of each chunk of the box in parallel directly into its view of the mask.
+        map_chunks(
+            __mask_chunk,
+            [threshold] * len(boundaries),
+            [hsv] * len(boundaries),
+            [hsv_weights] * len(boundaries),
+            [kernel] * len(boundaries),
+            [reference_image[top + start:top + end, left:right] for start, end in boundaries],
+            [image[top + start:top + end, left:right] for start, end in boundaries],
+            [mask[top + start:top + end, left:right] for start, end in boundaries],
+        )
+
+        # Clear the pixels of the box outside the regions.
+        mask[top:bottom, left:right] &= roi_mask[top:bottom, left:right]
 
-def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], threads: int, reference_image_path: Path, input_image_path: Path, output_image_path: Path):
+    return mask
+
+def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, reference_image: tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]], input_image_path: Path, output_image_path: Path):
     """ Apply Background Subtraction on an image.
 
         Author:
@@ -93,53 +202,605 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): Flag to convert the image to HSV.
             hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
             threads (int): Number of threads to use for parallel processing.
-            reference_image_path (Path): Reference path for image file.
+            reference_image (tuple[np.array, np.array | None, list[np.array]]): Reference image opened once for the batch.
             input_image_path (Path): Input path for image file.
             output_image_path (Path): Output path for image file.
 
         Raises:
             ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the reference image does not match the HSV flag or the number of threads.
+            ValueError: If the integer kernel is used in HSV mode.
     """
-    # Open the reference image and the input image.
-    reference_image = open_project_image(
-        image_path=reference_image_path,
-    )
+    # Open the input image.
+    # The reference image is already opened once for the whole batch.
     image = open_project_image(
         image_path=input_image_path,
     )
     log('finish preprocessing')
 
+    # Check if the reference image and the input image have the same dimensions.
+    if reference_image[0].shape != image.shape:
+        raise ValueError('The reference image and the input image must have the same dimensions.')
+
+    # Check if the reference image was prepared for the HSV flag and the number of threads.
+    if (reference_image[1] is not None) != hsv or len(reference_image[2]) != threads:
+        raise ValueError('The reference image must be opened with the same HSV mode and number of threads.')
+
+    # Check if the kernel supports the HSV flag.
+    __check_kernel(
+        hsv=hsv,
+        kernel=kernel,
+    )
+
+    # Preallocate a single output image.
+    processed_image = np.empty_like(image)
+
+    layout = roi_layout(
+        height=image.shape[0],
+        width=image.shape[1],
+    )
+    if layout is not None:
+        # Calculate the mask only in the boxes of the regions of interest.
+        mask = __roi_mask(
+            threshold=threshold,
+            hsv=hsv,
+            hsv_weights=hsv_weights,
+            kernel=kernel,
+            threads=threads,
+            reference_image=reference_image[1] if hsv else reference_image[0],
+            image=image,
+            layout=layout,
+        )
+
+        # Write white pixels where the mask is True and black pixels otherwise.
+        np.multiply(mask[:, :, np.newaxis], WHITE_VALUE, out=processed_image)
+    else:
+        # Split the image and the output image into chunks along the height (axis=0).
+        # The reference image chunks are already split once for the whole batch.
+        # Each chunk is written directly into its view of the output image.
+        image_chunks = split_chunks(
+            array=image,
+            chunks=threads,
+        )
+        output_chunks = split_chunks(
+            array=processed_image,
+            chunks=threads,
+        )
+
+        # Process each chunk in parallel on the worker pool of the batch.
+        map_chunks(
+            __process_chunk,
+            [threshold] * threads,
+            [hsv] * threads,
+            [hsv_weights] * threads,
+            [kernel] * threads,
+            reference_image[2],
+            image_chunks,
+            output_chunks,
+        )
+    log('finish background subtraction')
+
+    # Save the image to the output path.
+    save_project_image(
+        image_path=output_image_path,
+        project_image=processed_image,
+    )
+    log('finish postprocessing')
+
+def background_subtraction_mask(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, reference_image: tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]], image: npt.NDArray[np.uint8]) -> npt.NDArray[np.bool_]:
+    """ Calculate the foreground mask of an image in memory.
+        The mask is True where the output image of the background subtraction is white.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            reference_image (tuple[np.array, np.array | None, list[np.array]]): Reference image opened once for the batch.
+            image (np.array): Image.
+
+        Returns:
+            np.array: Boolean mask of the image.
+
+        Raises:
+            ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the reference image does not match the HSV flag or the number of threads.
+            ValueError: If the integer kernel is used in HSV mode.
+    """
+    # Check if the reference image and the input image have the same dimensions.
+    if reference_image[0].shape != image.shape:
+        raise ValueError('The reference image and the input image must have the same dimensions.')
+
+    # Check if the reference image was prepared for the HSV flag and the number of threads.
+    if (reference_image[1] is not None) != hsv or len(reference_image[2]) != threads:
+        raise ValueError('The reference image must be opened with the same HSV mode and number of threads.')
+
+    # Check if the kernel supports the HSV flag.
+    __check_kernel(
+        hsv=hsv,
+        kernel=kernel,
+    )
+
+    # Calculate only the boxes of the regions of interest, if they are set.
+    layout = roi_layout(
+        height=image.shape[0],
+        width=image.shape[1],
+    )
+    if layout is not None:
+        return __roi_mask(
+            threshold=threshold,
+            hsv=hsv,
+            hsv_weights=hsv_weights,
+            kernel=kernel,
+            threads=threads,
+            reference_image=reference_image[1] if hsv else reference_image[0],
+            image=image,
+            layout=layout,
+        )
+
+    # Split the image and a single mask into chunks along the height (axis=0).
+    # The reference image chunks are already split once for the whole batch.
+    image_chunks = split_chunks(
+        array=image,
+        chunks=threads,
+    )
+    mask = np.empty(image.shape[:2], dtype=np.bool_)
+    mask_chunks = split_chunks(
+        array=mask,
+        chunks=threads,
+    )
+
+    # Calculate the mask of each chunk in parallel directly into its view of the mask.
+    map_chunks(
+        __mask_chunk,
+        [threshold] * threads,
+        [hsv] * threads,
+        [hsv_weights] * threads,
+        [kernel] * threads,
+        reference_image[2],
+        image_chunks,
+        mask_chunks,
+    )
+
+    return mask
+
+def __refine_tiles(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, reference_image: npt.NDArray[np.uint8], image: npt.NDArray[np.uint8], mask: npt.NDArray[np.bool_], tiles: list[tuple[int, int, int, int]]):
+    """ Calculate the foreground mask of a group of tiles at full resolution.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            reference_image (np.array): Reference image, already converted to HSV if the flag is set.
+            image (np.array): Image.
+            mask (np.array): Boolean mask of the image, which is filled in the tiles.
+            tiles (list[(int, int, int, int)]): Top, bottom, left and right boundary of each tile.
+    """
+    for top, bottom, left, right in tiles:
+        __mask_chunk(
+            threshold=threshold,
+            hsv=hsv,
+            hsv_weights=hsv_weights,
+            kernel=kernel,
+            reference_image_chunk=reference_image[top:bottom, left:right],
+            image_chunk=image[top:bottom, left:right],
+            mask_chunk=mask[top:bottom, left:right],
+        )
+
+def background_subtraction_pyramid(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, levels: int, output: str, reference_image: tuple, input_image_path: Path, output_image_path: Path):
+    """ Apply Background Subtraction on an image at a reduced resolution of 1/2^levels.
+        The mask is written at the reduced scale, upsampled or refined at full resolution in the tiles flagged as changed.
+        Changes smaller than a pixel of the pyramid level can be missed, so the mask is not exact.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            levels (int): Number of pyramid levels.
+            output (str): Output of the pyramid mode, one of PYRAMID_OUTPUTS.
+            reference_image (tuple[tuple | None, tuple, (int, int)]): Reference image opened once for the batch in pyramid mode.
+            input_image_path (Path): Input path for image file.
+            output_image_path (Path): Output path for image file.
+
+        Raises:
+            ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the reference image does not match the HSV flag or the number of threads.
+            ValueError: If the integer kernel is used in HSV mode.
+    """
+    full_reference_image, coarse_reference_image, size = reference_image
+
+    # Open the input image at full resolution for refining or directly at the pyramid level.
+    # The reference image is already opened once for the whole batch.
+    if output == 'refine':
+        image = open_project_image(
+            image_path=input_image_path,
+        )
+        coarse_image = downsample_image(
+            image=image,
+            levels=levels,
+        )
+        image_size = image.shape[:2]
+    else:
+        coarse_image, image_size = open_pyramid_image(
+            image_path=input_image_path,
+            levels=levels,
+        )
+    log('finish preprocessing')
+
+    # Check if the reference image and the input image have the same dimensions at full resolution.
+    if image_size != size:
+        raise ValueError('The reference image and the input image must have the same dimensions.')
+
+    # Calculate the mask at the pyramid level.
+    mask = background_subtraction_mask(
+        threshold=threshold,
+        hsv=hsv,
+        hsv_weights=hsv_weights,
+        kernel=kernel,
+        threads=threads,
+        reference_image=coarse_reference_image,
+        image=coarse_image,
+    )
+
+    if output == 'upsample':
+        # Scale the mask up to full resolution.
+        mask = upsample_mask(
+            mask=mask,
+            height=size[0],
+            width=size[1],
+        )
+    elif output == 'refine':
+        # Calculate the mask at full resolution only in the changed tiles, all other pixels stay black.
+        # The tiles are distributed evenly over the threads.
+        tiles = changed_tiles(
+            mask=mask,
+            levels=levels,
+            height=size[0],
+            width=size[1],
+        )
+        mask = np.zeros(size, dtype=np.bool_)
+        groups = [tiles[index::threads] for index in range(min(threads, len(tiles)))]
+        map_chunks(
+            __refine_tiles,
+            [threshold] * len(groups),
+            [hsv] * len(groups),
+            [hsv_weights] * len(groups),
+            [kernel] * len(groups),
+            [full_reference_image[1] if hsv else full_reference_image[0]] * len(groups),
+            [image] * len(groups),
+            [mask] * len(groups),
+            groups,
+        )
+    log('finish background subtraction')
+
+    # Write white pixels where the mask is True and black pixels otherwise.
+    processed_image = np.empty((*mask.shape, 3), dtype=np.uint8)
+    np.multiply(mask[:, :, np.newaxis], WHITE_VALUE, out=processed_image)
+
+    # Save the image to the output path.
+    save_project_image(
+        image_path=output_image_path,
+        project_image=processed_image,
+    )
+    log('finish postprocessing')
+
+def __process_strips(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, strip_height: int, reference_image: npt.NDArray[np.uint8], image: npt.NDArray[np.uint8]) -> Iterator[npt.NDArray[np.uint8]]:
+    """ Process an image strip by strip.
+        Only the current strip of the reference image and the image is read into memory.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            strip_height (int): Number of rows per strip.
+            reference_image (np.array): Reference image, memory mapped if possible.
+            image (np.array): Image, memory mapped if possible.
+
+        Yields:
+            np.array: Processed strip of the image.
+    """
+    for start in range(0, image.shape[0], strip_height):
+        end = min(start + strip_height, image.shape[0])
+
+        # Read the strips of the reference image and the image.
+        reference_image_strip = np.asarray(reference_image[start:end])
+        image_strip = np.asarray(image[start:end])
+
+        # Convert the reference image strip to HSV if the flag is set.
+        if hsv:
+            reference_image_strip = rgb_to_hsv(reference_image_strip)
+
+        # Split the strips into chunks along the height (axis=0).
+        # A strip is never split into more chunks than it has rows.
+        boundaries = chunk_boundaries(
+            length=end - start,
+            chunks=min(threads, end - start),
+        )
+
+        # Process each chunk of the strip in parallel directly into its view of the output strip.
+        output_strip = np.empty_like(image_strip)
+        map_chunks(
+            __process_chunk,
+            [threshold] * len(boundaries),
+            [hsv] * len(boundaries),
+            [hsv_weights] * len(boundaries),
+            [kernel] * len(boundaries),
+            [reference_image_strip[boundary[0]:boundary[1]] for boundary in boundaries],
+            [image_strip[boundary[0]:boundary[1]] for boundary in boundaries],
+            [output_strip[boundary[0]:boundary[1]] for boundary in boundaries],
+        )
+
+        yield output_strip
+
+def background_subtraction_strips(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, strip_height: int, reference_image: npt.NDArray[np.uint8], input_image_path: Path, output_image_path: Path):
+    """ Apply Background Subtraction on an image in horizontal strips.
+        The image is read, processed and written strip by strip, so the peak memory is bounded by the strip height.
+        Writing the strips is interleaved with processing them, so the background subtraction stage includes the writing and the postprocessing stage is empty.
+        The summed up processing and writing times of the strips are logged on a lower layer.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            strip_height (int): Number of rows per strip.
+            reference_image (np.array): Reference image opened once for the batch, memory mapped if possible.
+            input_image_path (Path): Input path for image file.
+            output_image_path (Path): Output path for image file.
+
+        Raises:
+            ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the integer kernel is used in HSV mode.
+    """
+    # Open the input image for reading strips.
+    # The reference image is already opened once for the whole batch.
+    image = open_project_image_strips(
+        image_path=input_image_path,
+    )
+    log('finish preprocessing')
+
     # Check if the reference image and the input image have the same dimensions.
     if reference_image.shape != image.shape:
         raise ValueError('The reference image and the input image must have the same dimensions.')
 
-    # Split the image and reference image into chunks along the height (axis=0).
-    image_chunks = np.array_split(image, threads, axis=0)
-    reference_image_chunks = np.array_split(reference_image, threads, axis=0)
+    # Check if the kernel supports the HSV flag.
+    __check_kernel(
+        hsv=hsv,
+        kernel=kernel,
+    )
+
+    # Process and save each strip of the image.
+    save_project_image_strips(
+        image_path=output_image_path,
+        width=image.shape[1],
+        height=image.shape[0],
+        strips=__process_strips(
+            threshold=threshold,
+            hsv=hsv,
+            hsv_weights=hsv_weights,
+            kernel=kernel,
+            threads=threads,
+            strip_height=strip_height,
+            reference_image=reference_image,
+            image=image,
+        ),
+    )
+    log('finish background subtraction')
+    log('finish postprocessing')
+
+def __process_frames(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, frames: int, alpha: float, sigma: float, reference_image: tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]], model_chunks: list[dict[str, npt.NDArray]] | None, capture: cv2.VideoCapture, output_path: Path) -> int:
+    """ Process the frames of a frame source.
+        The latency of each frame and the sustained frame rate are logged.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
 
-    # Process each chunk in parallel.
-    with ThreadPoolExecutor(
-        max_workers=threads,
-    ) as executor:
-        results = list(
-            executor.map(
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            frames (int): Maximum number of frames, 0 processes the whole source.
+            alpha (float): Learning rate of the adaptive background model.
+            sigma (float): Number of standard deviations for the gaussian background model.
+            reference_image (tuple[np.array, np.array | None, list[np.array]]): Reference image opened once for the source.
+            model_chunks (list[dict[str, np.array]] | None): Chunks of the adaptive background model or None for the static reference image.
+            capture (cv2.VideoCapture): Opened frame source.
+            output_path (Path): Output path for the video file or the frame directory.
+
+        Returns:
+            int: Number of processed frames.
+
+        Raises:
+            ValueError: If the reference image and a frame do not have the same dimensions.
+    """
+    sink = None
+    output_frame = None
+    image_chunks = []
+
+    index = 0
+    start = time.perf_counter_ns()
+    frame_start = start
+    for frame in read_frames(
+        capture=capture,
+        frames=frames,
+    ):
+        if output_frame is None:
+            # Check if the reference image and the frames have the same dimensions.
+            if reference_image[0].shape != frame.shape:
+                raise ValueError('The reference image and the frames must have the same dimensions.')
+
+            # Open the output once the size of the frames is known.
+            sink = open_frame_sink(
+                output_path=output_path,
+                width=frame.shape[1],
+                height=frame.shape[0],
+                fps=frame_rate(
+                    capture=capture,
+                ),
+            )
+
+            # Split the frame buffer into chunks along the height (axis=0).
+            # The buffer is reused for all frames, so the chunks stay valid.
+            image_chunks = split_chunks(
+                array=frame,
+                chunks=threads,
+            )
+            output_frame = np.empty_like(frame)
+            output_chunks = split_chunks(
+                array=output_frame,
+                chunks=threads,
+            )
+
+        if model_chunks is not None:
+            # Classify and update each chunk of the background model in parallel.
+            # The chunks are written directly into the output buffer.
+            map_chunks(
+                update_background_chunk,
+                model_chunks,
+                [threshold] * threads,
+                [alpha] * threads,
+                [sigma] * threads,
+                image_chunks,
+                output_chunks,
+            )
+        else:
+            # Process each chunk in parallel directly into the output buffer.
+            map_chunks(
                 __process_chunk,
                 [threshold] * threads,
                 [hsv] * threads,
                 [hsv_weights] * threads,
-                reference_image_chunks,
-                image_chunks
+                [kernel] * threads,
+                reference_image[2],
+                image_chunks,
+                output_chunks,
             )
+
+        # Write the frame to the output.
+        write_frame(
+            sink=sink,
+            output_path=output_path,
+            index=index,
+            frame=output_frame,
         )
 
-    # Combine the chunks back into a single image.
-    processed_image = np.vstack(results)
-    log('finish background subtraction')
+        frame_end = time.perf_counter_ns()
+        log(f'finish frame {index} in {(frame_end - frame_start) / 1e6:.3f} ms')
+        frame_start = frame_end
+        index += 1
 
-    # Save the image to the output path.
-    save_project_image(
-        image_path=output_image_path,
-        project_image=processed_image,
+    # Close the video file.
+    if sink is not None:
+        sink.release()
+
+    # Log the sustained frame rate over all frames.
+    if index > 0:
+        log(f'finish {index} frames at {index / ((time.perf_counter_ns() - start) / 1e9):.2f} fps')
+
+    return index
+
+def background_subtraction_video(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, threads: int, frames: int, model: str, alpha: float, sigma: float, reference_image: tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]], source: str, output_path: Path):
+    """ Apply Background Subtraction on the frames of a video file or a camera.
+        The frames are decoded into a reused buffer and the masks are written to a video file or a frame directory.
+        With an adaptive background model the reference image is only the initial background, which is updated with each frame.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            threads (int): Number of threads to use for parallel processing.
+            frames (int): Maximum number of frames, 0 processes the whole source.
+            model (str): Background model, one of MODELS.
+            alpha (float): Learning rate of the adaptive background model.
+            sigma (float): Number of standard deviations for the gaussian background model.
+            reference_image (tuple[np.array, np.array | None, list[np.array]]): Reference image opened once for the source.
+            source (str): Path to a video file or index of a camera.
+            output_path (Path): Output path for the video file or the frame directory.
+
+        Raises:
+            ValueError: If an adaptive background model or the integer kernel is used in HSV mode.
+            ValueError: If the frame source or the video file can not be opened.
+            ValueError: If the reference image and a frame do not have the same dimensions.
+            ValueError: If the reference image does not match the HSV flag or the number of threads.
+    """
+    # Check if the reference image was prepared for the HSV flag and the number of threads.
+    if (reference_image[1] is not None) != hsv or len(reference_image[2]) != threads:
+        raise ValueError('The reference image must be opened with the same HSV mode and number of threads.')
+
+    # Check if the kernel supports the HSV flag.
+    __check_kernel(
+        hsv=hsv,
+        kernel=kernel,
     )
+
+    # Create the adaptive background model from the reference image.
+    # The model works on the RGB channels, because the mean of the circular HUE channel is not defined.
+    model_chunks = None
+    if model != 'static':
+        if hsv:
+            raise ValueError('Adaptive background models can not be used in HSV mode.')
+
+        model_chunks = create_background_model(
+            reference_image=reference_image[0],
+            model=model,
+            threshold=threshold,
+            threads=threads,
+        )
+
+    # Open the frame source.
+    capture = open_frame_source(
+        source=source,
+    )
+    log('finish preprocessing')
+
+    # Process each frame with the worker pool of the batch.
+    try:
+        __process_frames(
+            threshold=threshold,
+            hsv=hsv,
+            hsv_weights=hsv_weights,
+            kernel=kernel,
+            threads=threads,
+            frames=frames,
+            alpha=alpha,
+            sigma=sigma,
+            reference_image=reference_image,
+            model_chunks=model_chunks,
+            capture=capture,
+            output_path=output_path,
+        )
+        log('finish background subtraction')
+    finally:
+        # Release the frame source.
+        capture.release()
     log('finish postprocessing')
@@ -9,13 +9,14 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.numpy.utils.image import open_project_image, save_project_image
+from src.numpy.utils.roi import roi_layout, any_neighbors_roi
 from src.parser.utils.log import log
 from pathlib import Path
 import numpy as np
 
 BLACK_PIXEL = [0, 0, 0]
 
-def erode(radius: int, input_image_path: Path, output_image_path: Path):
+def erode(radius: int, engine: str, threads: int, input_image_path: Path, output_image_path: Path):
     """ Apply Erosion on an image.
 
         Author:
@@ -23,6 +24,8 @@ def erode(radius: int, input_image_path: Path, output_image_path: Path):
 
         Args:
             radius (int): Radius value for erosion.
+            engine (str): Engine for the neighborhood check.
+            threads (int): Number of threads to use for parallel processing.
             input_image_path (Path): Input path for image file.
             output_image_path (Path): Output path for image file.
     """
@@ -45,26 +48,26 @@ def erode(radius: int, input_image_path: Path, output_image_path: Path):
         axis=-1,
     )
 
-    # Pad the mask to handle border conditions.
-    padded_mask = np.pad(
-        mask,
-        pad_width=radius,
-        mode='constant',
-        constant_values=False,
+    # Check the neighborhood for black pixels with the selected engine.
+    # Set the mask to True if any pixel in the neighborhood is black.
+    # Only the pixels in the regions of interest are checked.
+    mask = any_neighbors_roi(
+        mask=mask,
+        radius=radius,
+        engine=engine,
+        threads=threads,
     )
 
-    # Use a sliding window to check the neighborhood for black pixels.
-    for dy in range(-radius, radius + 1):
-        for dx in range(-radius, radius + 1):
-            # Shift the padded mask and accumulate.
-            # Set the eroded mask to True if any pixel in the neighborhood is black.
-            mask |= padded_mask[
-                radius + dy:radius + dy + mask.shape[0],
-                radius + dx:radius + dx + mask.shape[1],
-            ]
-
     # Where the eroded mask is true, set the output image pixels to black.
     output_image[mask] = BLACK_PIXEL
+
+    # Set the pixels outside the regions of interest to black.
+    layout = roi_layout(
+        height=mask.shape[0],
+        width=mask.shape[1],
+    )
+    if layout is not None:
+        output_image[~layout[0]] = BLACK_PIXEL
     log('finish erode')
 
     # Save the image to the output path.
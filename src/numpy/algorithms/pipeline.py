@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.numpy.algorithms.background_subtraction import background_subtraction_mask
+from src.numpy.utils.image import open_project_image, save_project_image
+from src.numpy.utils.packed import pack_mask, unpack_mask, invert_packed
+from src.numpy.utils.morphology import packed_any_neighbors
+from src.numpy.utils.roi import roi_layout, any_neighbors_roi
+from src.parser.utils.log import log
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+
+WHITE_PIXEL = [255, 255, 255]
+BLACK_PIXEL = [0, 0, 0]
+
+def pipeline(stages: list[tuple[str, dict]], hsv: bool, hsv_weights: tuple[float, float, float], kernel: str, engine: str, threads: int, reference_image: tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]] | None, input_image_path: Path, output_image_path: Path):
+    """ Apply a pipeline of stages on an image.
+        All stages work in memory on a single boolean mask, which is True for white pixels.
+        With the packed engine the mask is packed once before the first morphology stage and unpacked once before saving, so consecutive stages work on 64 pixels per word.
+        Only the input image is opened and only the output image of the last stage is saved.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            stages (list[tuple[str, dict]]): Name and parameters of each stage.
+            hsv (bool): Flag to convert the image to HSV for background subtraction.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            kernel (str): Kernel of the RGB background subtraction, one of KERNELS.
+            engine (str): Engine for the neighborhood check.
+            threads (int): Number of threads to use for parallel processing.
+            reference_image (tuple[np.array, np.array | None, list[np.array]] | None): Reference image opened once for the batch, required for background subtraction.
+            input_image_path (Path): Input path for image file.
+            output_image_path (Path): Output path for image file.
+
+        Raises:
+            ValueError: If background subtraction is used without a reference image.
+            ValueError: If the reference image does not match the input image.
+            ValueError: If the integer kernel is used in HSV mode.
+    """
+    # Open the input image.
+    input_image = open_project_image(
+        image_path=input_image_path,
+    )
+
+    # Convert the input image to a boolean mask like the first stage would.
+    # Erosion keeps all pixels, which are not black, while dilation only keeps white pixels.
+    if stages[0][0] == 'erode':
+        mask = ~np.all(
+            input_image == BLACK_PIXEL,
+            axis=-1,
+        )
+    elif stages[0][0] == 'dilate':
+        mask = np.all(
+            input_image == WHITE_PIXEL,
+            axis=-1,
+        )
+
+    # Get the layout of the regions of interest.
+    # Only pixels inside are processed, pixels outside are False after each stage.
+    layout = roi_layout(
+        height=input_image.shape[0],
+        width=input_image.shape[1],
+    )
+    log('finish preprocessing')
+
+    # Packed mask of the morphology stages with the packed engine, None while the mask is boolean.
+    packed = None
+    width = input_image.shape[1]
+
+    for name, parameters in stages:
+        if name == 'bs':
+            if reference_image is None:
+                raise ValueError('Background subtraction requires a reference image.')
+
+            # Calculate the foreground mask of the input image.
+            mask = background_subtraction_mask(
+                threshold=parameters['threshold'],
+                hsv=hsv,
+                hsv_weights=hsv_weights,
+                kernel=kernel,
+                threads=threads,
+                reference_image=reference_image,
+                image=input_image,
+            )
+            log('finish background subtraction')
+        elif engine == 'packed':
+            # Pack the mask and the regions of interest once, the boolean mask is not needed anymore.
+            if packed is None:
+                packed = pack_mask(
+                    mask=mask,
+                )
+                packed_roi = pack_mask(
+                    mask=layout[0],
+                ) if layout is not None else None
+                mask = None
+
+            if name == 'erode':
+                # Set the mask to False if any pixel in the neighborhood is False.
+                packed = invert_packed(
+                    packed=packed_any_neighbors(
+                        packed=invert_packed(
+                            packed=packed,
+                            width=width,
+                        ),
+                        width=width,
+                        radius=parameters['radius'],
+                        threads=threads,
+                    ),
+                    width=width,
+                )
+            else:
+                # Set the mask to True if any pixel in the neighborhood is True.
+                packed = packed_any_neighbors(
+                    packed=packed,
+                    width=width,
+                    radius=parameters['radius'],
+                    threads=threads,
+                )
+
+            # Set the mask outside the regions of interest to False, the neighborhoods inside are exact.
+            if packed_roi is not None:
+                packed &= packed_roi
+            log(f'finish {name}')
+        elif name == 'erode':
+            # Set the mask to False if any pixel in the neighborhood is False.
+            mask = ~any_neighbors_roi(
+                mask=~mask,
+                radius=parameters['radius'],
+                engine=engine,
+                threads=threads,
+            )
+
+            # Set the mask outside the regions of interest to False again.
+            if layout is not None:
+                mask &= layout[0]
+            log('finish erode')
+        elif name == 'dilate':
+            # Set the mask to True if any pixel in the neighborhood is True.
+            mask = any_neighbors_roi(
+                mask=mask,
+                radius=parameters['radius'],
+                engine=engine,
+                threads=threads,
+            )
+            log('finish dilate')
+
+    # Unpack the mask once after all packed stages.
+    if packed is not None:
+        mask = unpack_mask(
+            packed=packed,
+            width=width,
+        )
+
+    # Create a black project image and set the pixels of the mask to white.
+    output_image = np.zeros_like(input_image)
+    output_image[mask] = WHITE_PIXEL
+
+    # Save the image to the output path.
+    save_project_image(
+        image_path=output_image_path,
+        project_image=output_image,
+    )
+    log('finish postprocessing')
@@ -9,19 +9,368 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.numpy.algorithms.background_subtraction import background_subtraction as background_subtraction_algorithm
+from src.numpy.algorithms.background_subtraction import background_subtraction_strips as background_subtraction_strips_algorithm
+from src.numpy.algorithms.background_subtraction import background_subtraction_video as background_subtraction_video_algorithm
+from src.numpy.algorithms.background_subtraction import background_subtraction_pyramid as background_subtraction_pyramid_algorithm
+from src.numpy.utils.stream import open_project_image_strips, STREAM_SUFFIXES, STREAM_INPUT_SUFFIXES
 from src.numpy.algorithms.dilate import dilate as dilate_algorithm
 from src.numpy.algorithms.erode import erode as erode_algorithm
+from src.numpy.algorithms.pipeline import pipeline as pipeline_algorithm
+from src.numpy.utils.pyramid import open_pyramid_reference_image, PYRAMID_OUTPUTS
+from src.numpy.utils.reference import open_reference_image
+from src.numpy.utils.image import open_project_image
+from src.numpy.utils.pool import use_worker_pool
+from src.numpy.utils.hsv import use_hsv_lut
+from src.numpy.utils.morphology import ENGINES
+from src.numpy.utils.background import MODELS
+from src.numpy.utils.kernel import KERNELS
+from src.parser.utils.log import set_log_base, start_trace
+from src.parser.utils.pipeline import parse_pipeline
+from src.parser.utils.codec import use_codec, output_image_path, CODECS
+from src.parser.utils.roi import use_roi, parse_roi
+from src.parser.utils.cache import use_image_cache
+from src.parser.utils.batch import run_batch
 from pathlib import Path
 import click
 
+# Shared parameters of a batch, set once per process by the batch initializer.
+batch_parameters = {}
+
+def __init_batch(**parameters):
+    """ Initialize the shared parameters of a batch.
+        The reference image file is opened once and replaced by the reference image, the worker pool is created once.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            parameters (dict): Shared parameters of the batch.
+    """
+    set_log_base()
+    batch_parameters.clear()
+    batch_parameters.update(parameters)
+
+    # Write all output images of the batch with the selected codec.
+    use_codec(
+        name=batch_parameters.pop('codec', 'pil'),
+        compression_level=batch_parameters.pop('compression', 6),
+    )
+
+    # Process only the regions of interest of all images of the batch.
+    use_roi(
+        roi=batch_parameters.pop('roi', ()),
+    )
+
+    # Map the decoded input images of the batch from the image cache.
+    image_cache = batch_parameters.pop('image_cache', None)
+    use_image_cache(
+        directory=Path(image_cache) if image_cache is not None else None,
+        max_size=batch_parameters.pop('image_cache_size', 1024) << 20,
+    )
+
+    # Create the worker pool once for all images of the batch.
+    # The chunks of each image are computed by the same threads, which keep their scratch buffers.
+    use_worker_pool(
+        threads=parameters['threads'],
+    )
+
+    # Use the HSV lookup table for all conversions of the batch.
+    # The table is built once into its cache directory and memory mapped by each process.
+    hsv_lut = batch_parameters.pop('hsv_lut', None)
+    if hsv_lut is not None and parameters['hsv']:
+        use_hsv_lut(
+            directory=Path(hsv_lut),
+        )
+
+    # Open the reference image once for the whole batch.
+    reference_image_file = batch_parameters.pop('reference_image_file', None)
+    if reference_image_file is not None:
+        reference_image_path = Path(reference_image_file)
+
+        if parameters.get('strip_height', 0) > 0:
+            # In strip mode the reference image is only opened for reading strips.
+            batch_parameters['reference_image'] = open_project_image_strips(
+                image_path=reference_image_path,
+            )
+        elif parameters.get('pyramid', 0) > 0:
+            # In pyramid mode the reference image is scaled down in the same way as the input images.
+            batch_parameters['reference_image'] = open_pyramid_reference_image(
+                image_path=reference_image_path,
+                hsv=parameters['hsv'],
+                threads=parameters['threads'],
+                levels=parameters['pyramid'],
+                output=parameters['pyramid_output'],
+            )
+        else:
+            batch_parameters['reference_image'] = open_reference_image(
+                image_path=reference_image_path,
+                hsv=parameters['hsv'],
+                threads=parameters['threads'],
+            )
+
+def __background_subtraction_job(image_file: str):
+    """ Background Subtraction on a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform background subtraction on the image strip by strip.
+    # The output image keeps the format of the image if it can be written strip by strip.
+    if batch_parameters['strip_height'] > 0:
+        output_suffix = image_path.suffix if image_path.suffix in STREAM_SUFFIXES else '.png'
+
+        background_subtraction_strips_algorithm(
+            threshold=batch_parameters['threshold'],
+            hsv=batch_parameters['hsv'],
+            hsv_weights=batch_parameters['hsv_weights'],
+            kernel=batch_parameters['kernel'],
+            threads=batch_parameters['threads'],
+            strip_height=batch_parameters['strip_height'],
+            reference_image=batch_parameters['reference_image'],
+            input_image_path=image_path,
+            output_image_path=image_path.parent / f'background_subtraction_{image_path.stem}{output_suffix}',
+        )
+        return
+
+    # Perform background subtraction on the image at a reduced resolution.
+    if batch_parameters['pyramid'] > 0:
+        background_subtraction_pyramid_algorithm(
+            threshold=batch_parameters['threshold'],
+            hsv=batch_parameters['hsv'],
+            hsv_weights=batch_parameters['hsv_weights'],
+            kernel=batch_parameters['kernel'],
+            threads=batch_parameters['threads'],
+            levels=batch_parameters['pyramid'],
+            output=batch_parameters['pyramid_output'],
+            reference_image=batch_parameters['reference_image'],
+            input_image_path=image_path,
+            output_image_path=output_image_path(
+                image_path=image_path,
+                prefix='background_subtraction',
+            ),
+        )
+        return
+
+    # Perform background subtraction on the image.
+    background_subtraction_algorithm(
+        threshold=batch_parameters['threshold'],
+        hsv=batch_parameters['hsv'],
+        hsv_weights=batch_parameters['hsv_weights'],
+        kernel=batch_parameters['kernel'],
+        threads=batch_parameters['threads'],
+        reference_image=batch_parameters['reference_image'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='background_subtraction',
+        ),
+    )
+
+def __background_subtraction_video_job(source: str):
+    """ Background Subtraction on the frames of a video file or a camera.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            source (str): Path to a video file or index of a camera.
+    """
+    set_log_base()
+
+    # Perform background subtraction on each frame.
+    background_subtraction_video_algorithm(
+        threshold=batch_parameters['threshold'],
+        hsv=batch_parameters['hsv'],
+        hsv_weights=batch_parameters['hsv_weights'],
+        kernel=batch_parameters['kernel'],
+        threads=batch_parameters['threads'],
+        frames=batch_parameters['frames'],
+        model=batch_parameters['model'],
+        alpha=batch_parameters['alpha'],
+        sigma=batch_parameters['sigma'],
+        reference_image=batch_parameters['reference_image'],
+        source=source,
+        output_path=Path(batch_parameters['output']),
+    )
+
+def __erode_job(image_file: str):
+    """ Erode a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform erosion on the image.
+    erode_algorithm(
+        radius=batch_parameters['radius'],
+        engine=batch_parameters['engine'],
+        threads=batch_parameters['threads'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='erode',
+        ),
+    )
+
+def __dilate_job(image_file: str):
+    """ Dilate a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform dilation on the image.
+    dilate_algorithm(
+        radius=batch_parameters['radius'],
+        engine=batch_parameters['engine'],
+        threads=batch_parameters['threads'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='dilate',
+        ),
+    )
+
+def __pipeline_job(image_file: str):
+    """ Pipeline of stages on a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform the pipeline on the image.
+    pipeline_algorithm(
+        stages=batch_parameters['stages'],
+        hsv=batch_parameters['hsv'],
+        hsv_weights=batch_parameters['hsv_weights'],
+        kernel=batch_parameters['kernel'],
+        engine=batch_parameters['engine'],
+        threads=batch_parameters['threads'],
+        reference_image=batch_parameters.get('reference_image'),
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='pipeline',
+        ),
+    )
+
+def __parse_pipeline_argument(context: click.Context, parameter: click.Parameter, value: str) -> list[tuple[str, dict]]:
+    """ Parse the pipeline argument of a CLI command.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Context of the CLI command.
+            parameter (click.Parameter): Pipeline argument.
+            value (str): Pipeline of stages.
+
+        Returns:
+            list[tuple[str, dict]]: Name and parameters of each stage.
+
+        Raises:
+            click.BadParameter: If the pipeline is invalid.
+    """
+    try:
+        return parse_pipeline(
+            pipeline=value,
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
+def __parse_roi_option(context: click.Context, parameter: click.Parameter, value: tuple[str, ...]) -> tuple[tuple[int, int, int, int] | str, ...]:
+    """ Parse the regions of interest of a CLI command.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Context of the CLI command.
+            parameter (click.Parameter): ROI option.
+            value (tuple[str, ...]): Rectangles as x,y,width,height or paths of binary ROI images.
+
+        Returns:
+            tuple[tuple[int, int, int, int] | str, ...]: Rectangles and paths of the ROI images.
+
+        Raises:
+            click.BadParameter: If a region is invalid.
+    """
+    try:
+        return tuple(
+            parse_roi(
+                value=region,
+            )
+                for region in value
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
 @click.group()
-def cli():
+@click.option(
+    '--console',
+    '-c',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Print the time tracking events directly with rich.'
+)
+@click.option(
+    '--trace-file',
+    '-T',
+    type=click.Path(
+        dir_okay=False,
+        file_okay=True,
+        allow_dash=True,
+    ),
+    default='-',
+    show_default=True,
+    help='File for the recorded time tracking events, written at exit.'
+)
+def cli(console: bool, trace_file: str):
     """ Image Processing Performance - Numpy Implementation
 
         Author:
             Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            console (bool): Print the time tracking events directly with rich.
+            trace_file (str): File for the recorded time tracking events, written at exit.
     """
-    pass
+    # Record the time tracking events in the trace buffer unless the console is requested.
+    # This keeps the overhead of the time tracking low.
+    if not console:
+        start_trace(
+            trace_file=trace_file,
+        )
 
 @cli.command(
     name='background_subtraction',
@@ -51,6 +400,24 @@ def cli():
     show_default=True,
     help='HSV weights for background subtraction.'
 )
+@click.option(
+    '--hsv-lut',
+    '-L',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the HSV lookup table, which replaces the HSV conversion.'
+)
+@click.option(
+    '--kernel',
+    '-K',
+    type=click.Choice(KERNELS),
+    default='float',
+    show_default=True,
+    help='Kernel of the RGB background subtraction, integer compares the summed differences in integer space.'
+)
 @click.option(
     '--threads',
     '-m',
@@ -59,6 +426,87 @@ def cli():
     show_default=True,
     help='Number of threads.'
 )
+@click.option(
+    '--strip-height',
+    '-s',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Number of rows per strip for streaming, 0 processes the whole image.'
+)
+@click.option(
+    '--pyramid',
+    '-p',
+    type=click.IntRange(0, 8),
+    default=0,
+    show_default=True,
+    help='Number of pyramid levels, the difference is calculated at 1/2^levels of the resolution, 0 processes the full resolution.'
+)
+@click.option(
+    '--pyramid-output',
+    '-P',
+    type=click.Choice(PYRAMID_OUTPUTS),
+    default='upsample',
+    show_default=True,
+    help='Output of the pyramid mode: mask at the reduced scale, upsampled mask or mask refined at full resolution in the changed tiles.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'reference_image_file',
     type=click.Path(
@@ -76,7 +524,7 @@ def cli():
     required=True,
     nargs=-1,
 )
-def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], threads: int, reference_image_file: str, image_files: tuple[str, ...]):
+def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], hsv_lut: str | None, kernel: str, threads: int, strip_height: int, pyramid: int, pyramid_output: str, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, reference_image_file: str, image_files: tuple[str, ...]):
     """ Background Subtraction on a set of images.
 
         Author:
@@ -86,27 +534,230 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): Flag to convert the image to HSV.
             hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            hsv_lut (str | None): Cache directory of the HSV lookup table.
+            kernel (str): Kernel of the RGB background subtraction.
             threads (int): Number of threads to use for parallel processing.
+            strip_height (int): Number of rows per strip for streaming, 0 processes the whole image.
+            pyramid (int): Number of pyramid levels, 0 processes the full resolution.
+            pyramid_output (str): Output of the pyramid mode.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             reference_image_file (str): Reference image file.
             image_files (tuple[str, ...]): List of image files.
+
+        Raises:
+            click.UsageError: If the pyramid mode is combined with strips.
+            click.UsageError: If the regions of interest are combined with strips or the pyramid mode.
+            click.UsageError: If the image cache is combined with strips.
+            click.UsageError: If another codec than pil is combined with strips.
+            click.UsageError: If an image of the strip mode can not be read strip by strip.
     """
-    # Convert the reference image file to a Path object.
-    reference_image_path = Path(reference_image_file)
-
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform background subtraction on the image.
-        background_subtraction_algorithm(
-            threshold=threshold,
-            hsv=hsv,
-            hsv_weights=hsv_weights,
-            threads=threads,
-            reference_image_path=reference_image_path,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'background_subtraction_{image_path.name}',
-        )
+    # Check if only one of the strip and the pyramid mode is used.
+    if strip_height > 0 and pyramid > 0:
+        raise click.UsageError('The pyramid mode can not be combined with --strip-height.')
+
+    # Check if the regions of interest are used on whole images at full resolution.
+    if roi and (strip_height > 0 or pyramid > 0):
+        raise click.UsageError('The regions of interest can not be combined with --strip-height or --pyramid.')
+
+    # Check if the image cache is used on whole images, strips are streamed from the files.
+    if image_cache is not None and strip_height > 0:
+        raise click.UsageError('The image cache can not be combined with --strip-height.')
+
+    # Check if the strips are written in their own format, only the compression level of PNG files is used.
+    if codec != 'pil' and strip_height > 0:
+        raise click.UsageError('The codec can not be combined with --strip-height, strips keep the format of the image.')
+
+    # Check if all images can be read strip by strip, other formats would be decoded completely.
+    if strip_height > 0:
+        for image_file in (reference_image_file, *image_files):
+            if Path(image_file).suffix not in STREAM_INPUT_SUFFIXES:
+                raise click.UsageError(f'The image {image_file} can not be read strip by strip, --strip-height requires NPY or PPM files.')
+
+    # Perform background subtraction on each image.
+    # The reference image is opened once per process.
+    # Strips are read and written by the algorithm itself, so they are not overlapped.
+    # Images at a pyramid level are decoded by the algorithm itself, so they are only written behind.
+    run_batch(
+        function=__background_subtraction_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'threshold': threshold,
+            'hsv': hsv,
+            'hsv_weights': hsv_weights,
+            'hsv_lut': hsv_lut,
+            'kernel': kernel,
+            'threads': threads,
+            'strip_height': strip_height,
+            'pyramid': pyramid,
+            'pyramid_output': pyramid_output,
+            'reference_image_file': reference_image_file,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap if strip_height == 0 else 0,
+        read=open_project_image if pyramid == 0 or pyramid_output == 'refine' else None,
+    )
+
+@cli.command(
+    name='video',
+    help='Background Subtraction on the frames of a video file or a camera.'
+)
+@click.option(
+    '--threshold',
+    '-t',
+    type=float,
+    default=20.0,
+    show_default=True,
+    help='Threshold value for background subtraction.'
+)
+@click.option(
+    '--hsv',
+    '-h',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='HSV mode for background subtraction.'
+)
+@click.option(
+    '--hsv-weights',
+    '-w',
+    type=(float, float, float),
+    default=(0.75, 0.3, 0.2),
+    show_default=True,
+    help='HSV weights for background subtraction.'
+)
+@click.option(
+    '--hsv-lut',
+    '-L',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the HSV lookup table, which replaces the HSV conversion.'
+)
+@click.option(
+    '--kernel',
+    '-K',
+    type=click.Choice(KERNELS),
+    default='float',
+    show_default=True,
+    help='Kernel of the RGB background subtraction, integer compares the summed differences in integer space.'
+)
+@click.option(
+    '--threads',
+    '-m',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of threads.'
+)
+@click.option(
+    '--frames',
+    '-n',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Maximum number of frames, 0 processes the whole source.'
+)
+@click.option(
+    '--model',
+    '-b',
+    type=click.Choice(MODELS),
+    default='static',
+    show_default=True,
+    help='Background model, adaptive models start with the reference image.'
+)
+@click.option(
+    '--alpha',
+    '-a',
+    type=float,
+    default=0.05,
+    show_default=True,
+    help='Learning rate of the adaptive background model.'
+)
+@click.option(
+    '--sigma',
+    '-k',
+    type=float,
+    default=2.5,
+    show_default=True,
+    help='Number of standard deviations for the gaussian background model.'
+)
+@click.argument(
+    'reference_image_file',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+    ),
+    required=True,
+)
+@click.argument(
+    'source',
+    type=str,
+    required=True,
+)
+@click.argument(
+    'output',
+    type=click.Path(
+        resolve_path=True,
+    ),
+    required=True,
+)
+def video(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], hsv_lut: str | None, kernel: str, threads: int, frames: int, model: str, alpha: float, sigma: float, reference_image_file: str, source: str, output: str):
+    """ Background Subtraction on the frames of a video file or a camera.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+            hsv (bool): Flag to convert the image to HSV.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            hsv_lut (str | None): Cache directory of the HSV lookup table.
+            kernel (str): Kernel of the RGB background subtraction.
+            threads (int): Number of threads to use for parallel processing.
+            frames (int): Maximum number of frames, 0 processes the whole source.
+            model (str): Background model, one of MODELS.
+            alpha (float): Learning rate of the adaptive background model.
+            sigma (float): Number of standard deviations for the gaussian background model.
+            reference_image_file (str): Reference image file.
+            source (str): Path to a video file or index of a camera.
+            output (str): Output video file (.avi, .mp4) or directory for the frames.
+    """
+    # Perform background subtraction on the frames of the source.
+    # The source is a single stream, so it is processed by a single job.
+    run_batch(
+        function=__background_subtraction_video_job,
+        arguments=[source],
+        jobs=1,
+        initializer=__init_batch,
+        parameters={
+            'threshold': threshold,
+            'hsv': hsv,
+            'hsv_weights': hsv_weights,
+            'hsv_lut': hsv_lut,
+            'kernel': kernel,
+            'threads': threads,
+            'frames': frames,
+            'model': model,
+            'alpha': alpha,
+            'sigma': sigma,
+            'output': output,
+            'reference_image_file': reference_image_file,
+        },
+    )
 
 @cli.command(
     name='erode',
@@ -120,6 +771,79 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     show_default=True,
     help='Radius value for erosion.'
 )
+@click.option(
+    '--engine',
+    '-e',
+    type=click.Choice(ENGINES),
+    default='shift',
+    show_default=True,
+    help='Engine for the neighborhood check.'
+)
+@click.option(
+    '--threads',
+    '-m',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of threads.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'image_files',
     type=click.Path(
@@ -129,7 +853,7 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     required=True,
     nargs=-1,
 )
-def erode(radius: int, image_files: tuple[str, ...]):
+def erode(radius: int, engine: str, threads: int, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, image_files: tuple[str, ...]):
     """ Erode a set of images.
 
         Author:
@@ -137,18 +861,36 @@ def erode(radius: int, image_files: tuple[str, ...]):
 
         Args:
             radius (int): Radius value for erosion.
+            engine (str): Engine for the neighborhood check.
+            threads (int): Number of threads to use for parallel processing.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             image_files (tuple[str, ...]): List of image files.
     """
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform erosion on the image.
-        erode_algorithm(
-            radius=radius,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'erode_{image_path.name}',
-        )
+    # Perform erosion on each image.
+    run_batch(
+        function=__erode_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'radius': radius,
+            'engine': engine,
+            'threads': threads,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
 
 @cli.command(
     name='dilate',
@@ -162,6 +904,79 @@ def erode(radius: int, image_files: tuple[str, ...]):
     show_default=True,
     help='Radius value for dilation.'
 )
+@click.option(
+    '--engine',
+    '-e',
+    type=click.Choice(ENGINES),
+    default='shift',
+    show_default=True,
+    help='Engine for the neighborhood check.'
+)
+@click.option(
+    '--threads',
+    '-m',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of threads.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'image_files',
     type=click.Path(
@@ -171,7 +986,7 @@ def erode(radius: int, image_files: tuple[str, ...]):
     required=True,
     nargs=-1,
 )
-def dilate(radius: int, image_files: tuple[str, ...]):
+def dilate(radius: int, engine: str, threads: int, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, image_files: tuple[str, ...]):
     """ Dilate a set of images.
 
         Author:
@@ -179,15 +994,222 @@ def dilate(radius: int, image_files: tuple[str, ...]):
 
         Args:
             radius (int): Radius value for dilation.
+            engine (str): Engine for the neighborhood check.
+            threads (int): Number of threads to use for parallel processing.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             image_files (tuple[str, ...]): List of image files.
     """
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
+    # Perform dilation on each image.
+    run_batch(
+        function=__dilate_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'radius': radius,
+            'engine': engine,
+            'threads': threads,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
 
-        # Perform dilation on the image.
-        dilate_algorithm(
-            radius=radius,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'dilate_{image_path.name}',
-        )
+@cli.command(
+    name='pipeline',
+    help='Pipeline of stages like bs:t=20,erode:r=2,dilate:r=2 on a set of images.'
+)
+@click.option(
+    '--reference-image-file',
+    '-i',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Reference image file, required for background subtraction.'
+)
+@click.option(
+    '--hsv',
+    '-h',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='HSV mode for background subtraction.'
+)
+@click.option(
+    '--hsv-weights',
+    '-w',
+    type=(float, float, float),
+    default=(0.75, 0.3, 0.2),
+    show_default=True,
+    help='HSV weights for background subtraction.'
+)
+@click.option(
+    '--hsv-lut',
+    '-L',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the HSV lookup table, which replaces the HSV conversion.'
+)
+@click.option(
+    '--kernel',
+    '-K',
+    type=click.Choice(KERNELS),
+    default='float',
+    show_default=True,
+    help='Kernel of the RGB background subtraction, integer compares the summed differences in integer space.'
+)
+@click.option(
+    '--engine',
+    '-e',
+    type=click.Choice(ENGINES),
+    default='shift',
+    show_default=True,
+    help='Engine for the neighborhood check.'
+)
+@click.option(
+    '--threads',
+    '-m',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of threads.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
+@click.argument(
+    'stages',
+    callback=__parse_pipeline_argument,
+    required=True,
+)
+@click.argument(
+    'image_files',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+    ),
+    required=True,
+    nargs=-1,
+)
+def pipeline(reference_image_file: str | None, hsv: bool, hsv_weights: tuple[float, float, float], hsv_lut: str | None, kernel: str, engine: str, threads: int, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, stages: list[tuple[str, dict]], image_files: tuple[str, ...]):
+    """ Pipeline of stages on a set of images without intermediate image files.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            reference_image_file (str | None): Reference image file, required for background subtraction.
+            hsv (bool): Flag to convert the image to HSV for background subtraction.
+            hsv_weights (tuple[float, float, float]): Weights for the HSV channels.
+            hsv_lut (str | None): Cache directory of the HSV lookup table.
+            kernel (str): Kernel of the RGB background subtraction.
+            engine (str): Engine for the neighborhood check.
+            threads (int): Number of threads to use for parallel processing.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
+            stages (list[tuple[str, dict]]): Name and parameters of each stage.
+            image_files (tuple[str, ...]): List of image files.
+    """
+    # Check if the reference image is given for background subtraction.
+    if stages[0][0] == 'bs' and reference_image_file is None:
+        raise click.UsageError('Background subtraction requires --reference-image-file.')
+
+    # Perform the pipeline on each image.
+    # The reference image is opened once per process.
+    run_batch(
+        function=__pipeline_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'stages': stages,
+            'hsv': hsv,
+            'hsv_weights': hsv_weights,
+            'hsv_lut': hsv_lut,
+            'kernel': kernel,
+            'engine': engine,
+            'threads': threads,
+            'reference_image_file': reference_image_file,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
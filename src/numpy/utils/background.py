@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.numpy.utils.chunk import split_chunks
+import numpy.typing as npt
+import numpy as np
+
+# Background models, static uses the reference image without updates.
+MODELS = ['static', 'ema', 'gaussian']
+
+# Lower bound of the variance per channel.
+# Without it, the variance of a perfectly static pixel drops to zero and any noise is foreground.
+MIN_VARIANCE = 4.0
+
+def create_background_model(reference_image: npt.NDArray[np.uint8], model: str, threshold: float, threads: int) -> list[dict[str, npt.NDArray]]:
+    """ Create an adaptive background model from a reference image.
+        The model is split into the same chunks as the frames and holds all buffers of a chunk, so updates do not allocate memory.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            reference_image (np.array): RGB reference image, which is the initial background.
+            model (str): Background model, ema or gaussian.
+            threshold (float): Threshold value, the gaussian model starts with its square as variance.
+            threads (int): Number of chunks.
+
+        Returns:
+            list[dict[str, np.array]]: Mean, optional variance and scratch buffers of each chunk.
+
+        Raises:
+            ValueError: If the model is not adaptive.
+    """
+    if model not in ('ema', 'gaussian'):
+        raise ValueError(f'Unknown adaptive background model {model}.')
+
+    model_chunks: list[dict[str, npt.NDArray]] = []
+    for reference_chunk in split_chunks(
+        array=reference_image,
+        chunks=threads,
+    ):
+        height, width = reference_chunk.shape[:2]
+
+        model_chunk = {
+            # Running mean of each channel.
+            'mean': reference_chunk.astype(np.float32),
+            # Scratch buffers for the difference to the mean and its square or absolute value.
+            'difference': np.empty((height, width, 3), dtype=np.float32),
+            'square': np.empty((height, width, 3), dtype=np.float32),
+            # Scratch buffers for the distance and the threshold of each pixel.
+            'distance': np.empty((height, width), dtype=np.float32),
+            'limit': np.empty((height, width), dtype=np.float32),
+            'mask': np.empty((height, width), dtype=np.bool_),
+        }
+
+        # Running variance of each channel.
+        if model == 'gaussian':
+            model_chunk['variance'] = np.full(
+                (height, width, 3),
+                max(threshold ** 2, MIN_VARIANCE),
+                dtype=np.float32,
+            )
+
+        model_chunks.append(model_chunk)
+
+    return model_chunks
+
+def update_background_chunk(model_chunk: dict[str, npt.NDArray], threshold: float, alpha: float, sigma: float, image_chunk: npt.NDArray[np.uint8], output_chunk: npt.NDArray[np.uint8]):
+    """ Classify a chunk of a frame against the background model and update the model in place.
+        The exponential moving average compares the mean difference of the channels with the threshold.
+        The gaussian model compares the squared difference with the variance scaled by sigma.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            model_chunk (dict[str, np.array]): Chunk of the background model.
+            threshold (float): Threshold value for the exponential moving average.
+            alpha (float): Learning rate of the model.
+            sigma (float): Number of standard deviations for the gaussian model.
+            image_chunk (np.array): Chunk of the RGB frame.
+            output_chunk (np.array): Chunk of the output frame, which is white for foreground pixels.
+    """
+    mean = model_chunk['mean']
+    difference = model_chunk['difference']
+    square = model_chunk['square']
+    distance = model_chunk['distance']
+    limit = model_chunk['limit']
+    mask = model_chunk['mask']
+
+    # Calculate the difference between the frame and the mean.
+    np.subtract(image_chunk, mean, out=difference)
+
+    if 'variance' in model_chunk:
+        variance = model_chunk['variance']
+
+        # Foreground pixels differ by more than sigma standard deviations.
+        # Compare the sum of the squared differences with the sum of the variances.
+        np.multiply(difference, difference, out=square)
+        np.sum(square, axis=2, out=distance)
+        np.sum(variance, axis=2, out=limit)
+        np.multiply(limit, sigma ** 2, out=limit)
+        np.greater(distance, limit, out=mask)
+
+        # Update the variance with the exponential moving variance.
+        # var = (1 - alpha) * (var + alpha * difference^2)
+        np.multiply(square, alpha, out=square)
+        np.add(variance, square, out=variance)
+        np.multiply(variance, 1 - alpha, out=variance)
+        np.maximum(variance, MIN_VARIANCE, out=variance)
+    else:
+        # Calculate the mean of the absolute differences along the color channels.
+        np.abs(difference, out=square)
+        np.sum(square, axis=2, out=distance)
+        np.divide(distance, 3, out=distance)
+        np.greater(distance, threshold, out=mask)
+
+    # Update the mean with the exponential moving average.
+    # mean = mean + alpha * difference
+    np.multiply(difference, alpha, out=difference)
+    np.add(mean, difference, out=mean)
+
+    # Set the output pixels to white where the mask is True and to black otherwise.
+    np.multiply(mask[:, :, np.newaxis], 255, out=output_chunk, casting='unsafe')
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from functools import lru_cache
+import numpy.typing as npt
+
+@lru_cache(maxsize=256)
+def chunk_boundaries(length: int, chunks: int) -> tuple[tuple[int, int], ...]:
+    """ Calculate the boundaries of chunks along one axis.
+        The boundaries match the chunks of np.array_split.
+        They are calculated once per length and number of chunks, so images of the same shape share them.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            length (int): Length of the axis.
+            chunks (int): Number of chunks.
+
+        Returns:
+            tuple[tuple[int, int], ...]: Start and end of each chunk.
+    """
+    # The first chunks get one more element if the length is not divisible.
+    size, remainder = divmod(length, chunks)
+
+    boundaries: list[tuple[int, int]] = []
+    start = 0
+    for index in range(chunks):
+        end = start + size + (1 if index < remainder else 0)
+        boundaries.append((start, end))
+        start = end
+
+    return tuple(boundaries)
+
+def split_chunks(array: npt.NDArray, chunks: int) -> list[npt.NDArray]:
+    """ Split an array into views along the height (axis=0).
+        The views match the chunks of np.array_split, but reuse the cached boundaries of the height.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            array (np.array): Array to split.
+            chunks (int): Number of chunks.
+
+        Returns:
+            list[np.array]: View of each chunk.
+    """
+    return [
+        array[start:end]
+            for start, end in chunk_boundaries(
+                length=array.shape[0],
+                chunks=chunks,
+            )
+    ]
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.lut import open_lut
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Lookup table of the HSV pixels, which replaces the conversion if it is set.
+hsv_lut: npt.NDArray[np.uint8] | None = None
+
+def __build_hsv_lut(indices: npt.NDArray[np.uint32], values: npt.NDArray[np.uint8]):
+    """ Build the OpenCV HSV pixels for a chunk of RGB pixel indices.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            indices (np.array): RGB pixel indices.
+            values (np.array): HSV pixels, which are filled.
+    """
+    # Create an image with one row of RGB pixels and convert it with OpenCV.
+    rgb_pixels = np.stack(
+        [
+            indices >> 16 & 255,
+            indices >> 8 & 255,
+            indices & 255,
+        ],
+        axis=-1,
+    ).astype(np.uint8)
+
+    values[:] = cv2.cvtColor(rgb_pixels[np.newaxis], cv2.COLOR_RGB2HSV)[0]
+
+def use_hsv_lut(directory: Path | None):
+    """ Use a lookup table from a cache directory for all following HSV conversions.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path | None): Cache directory of the lookup table or None to convert with OpenCV.
+    """
+    global hsv_lut
+
+    if directory is None:
+        hsv_lut = None
+        return
+
+    hsv_lut = open_lut(
+        directory=directory,
+        name='hsv_lut_opencv',
+        dtype=np.uint8,
+        build=__build_hsv_lut,
+    )
+
+def rgb_to_hsv(image: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+    """ Convert an RGB image to HSV.
+        HUE values are in the range [0, 180].
+        SATURATION and VALUE values are in the range [0, 255].
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image (np.array): RGB image.
+
+        Returns:
+            np.array: HSV image.
+    """
+    if hsv_lut is None:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+
+    # Gather the HSV pixels with the index red << 16 | green << 8 | blue.
+    indices = image[..., 0].astype(np.uint32) << 16
+    indices |= image[..., 1].astype(np.uint32) << 8
+    indices |= image[..., 2]
+
+    return hsv_lut[indices]
@@ -8,7 +8,9 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
-from PIL import Image as PILImage
+from src.parser.utils.codec import open_pil_image, save_array_image
+from src.parser.utils.cache import open_cached_image
+from src.parser.utils.overlap import take_prefetched, write_behind
 from src.parser.utils.log import log
 import numpy.typing as npt
 from pathlib import Path
@@ -26,10 +28,24 @@ def open_project_image(image_path: Path) -> npt.NDArray[np.uint8]:
         Returns:
             np.array: Numpy array of the project image.
     """
-    # Open the image with the PIL library.
-    pil_image = PILImage.open(
-        fp=image_path,
-        mode='r',
+    # Take the image from the reader of the batch, if it was read ahead.
+    taken, project_image = take_prefetched(
+        read=open_project_image,
+        image_path=image_path,
+    )
+    if taken:
+        return project_image
+
+    # Copy the decoded image from the cache, if it is used.
+    cached_image = open_cached_image(
+        image_path=image_path,
+    )
+    if cached_image is not None:
+        return np.array(cached_image)
+
+    # Open the image with the PIL library, NPY files are loaded with numpy.
+    pil_image = open_pil_image(
+        image_path=image_path,
     )
     log('finish open pil image')
 
@@ -52,14 +68,17 @@ def save_project_image(image_path: Path, project_image: npt.NDArray[np.uint8]):
             image_path (Path): Path to the image.
             project_image (np.array): Numpy array of the project image.
     """
-    # Create a new PIL image with the same width and height as the project image.
-    pil_image = PILImage.fromarray(
-        obj=project_image,
-    )
-    log('finish create pil image')
+    # Hand the image to the writer of the batch, if it writes behind.
+    if write_behind(
+        write=save_project_image,
+        image_path=image_path,
+        project_image=project_image,
+    ):
+        return
 
-    # Save the PIL image to the file.
-    pil_image.save(
-        fp=image_path,
+    # Save the project image with the codec of the batch.
+    save_array_image(
+        image_path=image_path,
+        array=project_image,
     )
-    log('finish save pil image')
+    log('finish save image')
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+import numpy.typing as npt
+import numpy as np
+import threading
+import math
+import cv2
+
+# Kernels of the RGB background subtraction.
+# float calculates the mean difference in float64, integer compares the sum of the differences in integer space.
+KERNELS = ['float', 'integer']
+
+# Scratch buffers of each thread, reused for all chunks with the same shape.
+__scratch = threading.local()
+
+def scratch_buffer(name: str, shape: tuple[int, ...], dtype: npt.DTypeLike) -> npt.NDArray:
+    """ Get a scratch buffer of the current thread.
+        The buffer is only allocated again if the shape or the data type changes.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            name (str): Name of the buffer.
+            shape (tuple[int, ...]): Shape of the buffer.
+            dtype (npt.DTypeLike): Data type of the buffer.
+
+        Returns:
+            np.array: Uninitialized scratch buffer.
+    """
+    buffers = __scratch.__dict__
+    buffer = buffers.get(name)
+
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        buffer = np.empty(shape, dtype=dtype)
+        buffers[name] = buffer
+
+    return buffer
+
+def integer_threshold(threshold: float) -> int:
+    """ Convert the threshold of the mean difference to a limit of the summed difference.
+        The mean of three integers is greater than the threshold, if their sum is greater than floor(3 * threshold).
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threshold (float): Threshold value for background subtraction.
+
+        Returns:
+            int: Limit of the summed difference in the range [-1, 765].
+    """
+    return min(max(math.floor(3 * threshold), -1), 765)
+
+def integer_mask_chunk(limit: int, reference_image_chunk: npt.NDArray[np.uint8], image_chunk: npt.NDArray[np.uint8], mask_chunk: npt.NDArray[np.bool_]):
+    """ Calculate the foreground mask of a chunk of an image in integer space.
+        All intermediate values are written into scratch buffers of the current thread.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            limit (int): Limit of the summed difference, see integer_threshold.
+            reference_image_chunk (np.array): Chunk of the reference image.
+            image_chunk (np.array): Chunk of the image.
+            mask_chunk (np.array): Boolean mask of the chunk, which is filled.
+    """
+    # Calculate the absolute difference of each channel without widening the pixels.
+    difference = scratch_buffer(
+        name='difference',
+        shape=image_chunk.shape,
+        dtype=np.uint8,
+    )
+    cv2.absdiff(image_chunk, reference_image_chunk, dst=difference)
+
+    # Sum the differences of the channels, the sum fits into 16 bits.
+    summed_difference = scratch_buffer(
+        name='summed_difference',
+        shape=image_chunk.shape[:2],
+        dtype=np.uint16,
+    )
+    np.add(difference[:, :, 0], difference[:, :, 1], out=summed_difference, dtype=np.uint16)
+    np.add(summed_difference, difference[:, :, 2], out=summed_difference)
+
+    # Compare the sum with the limit.
+    np.greater(summed_difference, limit, out=mask_chunk)
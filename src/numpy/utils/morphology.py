@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.numpy.utils.packed import pack_mask, unpack_mask, any_neighbors_packed
+from src.numpy.utils.chunk import chunk_boundaries
+from src.numpy.utils.pool import map_chunks
+import numpy.typing as npt
+import numpy as np
+
+ENGINES = ['shift', 'separable', 'packed']
+
+def any_neighbors_shift(mask: npt.NDArray[np.bool_], radius: int) -> npt.NDArray[np.bool_]:
+    """ Check for each pixel if any neighbor in the square window is set.
+        Reference engine, which accumulates all (2r+1)^2 shifted slices of the padded mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask, which is updated in place.
+            radius (int): Radius value.
+
+        Returns:
+            np.array: Boolean mask where any neighbor is set.
+    """
+    # Pad the mask to handle border conditions.
+    padded_mask = np.pad(
+        mask,
+        pad_width=radius,
+        mode='constant',
+        constant_values=False,
+    )
+
+    # Use a sliding window to check the neighborhood.
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            # Shift the padded mask and accumulate.
+            # Set the mask to True if any pixel in the neighborhood is set.
+            mask |= padded_mask[
+                radius + dy:radius + dy + mask.shape[0],
+                radius + dx:radius + dx + mask.shape[1],
+            ]
+
+    return mask
+
+def __running_any(mask: npt.NDArray[np.bool_], radius: int, axis: int) -> npt.NDArray[np.bool_]:
+    """ Check for each pixel if any pixel in the window along one axis is set.
+        Algorithm reference from van Herk, A fast algorithm for local minimum and maximum filters on rectangular and octagonal kernels (1992).
+        Algorithm reference from Gil and Werman, Computing 2-D min, median, and max filters (1993).
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask.
+            radius (int): Radius value.
+            axis (int): Axis of the window.
+
+        Returns:
+            np.array: Boolean mask where any pixel in the window is set.
+    """
+    # Move the window axis to the front.
+    mask = np.moveaxis(mask, axis, 0)
+    length = mask.shape[0]
+    window = 2 * radius + 1
+
+    # Pad the mask by the radius in front and up to a multiple of the window size in the back.
+    blocks = -(-(length + 2 * radius) // window)
+    padded_mask = np.pad(
+        mask,
+        pad_width=((radius, blocks * window - length - radius), (0, 0)),
+        mode='constant',
+        constant_values=False,
+    ).reshape(blocks, window, -1)
+
+    # Accumulate the prefix and the suffix inside each block.
+    prefix = np.logical_or.accumulate(padded_mask, axis=1).reshape(blocks * window, -1)
+    suffix = np.logical_or.accumulate(padded_mask[:, ::-1], axis=1)[:, ::-1].reshape(blocks * window, -1)
+
+    # Each window spans at most two blocks.
+    # Combine the suffix of the first block with the prefix of the second block.
+    result = suffix[:length] | prefix[window - 1:window - 1 + length]
+
+    # Move the window axis back to its original position.
+    return np.moveaxis(result, 0, axis)
+
+def any_neighbors_separable(mask: npt.NDArray[np.bool_], radius: int) -> npt.NDArray[np.bool_]:
+    """ Check for each pixel if any neighbor in the square window is set.
+        Separable engine with a row pass and a column pass, which does constant work per pixel for any radius.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask.
+            radius (int): Radius value.
+
+        Returns:
+            np.array: Boolean mask where any neighbor is set.
+    """
+    # Check the window along each row.
+    mask = __running_any(
+        mask=mask,
+        radius=radius,
+        axis=1,
+    )
+
+    # Check the window along each column.
+    mask = __running_any(
+        mask=mask,
+        radius=radius,
+        axis=0,
+    )
+
+    return mask
+
+def __engine_any_neighbors(mask: npt.NDArray[np.bool_], radius: int, engine: str) -> npt.NDArray[np.bool_]:
+    """ Check for each pixel if any neighbor in the square window is set with the selected engine.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask.
+            radius (int): Radius value.
+            engine (str): Engine to use, one of ENGINES.
+
+        Returns:
+            np.array: Boolean mask where any neighbor is set.
+
+        Raises:
+            ValueError: If the engine is unknown.
+    """
+    if engine == 'shift':
+        return any_neighbors_shift(
+            mask=mask,
+            radius=radius,
+        )
+    elif engine == 'separable':
+        return any_neighbors_separable(
+            mask=mask,
+            radius=radius,
+        )
+
+    elif engine == 'packed':
+        # Pack the mask into 64 bit words, check the neighborhood and unpack it again.
+        return unpack_mask(
+            packed=any_neighbors_packed(
+                packed=pack_mask(
+                    mask=mask,
+                ),
+                width=mask.shape[1],
+                radius=radius,
+            ),
+            width=mask.shape[1],
+        )
+
+    raise ValueError(f'Unknown morphology engine {engine}.')
+
+def __process_band(mask: npt.NDArray[np.bool_], radius: int, engine: str, start: int, end: int, output_mask: npt.NDArray[np.bool_]):
+    """ Process a horizontal band of a mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask of the whole image.
+            radius (int): Radius value.
+            engine (str): Engine to use, one of ENGINES.
+            start (int): First row of the band.
+            end (int): Row after the last row of the band.
+            output_mask (np.array): Shared output mask of the whole image.
+    """
+    # Skip empty bands, which occur if there are more threads than rows.
+    if start == end:
+        return
+
+    # Extend the band by a halo of radius rows on both sides.
+    # Rows outside of the image are handled by the engine like the image border.
+    halo_start = max(start - radius, 0)
+    halo_end = min(end + radius, mask.shape[0])
+
+    # Copy the band, because the engine may update the mask in place.
+    band_mask = __engine_any_neighbors(
+        mask=mask[halo_start:halo_end].copy(),
+        radius=radius,
+        engine=engine,
+    )
+
+    # Write the band without its halo into the shared output mask.
+    output_mask[start:end] = band_mask[start - halo_start:end - halo_start]
+
+def any_neighbors(mask: npt.NDArray[np.bool_], radius: int, engine: str, threads: int) -> npt.NDArray[np.bool_]:
+    """ Check for each pixel if any neighbor in the square window is set.
+        With multiple threads the mask is split into horizontal bands, which carry a halo of radius rows.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask.
+            radius (int): Radius value.
+            engine (str): Engine to use, one of ENGINES.
+            threads (int): Number of threads to use for parallel processing.
+
+        Returns:
+            np.array: Boolean mask where any neighbor is set.
+
+        Raises:
+            ValueError: If the engine is unknown.
+    """
+    # Process the whole mask at once for a single thread.
+    if threads <= 1:
+        return __engine_any_neighbors(
+            mask=mask,
+            radius=radius,
+            engine=engine,
+        )
+
+    # Preallocate the shared output mask.
+    output_mask = np.empty_like(mask)
+
+    # Split the mask into bands along the height (axis=0).
+    boundaries = chunk_boundaries(
+        length=mask.shape[0],
+        chunks=threads,
+    )
+
+    # Process each band in parallel on the worker pool of the batch.
+    map_chunks(
+        __process_band,
+        [mask] * threads,
+        [radius] * threads,
+        [engine] * threads,
+        [boundary[0] for boundary in boundaries],
+        [boundary[1] for boundary in boundaries],
+        [output_mask] * threads,
+    )
+
+    return output_mask
+
+def __process_packed_band(packed: npt.NDArray[np.uint64], width: int, radius: int, start: int, end: int, output_packed: npt.NDArray[np.uint64]):
+    """ Process a horizontal band of a packed mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask of the whole image.
+            width (int): Width of the mask.
+            radius (int): Radius value.
+            start (int): First row of the band.
+            end (int): Row after the last row of the band.
+            output_packed (np.array): Shared output packed mask of the whole image.
+    """
+    # Skip empty bands, which occur if there are more threads than rows.
+    if start == end:
+        return
+
+    # Extend the band by a halo of radius rows on both sides.
+    halo_start = max(start - radius, 0)
+    halo_end = min(end + radius, packed.shape[0])
+
+    band_packed = any_neighbors_packed(
+        packed=packed[halo_start:halo_end],
+        width=width,
+        radius=radius,
+    )
+
+    # Write the band without its halo into the shared output mask.
+    output_packed[start:end] = band_packed[start - halo_start:end - halo_start]
+
+def packed_any_neighbors(packed: npt.NDArray[np.uint64], width: int, radius: int, threads: int) -> npt.NDArray[np.uint64]:
+    """ Check for each pixel of a packed mask if any neighbor in the square window is set.
+        Unlike the packed engine of any_neighbors, the mask stays packed, so consecutive stages never hold a boolean copy.
+        With multiple threads the mask is split into horizontal bands, which carry a halo of radius rows.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask.
+            width (int): Width of the mask.
+            radius (int): Radius value.
+            threads (int): Number of threads to use for parallel processing.
+
+        Returns:
+            np.array: Packed mask where any neighbor is set.
+    """
+    # Process the whole mask at once for a single thread.
+    if threads <= 1:
+        return any_neighbors_packed(
+            packed=packed,
+            width=width,
+            radius=radius,
+        )
+
+    # Preallocate the shared output mask.
+    output_packed = np.empty_like(packed)
+
+    # Split the mask into bands along the height (axis=0).
+    boundaries = chunk_boundaries(
+        length=packed.shape[0],
+        chunks=threads,
+    )
+
+    # Process each band in parallel on the worker pool of the batch.
+    map_chunks(
+        __process_packed_band,
+        [packed] * threads,
+        [width] * threads,
+        [radius] * threads,
+        [boundary[0] for boundary in boundaries],
+        [boundary[1] for boundary in boundaries],
+        [output_packed] * threads,
+    )
+
+    return output_packed
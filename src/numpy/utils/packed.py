@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from typing import Callable
+import numpy.typing as npt
+import numpy as np
+
+# Number of pixels in a packed word.
+WORD_BITS = 64
+
+# Little endian words, so pixel x of a row is bit x % 64 of word x // 64 on every platform.
+WORD_DTYPE = np.dtype('<u8')
+
+def pack_mask(mask: npt.NDArray[np.bool_]) -> npt.NDArray[np.uint64]:
+    """ Pack each row of a boolean mask into 64 bit words.
+        The bits after the last pixel of a row are always zero.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask.
+
+        Returns:
+            np.array: Packed mask with one row of words per row of the mask.
+    """
+    height, width = mask.shape
+
+    # Pack 8 pixels per byte, the first pixel in the lowest bit.
+    packed_bytes = np.packbits(
+        mask,
+        axis=1,
+        bitorder='little',
+    )
+
+    # Pad the bytes of each row to whole words.
+    padded_bytes = np.zeros(
+        (height, -(-width // WORD_BITS) * 8),
+        dtype=np.uint8,
+    )
+    padded_bytes[:, :packed_bytes.shape[1]] = packed_bytes
+
+    return padded_bytes.view(WORD_DTYPE)
+
+def unpack_mask(packed: npt.NDArray[np.uint64], width: int) -> npt.NDArray[np.bool_]:
+    """ Unpack a packed mask into a boolean mask.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask.
+            width (int): Width of the mask.
+
+        Returns:
+            np.array: Boolean mask.
+    """
+    return np.unpackbits(
+        np.ascontiguousarray(packed, dtype=WORD_DTYPE).view(np.uint8),
+        axis=1,
+        count=width,
+        bitorder='little',
+    ).view(np.bool_)
+
+def invert_packed(packed: npt.NDArray[np.uint64], width: int) -> npt.NDArray[np.uint64]:
+    """ Invert each pixel of a packed mask.
+        The bits after the last pixel of a row stay zero, so they are never set by a neighborhood check.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask.
+            width (int): Width of the mask.
+
+        Returns:
+            np.array: Inverted packed mask.
+    """
+    inverted = ~packed
+
+    if width % WORD_BITS:
+        inverted[:, -1] &= np.uint64((1 << (width % WORD_BITS)) - 1)
+
+    return inverted
+
+def __shift_bits(packed: npt.NDArray[np.uint64], shift: int) -> npt.NDArray[np.uint64]:
+    """ Shift the pixels of each row of a packed mask.
+        Pixels, which are shifted out of a row, are dropped and free pixels are zero.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask.
+            shift (int): Number of pixels to shift towards the end of the row, negative towards the start.
+
+        Returns:
+            np.array: Shifted packed mask.
+    """
+    words = packed.shape[1]
+    word_shift, bit_shift = divmod(abs(shift), WORD_BITS)
+    shifted = np.zeros_like(packed)
+
+    # Nothing is left if the shift is longer than the row.
+    if word_shift >= words:
+        return shifted
+
+    if shift > 0:
+        # Move whole words and carry the high bits into the next word.
+        shifted[:, word_shift:] = packed[:, :words - word_shift] << np.uint64(bit_shift)
+        if bit_shift:
+            shifted[:, word_shift + 1:] |= packed[:, :words - word_shift - 1] >> np.uint64(WORD_BITS - bit_shift)
+    else:
+        # Move whole words and carry the low bits into the previous word.
+        shifted[:, :words - word_shift] = packed[:, word_shift:] >> np.uint64(bit_shift)
+        if bit_shift:
+            shifted[:, :words - word_shift - 1] |= packed[:, word_shift + 1:] << np.uint64(WORD_BITS - bit_shift)
+
+    return shifted
+
+def __shift_rows(packed: npt.NDArray[np.uint64], shift: int) -> npt.NDArray[np.uint64]:
+    """ Shift the rows of a packed mask.
+        Rows, which are shifted out of the mask, are dropped and free rows are zero.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask.
+            shift (int): Number of rows to shift down, negative up.
+
+        Returns:
+            np.array: Shifted packed mask.
+    """
+    height = packed.shape[0]
+    shifted = np.zeros_like(packed)
+
+    # Nothing is left if the shift is longer than the mask.
+    if abs(shift) >= height:
+        return shifted
+
+    if shift > 0:
+        shifted[shift:] = packed[:height - shift]
+    else:
+        shifted[:height + shift] = packed[-shift:]
+
+    return shifted
+
+def __window_or(packed: npt.NDArray[np.uint64], radius: int, shift: Callable[[npt.NDArray[np.uint64], int], npt.NDArray[np.uint64]]) -> npt.NDArray[np.uint64]:
+    """ Check for each pixel if any pixel in the centered window along one axis is set.
+        The window is doubled in each step, so only a logarithmic number of shifts and ORs is needed.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask with enough free pixels after the end of the axis for the radius.
+            radius (int): Radius value.
+            shift (Callable): Shift function along the axis.
+
+        Returns:
+            np.array: Packed mask where any pixel in the window is set.
+    """
+    window = 2 * radius + 1
+
+    # Each pixel holds the OR of the span of pixels ending at it.
+    span = 1
+    while span * 2 <= window:
+        packed = packed | shift(packed, span)
+        span *= 2
+
+    # Extend the span to the full window.
+    if span < window:
+        packed = packed | shift(packed, window - span)
+
+    # Center the window on each pixel.
+    return shift(packed, -radius)
+
+def any_neighbors_packed(packed: npt.NDArray[np.uint64], width: int, radius: int) -> npt.NDArray[np.uint64]:
+    """ Check for each pixel of a packed mask if any neighbor in the square window is set.
+        A shift and an OR of a word processes 64 pixels at once.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            packed (np.array): Packed mask.
+            width (int): Width of the mask.
+            radius (int): Radius value.
+
+        Returns:
+            np.array: Packed mask where any neighbor is set.
+    """
+    height, words = packed.shape
+
+    # Add free pixels after the end of each row and free rows after the last row.
+    # The windows, which are centered on the last pixels, end there.
+    extended = np.zeros(
+        (height + radius, -(-(width + radius) // WORD_BITS)),
+        dtype=WORD_DTYPE,
+    )
+    extended[:height, :words] = packed
+
+    # Check the window along each row.
+    extended = __window_or(
+        packed=extended,
+        radius=radius,
+        shift=__shift_bits,
+    )
+
+    # Check the window along each column.
+    extended = __window_or(
+        packed=extended,
+        radius=radius,
+        shift=__shift_rows,
+    )
+
+    # Remove the free pixels and rows.
+    result = np.ascontiguousarray(extended[:height, :words])
+
+    # Keep the bits after the last pixel of a row zero.
+    if width % WORD_BITS:
+        result[:, -1] &= np.uint64((1 << (width % WORD_BITS)) - 1)
+
+    return result
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from concurrent.futures import ThreadPoolExecutor
+from src.parser.utils.log import log
+from typing import Any, Callable, Iterable
+import threading
+import time
+
+# Worker threads shared by all images of a batch.
+# The pool is created once per process and only replaced if more workers are needed.
+executor: ThreadPoolExecutor | None = None
+workers = 0
+
+def use_worker_pool(threads: int):
+    """ Create the worker pool for all following chunk computations of the process.
+        An existing pool is shut down after its pending chunks are finished.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            threads (int): Number of worker threads.
+    """
+    global executor, workers
+
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+    workers = max(threads, 1)
+    executor = ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix='ipp_worker',
+    )
+
+    # Start all worker threads now, otherwise they are started by the chunks of the first image.
+    barrier = threading.Barrier(workers)
+    for future in [executor.submit(barrier.wait) for _ in range(workers)]:
+        future.result()
+
+def __timed_call(function: Callable, submitted: int, arguments: tuple) -> tuple[Any, int, int]:
+    """ Call a function on a worker and measure the time in the queue and the compute time.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            function (Callable): Function of the chunk.
+            submitted (int): Timestamp of the submission in nanoseconds.
+            arguments (tuple): Arguments of the function.
+
+        Returns:
+            (Any, int, int): Result of the function, queue wait and compute time in nanoseconds.
+    """
+    started = time.perf_counter_ns()
+    result = function(*arguments)
+
+    return result, started - submitted, time.perf_counter_ns() - started
+
+def map_chunks(function: Callable, *iterables: Iterable) -> list[Any]:
+    """ Call a function for each chunk on the worker pool and wait for all results.
+        A single chunk is computed in the calling thread without the hand-off to a worker.
+        The queue wait and the compute time of the chunks are logged as pool statistics.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            function (Callable): Function of a chunk.
+            iterables (Iterable): Arguments of the function, one iterable per parameter.
+
+        Returns:
+            list[Any]: Result of each chunk in the order of the chunks.
+    """
+    chunks = list(zip(*iterables))
+
+    # Create the worker pool on first use or grow it for more chunks.
+    if len(chunks) > 1 and (executor is None or workers < len(chunks)):
+        use_worker_pool(
+            threads=len(chunks),
+        )
+
+    # Submit all chunks before waiting for the first result.
+    submitted = time.perf_counter_ns()
+    if len(chunks) > 1:
+        futures = [
+            executor.submit(__timed_call, function, submitted, arguments)
+                for arguments in chunks
+        ]
+        timings = [future.result() for future in futures]
+    else:
+        timings = [__timed_call(function, submitted, arguments) for arguments in chunks]
+
+    # Log the pool statistics of the chunks.
+    if timings:
+        queue_waits = [timing[1] for timing in timings]
+        compute_times = [timing[2] for timing in timings]
+        log(
+            f'finish {len(timings)} chunks with queue wait {max(queue_waits) / 1e6:.3f} ms'
+            f' and compute {min(compute_times) / 1e6:.3f}-{max(compute_times) / 1e6:.3f} ms'
+        )
+
+    return [timing[0] for timing in timings]
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.numpy.utils.reference import open_reference_image, prepare_reference_image
+from src.parser.utils.codec import open_pil_image
+from src.parser.utils.log import log
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Outputs of the pyramid mode.
+# coarse writes the mask at the reduced scale and upsample scales it to the size of the image.
+# refine calculates the mask at full resolution, but only in the tiles flagged as changed at the reduced scale.
+PYRAMID_OUTPUTS = ['coarse', 'upsample', 'refine']
+
+# Edge length of the refined tiles in pixels of the full resolution.
+TILE_SIZE = 64
+
+def pyramid_size(height: int, width: int, levels: int) -> tuple[int, int]:
+    """ Calculate the size of an image at a pyramid level.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            height (int): Height of the image at full resolution.
+            width (int): Width of the image at full resolution.
+            levels (int): Number of pyramid levels, each level halves the height and the width.
+
+        Returns:
+            (int, int): Height and width at the pyramid level, at least one pixel.
+    """
+    return max(height >> levels, 1), max(width >> levels, 1)
+
+def downsample_image(image: npt.NDArray[np.uint8], levels: int) -> npt.NDArray[np.uint8]:
+    """ Downsample an image to a pyramid level with area interpolation.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image (np.array): Image at full resolution.
+            levels (int): Number of pyramid levels.
+
+        Returns:
+            np.array: Image at the pyramid level.
+    """
+    height, width = pyramid_size(
+        height=image.shape[0],
+        width=image.shape[1],
+        levels=levels,
+    )
+
+    if (height, width) == image.shape[:2]:
+        return image
+
+    return cv2.resize(
+        image,
+        (width, height),
+        interpolation=cv2.INTER_AREA,
+    )
+
+def open_pyramid_image(image_path: Path, levels: int) -> tuple[npt.NDArray[np.uint8], tuple[int, int]]:
+    """ Open an image directly at a pyramid level.
+        JPEG files are decoded in draft mode at a reduced scale, so the full resolution is never decoded.
+        The remaining difference to the pyramid level and all other formats are downsampled with area interpolation.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+            levels (int): Number of pyramid levels.
+
+        Returns:
+            (np.array, (int, int)): Image at the pyramid level and the height and width at full resolution.
+    """
+    # Open the image with the PIL library, NPY files are loaded with numpy.
+    pil_image = open_pil_image(
+        image_path=image_path,
+    )
+    width, height = pil_image.size
+    log('finish open pil image')
+
+    # Let the JPEG decoder scale the image down to at least the size of the pyramid level.
+    # Other formats ignore the draft request.
+    coarse_height, coarse_width = pyramid_size(
+        height=height,
+        width=width,
+        levels=levels,
+    )
+    pil_image.draft('RGB', (coarse_width, coarse_height))
+
+    # Convert the image to RGB if it is not already.
+    pil_image = pil_image.convert('RGB')
+    log('finish convert pil image')
+
+    # Downsample the decoded image to the exact size of the pyramid level.
+    image = np.asarray(pil_image)
+    if image.shape[:2] != (coarse_height, coarse_width):
+        image = cv2.resize(
+            image,
+            (coarse_width, coarse_height),
+            interpolation=cv2.INTER_AREA,
+        )
+    log('finish downsample image')
+
+    return image, (height, width)
+
+def open_pyramid_reference_image(image_path: Path, hsv: bool, threads: int, levels: int, output: str) -> tuple[tuple | None, tuple, tuple[int, int]]:
+    """ Open a reference image once for a whole batch of images in pyramid mode.
+        The reference image is decoded in the same way as the input images, so both are scaled down identically.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the reference image.
+            hsv (bool): Flag to also convert the reference image to HSV.
+            threads (int): Number of threads to split the reference image for.
+            levels (int): Number of pyramid levels.
+            output (str): Output of the pyramid mode, one of PYRAMID_OUTPUTS.
+
+        Returns:
+            (tuple | None, tuple, (int, int)): Reference image at full resolution if the output is refined, reference image at the pyramid level and the height and width at full resolution.
+    """
+    if output == 'refine':
+        # Refined masks need the reference image at full resolution, which is downsampled for the pyramid level.
+        reference_image = open_reference_image(
+            image_path=image_path,
+            hsv=hsv,
+            threads=threads,
+        )
+        coarse_image = downsample_image(
+            image=reference_image[0],
+            levels=levels,
+        )
+        size = reference_image[0].shape[:2]
+    else:
+        # Decode the reference image directly at the pyramid level.
+        reference_image = None
+        coarse_image, size = open_pyramid_image(
+            image_path=image_path,
+            levels=levels,
+        )
+
+    return (
+        reference_image,
+        prepare_reference_image(
+            image=coarse_image,
+            hsv=hsv,
+            threads=threads,
+        ),
+        size,
+    )
+
+def upsample_mask(mask: npt.NDArray[np.bool_], height: int, width: int) -> npt.NDArray[np.bool_]:
+    """ Upsample the mask of a pyramid level to full resolution.
+        Each pixel of the mask is repeated with nearest neighbor interpolation, so the mask stays binary.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask at the pyramid level.
+            height (int): Height at full resolution.
+            width (int): Width at full resolution.
+
+        Returns:
+            np.array: Boolean mask at full resolution.
+    """
+    return cv2.resize(
+        mask.view(np.uint8),
+        (width, height),
+        interpolation=cv2.INTER_NEAREST,
+    ).view(np.bool_)
+
+def changed_tiles(mask: npt.NDArray[np.bool_], levels: int, height: int, width: int) -> list[tuple[int, int, int, int]]:
+    """ Find the tiles at full resolution, which contain a changed pixel of the mask of a pyramid level.
+        The mask is dilated by one pixel first, so pixels at the border of a changed region are refined too.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask at the pyramid level.
+            levels (int): Number of pyramid levels.
+            height (int): Height at full resolution.
+            width (int): Width at full resolution.
+
+        Returns:
+            list[(int, int, int, int)]: Top, bottom, left and right boundary of each changed tile.
+    """
+    # Each tile covers a whole number of pixels of the pyramid level.
+    tile_size = max(TILE_SIZE, 1 << levels)
+    block_size = tile_size >> levels
+    rows = -(-height // tile_size)
+    columns = -(-width // tile_size)
+
+    # Dilate the mask and extend its border to the full tiles.
+    # Pixels, which are cut off at the pyramid level, belong to the last row or column of the mask.
+    dilated_mask = cv2.dilate(
+        mask.view(np.uint8),
+        np.ones((3, 3), dtype=np.uint8),
+    )
+    dilated_mask = np.pad(
+        dilated_mask,
+        (
+            (0, rows * block_size - dilated_mask.shape[0]),
+            (0, columns * block_size - dilated_mask.shape[1]),
+        ),
+        mode='edge',
+    )
+
+    # Flag each tile with a changed pixel.
+    flags = dilated_mask.reshape(rows, block_size, columns, block_size).any(axis=(1, 3))
+
+    return [
+        (
+            row * tile_size,
+            min((row + 1) * tile_size, height),
+            column * tile_size,
+            min((column + 1) * tile_size, width),
+        )
+            for row, column in zip(*np.nonzero(flags))
+    ]
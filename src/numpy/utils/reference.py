@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.numpy.utils.image import open_project_image
+from src.numpy.utils.chunk import split_chunks
+from src.numpy.utils.hsv import rgb_to_hsv
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+
+def prepare_reference_image(image: npt.NDArray[np.uint8], hsv: bool, threads: int) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]]:
+    """ Prepare an opened reference image once for a whole batch of images.
+        The chunks are split in the same way as the input images, so each thread gets its matching reference chunk.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image (np.array): Reference image.
+            hsv (bool): Flag to also convert the reference image to HSV.
+            threads (int): Number of threads to split the reference image for.
+
+        Returns:
+            (np.array, np.array | None, list[np.array]): Reference image, optional HSV reference image and the reference chunks used for processing.
+    """
+    # Convert the reference image to HSV if the flag is set.
+    # HUE values are in the range [0, 180].
+    # SATURATION and VALUE values are in the range [0, 255].
+    hsv_image = None
+    if hsv:
+        hsv_image = rgb_to_hsv(image)
+
+    # Split the reference image along the height (axis=0).
+    # Use the HSV reference image for the chunks if the flag is set.
+    chunks = split_chunks(
+        array=hsv_image if hsv else image,
+        chunks=threads,
+    )
+
+    # Create a new reference image and return it.
+    return (
+        image,
+        hsv_image,
+        chunks,
+    )
+
+def open_reference_image(image_path: Path, hsv: bool, threads: int) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8] | None, list[npt.NDArray[np.uint8]]]:
+    """ Open a reference image once for a whole batch of images.
+        The chunks are split in the same way as the input images, so each thread gets its matching reference chunk.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the reference image.
+            hsv (bool): Flag to also convert the reference image to HSV.
+            threads (int): Number of threads to split the reference image for.
+
+        Returns:
+            (np.array, np.array | None, list[np.array]): Reference image, optional HSV reference image and the reference chunks used for processing.
+    """
+    # Open the reference image and prepare it for the batch.
+    return prepare_reference_image(
+        image=open_project_image(
+            image_path=image_path,
+        ),
+        hsv=hsv,
+        threads=threads,
+    )
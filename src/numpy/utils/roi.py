@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.numpy.utils.morphology import any_neighbors
+from src.parser.utils.roi import roi_spans
+from functools import lru_cache
+import numpy.typing as npt
+import numpy as np
+import cv2
+
+@lru_cache(maxsize=16)
+def __build_layout(spans: tuple[tuple[tuple[int, int], ...], ...], height: int, width: int) -> tuple[npt.NDArray[np.bool_], tuple[tuple[int, int, int, int], ...]]:
+    """ Build the mask and the bounding boxes of the regions of interest.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            spans (tuple[tuple[tuple[int, int], ...], ...]): Spans of each row inside the regions of interest.
+            height (int): Height of the image.
+            width (int): Width of the image.
+
+        Returns:
+            (np.array, tuple[(int, int, int, int), ...]): Boolean mask and top, bottom, left and right of the box of each connected region.
+    """
+    # Set the spans of each row in the mask.
+    mask = np.zeros((height, width), dtype=np.bool_)
+    for row, row_spans in enumerate(spans):
+        for start, end in row_spans:
+            mask[row, start:end] = True
+
+    # Find the bounding box of each connected region.
+    # The first component is the background.
+    _, _, stats, _ = cv2.connectedComponentsWithStats(
+        mask.view(np.uint8),
+        connectivity=8,
+    )
+    boxes = tuple(
+        (int(y), int(y + box_height), int(x), int(x + box_width))
+            for x, y, box_width, box_height in stats[1:, :4]
+    )
+
+    # Keep the mask read only, because it is shared by all images of the same size.
+    mask.flags.writeable = False
+
+    return mask, boxes
+
+def roi_layout(height: int, width: int) -> tuple[npt.NDArray[np.bool_], tuple[tuple[int, int, int, int], ...]] | None:
+    """ Get the mask and the bounding boxes of the regions of interest of an image.
+        The layout is built once per size of the image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            height (int): Height of the image.
+            width (int): Width of the image.
+
+        Returns:
+            (np.array, tuple[(int, int, int, int), ...]) | None: Boolean mask and boxes of the regions or None to process every pixel.
+
+        Raises:
+            ValueError: If a ROI image does not have the dimensions of the image.
+    """
+    spans = roi_spans(
+        width=width,
+        height=height,
+    )
+
+    if spans is None:
+        return None
+
+    return __build_layout(
+        spans=spans,
+        height=height,
+        width=width,
+    )
+
+def any_neighbors_roi(mask: npt.NDArray[np.bool_], radius: int, engine: str, threads: int) -> npt.NDArray[np.bool_]:
+    """ Check for each pixel in the regions of interest if any neighbor in the square window is set.
+        Each box of the regions is cropped with a halo of radius pixels, so the result inside the regions is exact.
+        Pixels outside the regions are False.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            mask (np.array): Boolean mask of the whole image.
+            radius (int): Radius value.
+            engine (str): Engine to use, one of ENGINES.
+            threads (int): Number of threads to use for parallel processing.
+
+        Returns:
+            np.array: Boolean mask where any neighbor is set.
+
+        Raises:
+            ValueError: If the engine is unknown.
+    """
+    layout = roi_layout(
+        height=mask.shape[0],
+        width=mask.shape[1],
+    )
+
+    # Check the whole mask without regions of interest.
+    if layout is None:
+        return any_neighbors(
+            mask=mask,
+            radius=radius,
+            engine=engine,
+            threads=threads,
+        )
+
+    roi_mask, boxes = layout
+    output_mask = np.zeros_like(mask)
+
+    for top, bottom, left, right in boxes:
+        # Extend the box by the halo, which is clipped at the image border like the whole mask.
+        halo_top = max(top - radius, 0)
+        halo_bottom = min(bottom + radius, mask.shape[0])
+        halo_left = max(left - radius, 0)
+        halo_right = min(right + radius, mask.shape[1])
+
+        # Check the cropped mask with its halo and keep the box inside the regions.
+        box_mask = any_neighbors(
+            mask=mask[halo_top:halo_bottom, halo_left:halo_right].copy(),
+            radius=radius,
+            engine=engine,
+            threads=min(threads, halo_bottom - halo_top),
+        )
+        np.logical_and(
+            box_mask[top - halo_top:bottom - halo_top, left - halo_left:right - halo_left],
+            roi_mask[top:bottom, left:right],
+            out=output_mask[top:bottom, left:right],
+        )
+
+    return output_mask
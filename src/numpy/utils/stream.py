@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils import codec
+from src.parser.utils.log import log
+from typing import Iterable, Iterator
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import struct
+import time
+import zlib
+
+# Formats, which can be written strip by strip.
+STREAM_SUFFIXES = ['.npy', '.ppm', '.png']
+
+# Formats, which can be read strip by strip.
+# Compressed formats like JPEG, PNG or TIFF would have to be decoded completely, so the memory would not be bounded.
+STREAM_INPUT_SUFFIXES = ['.npy', '.ppm']
+
+def __read_ppm_header(image_path: Path) -> tuple[int, int, int]:
+    """ Read the header of a binary PPM (P6) file.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            (int, int, int): Width, height and offset of the pixel data.
+
+        Raises:
+            ValueError: If the file is not a binary PPM file with 8 bit channels.
+    """
+    with open(image_path, 'rb') as file:
+        header = file.read(1024)
+
+    # Read the magic number, width, height and maximum value.
+    # Comments start with # and end with the line.
+    tokens: list[bytes] = []
+    offset = 0
+    while len(tokens) < 4:
+        if offset >= len(header):
+            raise ValueError('The PPM header is incomplete.')
+        elif header[offset:offset + 1].isspace():
+            offset += 1
+        elif header[offset:offset + 1] == b'#':
+            offset = header.index(b'\n', offset) + 1
+        else:
+            end = offset
+            while end < len(header) and not header[end:end + 1].isspace():
+                end += 1
+            tokens.append(header[offset:end])
+            offset = end
+
+    if tokens[0] != b'P6' or tokens[3] != b'255':
+        raise ValueError('Only binary PPM files with 8 bit channels can be streamed.')
+
+    # A single whitespace separates the header from the pixel data.
+    return (
+        int(tokens[1]),
+        int(tokens[2]),
+        offset + 1,
+    )
+
+def open_project_image_strips(image_path: Path) -> npt.NDArray[np.uint8]:
+    """ Open a project image for reading horizontal strips.
+        NPY and binary PPM files are memory mapped, so only the rows of the accessed strips are read.
+        Other formats can not be read strip by strip.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            np.array: Numpy array of the project image, memory mapped if possible.
+
+        Raises:
+            ValueError: If the format of the image can not be read strip by strip.
+            ValueError: If a memory mapped image is not an RGB image with 8 bit channels.
+    """
+    if image_path.suffix not in STREAM_INPUT_SUFFIXES:
+        raise ValueError(f'The image {image_path} can not be read strip by strip, only NPY and PPM files are supported.')
+
+    if image_path.suffix == '.npy':
+        # Memory map the raw RGB data of the NPY file.
+        image = np.load(
+            image_path,
+            mmap_mode='r',
+        )
+
+        if image.ndim != 3 or image.shape[2] != 3 or image.dtype != np.uint8:
+            raise ValueError('Only RGB images with 8 bit channels can be streamed.')
+    elif image_path.suffix == '.ppm':
+        # Memory map the raw RGB data after the PPM header.
+        width, height, offset = __read_ppm_header(
+            image_path=image_path,
+        )
+        image = np.memmap(
+            image_path,
+            dtype=np.uint8,
+            mode='r',
+            offset=offset,
+            shape=(height, width, 3),
+        )
+    log('finish map image')
+
+    return image
+
+def __png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """ Create a PNG chunk with length and checksum.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            chunk_type (bytes): Type of the chunk.
+            data (bytes): Data of the chunk.
+
+        Returns:
+            bytes: PNG chunk.
+    """
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+def __timed_strips(strips: Iterable[npt.NDArray[np.uint8]], process_times: list[int]) -> Iterator[npt.NDArray[np.uint8]]:
+    """ Yield the strips and record the time of producing each of them, for example of processing the strip.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            strips (Iterable[np.array]): Horizontal strips of the image from top to bottom.
+            process_times (list[int]): Times of producing the strips in nanoseconds, which are appended.
+
+        Returns:
+            Iterator[np.array]: Horizontal strips of the image from top to bottom.
+    """
+    iterator = iter(strips)
+
+    while True:
+        start = time.perf_counter_ns()
+        strip = next(iterator, None)
+        process_times.append(time.perf_counter_ns() - start)
+
+        if strip is None:
+            return
+
+        yield strip
+
+def save_project_image_strips(image_path: Path, width: int, height: int, strips: Iterable[npt.NDArray[np.uint8]]):
+    """ Save a project image strip by strip to a file.
+        Each strip is written as soon as it is available, so the whole image is never kept in memory.
+        Producing and writing the strips alternate, so the time of both is summed up over all strips and logged separately.
+        NPY and PPM files are written raw, all other files are written as PNG with the compression level of the codec.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+            width (int): Width of the image.
+            height (int): Height of the image.
+            strips (Iterable[np.array]): Horizontal strips of the image from top to bottom.
+    """
+    # Record the time of producing each strip, the remaining time is spent on writing.
+    start = time.perf_counter_ns()
+    process_times: list[int] = []
+    strips = __timed_strips(
+        strips=strips,
+        process_times=process_times,
+    )
+
+    if image_path.suffix == '.npy':
+        # Create a memory mapped NPY file and copy each strip into it.
+        image = np.lib.format.open_memmap(
+            image_path,
+            mode='w+',
+            dtype=np.uint8,
+            shape=(height, width, 3),
+        )
+
+        row = 0
+        for strip in strips:
+            image[row:row + strip.shape[0]] = strip
+            row += strip.shape[0]
+
+        image.flush()
+        del image
+    elif image_path.suffix == '.ppm':
+        # Write the PPM header and the raw data of each strip.
+        with open(image_path, 'wb') as file:
+            file.write(f'P6\n{width} {height}\n255\n'.encode())
+
+            for strip in strips:
+                file.write(np.ascontiguousarray(strip).tobytes())
+    else:
+        # Write the PNG header and compress each strip into IDAT chunks.
+        compressor = zlib.compressobj(codec.compression)
+        with open(image_path, 'wb') as file:
+            file.write(b'\x89PNG\r\n\x1a\n')
+            file.write(__png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+
+            for strip in strips:
+                # Prefix each row with filter type 0 (None).
+                rows = np.zeros(
+                    (strip.shape[0], 1 + width * 3),
+                    dtype=np.uint8,
+                )
+                rows[:, 1:] = strip.reshape(strip.shape[0], -1)
+
+                data = compressor.compress(rows.tobytes())
+                if data:
+                    file.write(__png_chunk(b'IDAT', data))
+
+            file.write(__png_chunk(b'IDAT', compressor.flush()))
+            file.write(__png_chunk(b'IEND', b''))
+
+    process_time = sum(process_times)
+    write_time = time.perf_counter_ns() - start - process_time
+    log(f'finish save {len(process_times) - 1} strips with process {process_time / 1_000_000:.3f} ms and write {write_time / 1_000_000:.3f} ms')
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.log import log
+from typing import Iterator
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Video formats of the output with their codec.
+# All other outputs are written as directory of PNG frames.
+VIDEO_CODECS = {
+    '.avi': 'MJPG',
+    '.mp4': 'mp4v',
+}
+
+# Frame rate of the output, if the source does not report one, for example a camera.
+DEFAULT_FPS = 30.0
+
+def open_frame_source(source: str) -> cv2.VideoCapture:
+    """ Open a video file or a camera as frame source.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            source (str): Path to a video file or index of a camera.
+
+        Returns:
+            cv2.VideoCapture: Opened frame source.
+
+        Raises:
+            ValueError: If the frame source can not be opened.
+    """
+    # Open a camera by its index or a video file by its path.
+    capture = cv2.VideoCapture(int(source) if source.isdigit() else source)
+
+    if not capture.isOpened():
+        raise ValueError(f'The frame source {source} can not be opened.')
+    log('finish open frame source')
+
+    return capture
+
+def read_frames(capture: cv2.VideoCapture, frames: int) -> Iterator[npt.NDArray[np.uint8]]:
+    """ Read the frames of a frame source as RGB images.
+        The frames are decoded into the same buffers, so each frame is only valid until the next one is read.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            capture (cv2.VideoCapture): Opened frame source.
+            frames (int): Maximum number of frames, 0 reads until the source ends.
+
+        Yields:
+            np.array: RGB frame in the reused buffer.
+    """
+    bgr_frame = None
+    rgb_frame = None
+
+    index = 0
+    while frames <= 0 or index < frames:
+        # Decode the next frame into the buffer of the previous frame.
+        success, bgr_frame = capture.read(bgr_frame)
+        if not success:
+            break
+
+        # Convert the frame from the BGR order of OpenCV to RGB like the project images.
+        rgb_frame = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+
+        yield rgb_frame
+        index += 1
+
+def frame_rate(capture: cv2.VideoCapture) -> float:
+    """ Get the frame rate of a frame source.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            capture (cv2.VideoCapture): Opened frame source.
+
+        Returns:
+            float: Frame rate of the source or the default frame rate, if it is unknown.
+    """
+    fps = capture.get(cv2.CAP_PROP_FPS)
+
+    return fps if fps > 0 else DEFAULT_FPS
+
+def open_frame_sink(output_path: Path, width: int, height: int, fps: float) -> cv2.VideoWriter | None:
+    """ Open a video file or a directory for the output frames.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            output_path (Path): Path to a video file with a suffix of VIDEO_CODECS or to a directory.
+            width (int): Width of the frames.
+            height (int): Height of the frames.
+            fps (float): Frame rate of the video file.
+
+        Returns:
+            cv2.VideoWriter | None: Opened video file or None for a directory.
+
+        Raises:
+            ValueError: If the video file can not be opened.
+    """
+    # Create the directory for the frames.
+    if output_path.suffix not in VIDEO_CODECS:
+        output_path.mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+        return None
+
+    writer = cv2.VideoWriter(
+        str(output_path),
+        cv2.VideoWriter_fourcc(*VIDEO_CODECS[output_path.suffix]),
+        fps,
+        (width, height),
+    )
+
+    if not writer.isOpened():
+        raise ValueError(f'The video file {output_path} can not be opened.')
+
+    return writer
+
+def write_frame(sink: cv2.VideoWriter | None, output_path: Path, index: int, frame: npt.NDArray[np.uint8]):
+    """ Write a frame to a video file or a directory.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            sink (cv2.VideoWriter | None): Opened video file or None for a directory.
+            output_path (Path): Path to the video file or the directory.
+            index (int): Index of the frame.
+            frame (np.array): RGB frame.
+    """
+    # Convert the frame back to the BGR order of OpenCV.
+    bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+
+    if sink is None:
+        cv2.imwrite(
+            str(output_path / f'frame_{index:06d}.png'),
+            bgr_frame,
+        )
+    else:
+        sink.write(bgr_frame)
@@ -9,11 +9,67 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.parser.utils.dataframe import convert_to_dataframe
+from src.parser.utils.output import write_dataframes, OUTPUT_FORMATS
+from src.parser.utils.summary import summarize_dataframes
 from src.parser.utils.merge import merge_dataframes
 from pathlib import Path
 import pandas as pd
 import click
 
+def __parse_output_argument(context: click.Context, parameter: click.Parameter, value: str) -> str:
+    """ Check the format of the output file of a CLI option.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Click context.
+            parameter (click.Parameter): Click parameter.
+            value (str): Output file.
+
+        Returns:
+            str: Output file.
+
+        Raises:
+            click.BadParameter: If the output format is not supported.
+    """
+    if Path(value).suffix.lower() not in OUTPUT_FORMATS:
+        raise click.BadParameter(f'Unsupported output format, expected one of {", ".join(OUTPUT_FORMATS)}.')
+
+    return value
+
+def __read_time_tracking_path(time_tracking_path: Path) -> list[tuple[str, pd.DataFrame]]:
+    """ Convert all time tracking files of a directory to DataFrames.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            time_tracking_path (Path): Path to time tracking files directory.
+
+        Returns:
+            list[tuple[str, pd.DataFrame]]: DataFrames with original filenames in sorted order.
+    """
+    # Initialize empty list
+    dataframes: list[tuple[str, pd.DataFrame]] = []
+
+    # Get all time tracking files in the given path and sort them
+    time_tracking_files = list(time_tracking_path.glob('*.txt'))
+    time_tracking_files.sort()
+
+    # Iterate over each time tracking file in the given path and convert to DataFrame
+    for time_tracking_file in time_tracking_files:
+        dataframes.append(
+            (
+                time_tracking_file.name.replace('.txt', ''),
+                convert_to_dataframe(
+                    time_tracking_file=time_tracking_file,
+                ),
+            )
+        )
+
+    return dataframes
+
 @click.group()
 def cli():
     """ Image Processing Performance - Time Tracking Parser
@@ -37,6 +93,8 @@ def cli():
     ),
     default='out.xlsx',
     show_default=True,
+    callback=__parse_output_argument,
+    help='Output file, the format is chosen by its suffix (.xlsx, .csv, .parquet, .feather).'
 )
 @click.argument(
     'time_tracking_files',
@@ -56,20 +114,20 @@ def parse(output: str, time_tracking_files: tuple[str, ...]):
         Args:
             time_tracking_files (tuple[str, ...]): Time tracking files to parse.
     """
-    with pd.ExcelWriter(output) as writer:
-        # Iterate over time tracking files
-        for time_tracking_file in time_tracking_files:
-            # Convert to Path object
-            time_tracking_file = Path(time_tracking_file)
-
-            # Convert to DataFrame and write to Excel
-            convert_to_dataframe(
-                time_tracking_file=time_tracking_file,
-            ).to_excel(
-                writer,
-                sheet_name=Path(time_tracking_file).name,
-                index=False,
-            )
+    # Convert each time tracking file to DataFrame
+    dataframes = {
+        Path(time_tracking_file).name: convert_to_dataframe(
+            time_tracking_file=Path(time_tracking_file),
+        )
+            for time_tracking_file in time_tracking_files
+    }
+
+    # Write one sheet or one file column per time tracking file
+    write_dataframes(
+        output_path=Path(output),
+        dataframes=dataframes,
+        key='File',
+    )
 
 @cli.command(
     'merge',
@@ -85,6 +143,8 @@ def parse(output: str, time_tracking_files: tuple[str, ...]):
     ),
     default='out.xlsx',
     show_default=True,
+    callback=__parse_output_argument,
+    help='Output file, the format is chosen by its suffix (.xlsx, .csv, .parquet, .feather).'
 )
 @click.argument(
     'time_tracking_path',
@@ -105,34 +165,71 @@ def merge(output: str, time_tracking_path: str):
         Args:
             time_tracking_path (str): Path to time tracking files directory.
     """
-    # Convert to Path object
-    time_tracking_path = Path(time_tracking_path)
-    
-    # Initialize empty list
-    dataframes: list[tuple[str, pd.DataFrame]] = []
+    # Convert all time tracking files in the given path to DataFrames
+    dataframes = __read_time_tracking_path(
+        time_tracking_path=Path(time_tracking_path),
+    )
 
-    # Get all time tracking files in the given path and sort them
-    time_tracking_files = list(time_tracking_path.glob('*.txt'))
-    time_tracking_files.sort()
+    # Merge DataFrames based on time tracking events and write one sheet or one algorithm column per algorithm
+    write_dataframes(
+        output_path=Path(output),
+        dataframes=merge_dataframes(
+            dataframes=dataframes,
+        ),
+        key='Algorithm',
+    )
 
-    # Iterate over each time tracking file in the given path and convert to DataFrame
-    for time_tracking_file in time_tracking_files:
-        dataframes.append(
-            (
-                time_tracking_file.name.replace('.txt', ''),
-                convert_to_dataframe(
-                    time_tracking_file=time_tracking_file,
-                ),
-            )
-        )
+@cli.command(
+    'summarize',
+    help='Summarize the stage durations of time tracking files.'
+)
+@click.option(
+    '--output',
+    '-o',
+    type=click.Path(
+        resolve_path=True,
+        dir_okay=False,
+        file_okay=True,
+    ),
+    default='summary.csv',
+    show_default=True,
+    callback=__parse_output_argument,
+    help='Output file, the format is chosen by its suffix (.xlsx, .csv, .parquet, .feather).'
+)
+@click.argument(
+    'time_tracking_path',
+    type=click.Path(
+        exists=True,
+        resolve_path=True,
+        dir_okay=True,
+        file_okay=False,
+    ),
+    required=True,
+)
+def summarize(output: str, time_tracking_path: str):
+    """ Summarize the stage durations of time tracking files per backend, algorithm and stage.
+        The duration of a stage is the time between consecutive events on layer 0.
+        Files of the same backend are repeats, for example numpy_1.txt and numpy_2.txt.
 
-    # Merge DataFrames based on time tracking events and write to Excel
-    with pd.ExcelWriter(output) as writer:
-        for key, df in merge_dataframes(
-            dataframes=dataframes,
-        ).items():
-            df.to_excel(
-                writer,
-                sheet_name=key,
-                index=False,
-            )
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            output (str): Output file.
+            time_tracking_path (str): Path to time tracking files directory.
+    """
+    # Convert all time tracking files in the given path to DataFrames
+    dataframes = __read_time_tracking_path(
+        time_tracking_path=Path(time_tracking_path),
+    )
+
+    # Aggregate the stage durations over the repeats and write them
+    write_dataframes(
+        output_path=Path(output),
+        dataframes={
+            'summary': summarize_dataframes(
+                dataframes=dataframes,
+            ),
+        },
+        key=None,
+    )
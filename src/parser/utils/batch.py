@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.log import reference, start_trace, collect_trace, extend_trace
+from concurrent.futures import ProcessPoolExecutor
+from src.parser.utils.overlap import overlapped_io
+from typing import Any, Callable
+from pathlib import Path
+
+worker_events: list[tuple[int, int, str, str]] = []
+
+def __init_worker(initializer: Callable, parameters: dict, trace_reference: int):
+    """ Initialize a worker process once with the shared parameters of the batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            initializer (Callable): Initializer of the batch.
+            parameters (dict): Shared parameters of the batch.
+            trace_reference (int): Reference timestamp of the parent process in nanoseconds.
+    """
+    global worker_events
+
+    # Record the time tracking events of the worker in its trace buffer.
+    # The events are relative to the reference timestamp of the parent process.
+    start_trace(
+        trace_file=None,
+        trace_reference=trace_reference,
+    )
+
+    initializer(**parameters)
+
+    # Keep the events of the initializer.
+    # They are emitted together with the events of the first job of the worker.
+    worker_events = collect_trace()
+
+def __run_job(function: Callable, argument: Any) -> list[tuple[int, int, str, str]]:
+    """ Run a single job in a worker process.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            function (Callable): Function of the job.
+            argument (Any): Argument of the job.
+
+        Returns:
+            list[tuple[int, int, str, str]]: Time tracking events of the job.
+    """
+    global worker_events
+
+    function(argument)
+
+    # Collect the time tracking events of the job.
+    # This keeps the events of a job together, even if the workers run at the same time.
+    events = worker_events + collect_trace()
+    worker_events = []
+
+    return events
+
+def run_batch(function: Callable, arguments: list[Any], jobs: int, initializer: Callable, parameters: dict, overlap: int = 0, read: Callable[[Path], Any] | None = None):
+    """ Run a function for each argument of a batch.
+        With multiple jobs the arguments are spread over a process pool.
+        With a single job and overlap the images are read ahead and written behind in separate threads.
+        Multiple jobs already overlap the reading and writing of one process with the processing of the others.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            function (Callable): Function of a job, which is called with a single argument.
+            arguments (list[Any]): Arguments of the jobs.
+            jobs (int): Number of processes to use for parallel processing.
+            initializer (Callable): Initializer of the batch, which is called once per process.
+            parameters (dict): Shared parameters of the batch, which are passed to the initializer.
+            overlap (int): Depth of the read and write queues, 0 reads and writes each image in the job.
+            read (Callable[[Path], Any] | None): Read function, which opens the image file of each argument, or None to only write behind.
+    """
+    # Run the batch in the current process for a single job.
+    if jobs <= 1:
+        initializer(**parameters)
+
+        with overlapped_io(
+            depth=overlap,
+            read=read,
+            paths=[Path(argument) for argument in arguments] if read is not None else [],
+        ):
+            for argument in arguments:
+                function(argument)
+
+        return
+
+    # Run the batch in a process pool.
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(arguments)),
+        initializer=__init_worker,
+        initargs=(initializer, parameters, reference),
+    ) as executor:
+        # Record the time tracking events of each job in the order of the arguments.
+        for events in executor.map(
+            __run_job,
+            [function] * len(arguments),
+            arguments,
+        ):
+            extend_trace(
+                events=events,
+            )
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.codec import open_pil_image
+from src.parser.utils.log import log
+from typing import Iterable
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import hashlib
+import os
+import re
+
+# Size of the chunks, in which the image files are hashed.
+HASH_CHUNK_SIZE = 1 << 20
+
+# Name of a decoded image in the cache directory, all other files are never evicted or deleted.
+# The cache directory may also contain the input images or their NPY results, which belong to the user.
+CACHED_NAME_PATTERN = re.compile(r'[0-9a-f]{64}\.npy')
+
+# Name of a decoded image, which is written by a process and not moved to its final name yet.
+TEMPORARY_NAME_PATTERN = re.compile(r'[0-9a-f]{64}\.\d+\.tmp\.npy')
+
+# Cache directory of the decoded images, None to decode each image.
+cache_directory: Path | None = None
+
+# Maximum size of all decoded images in the cache directory in bytes.
+cache_size = 1 << 30
+
+def use_image_cache(directory: Path | None, max_size: int):
+    """ Use a cache directory of decoded images for all following images.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path | None): Cache directory of the decoded images, None to decode each image.
+            max_size (int): Maximum size of all decoded images in bytes, the least recently used images are evicted first.
+
+        Raises:
+            ValueError: If the maximum size is not positive.
+    """
+    global cache_directory, cache_size
+
+    if max_size <= 0:
+        raise ValueError('The maximum size of the image cache must be positive.')
+
+    cache_directory = directory
+    cache_size = max_size
+
+def __cache_key(image_path: Path) -> str:
+    """ Get the key of an image file in the cache.
+        The key is the hash of the file bytes and the modification time, so a changed file is decoded again.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            str: Hexadecimal SHA-256 hash.
+    """
+    digest = hashlib.sha256()
+
+    with open(image_path, 'rb') as file:
+        digest.update(str(os.fstat(file.fileno()).st_mtime_ns).encode())
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def __evict_images(directory: Path, max_size: int, keep: Path):
+    """ Delete the least recently used images, until all images of the cache directory fit into the maximum size.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path): Cache directory of the decoded images.
+            max_size (int): Maximum size of all decoded images in bytes.
+            keep (Path): Path of the image, which is just used and never deleted.
+    """
+    entries: list[tuple[int, int, Path]] = []
+    for entry in os.scandir(directory):
+        if CACHED_NAME_PATTERN.fullmatch(entry.name) is None or entry.path == str(keep):
+            continue
+
+        # Parallel processes may have evicted the image already.
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+
+        entries.append((stat.st_mtime_ns, stat.st_size, Path(entry.path)))
+
+    # The modification time is updated on each use, so the oldest images are the least recently used ones.
+    total_size = sum(size for _, size, _ in entries) + keep.stat().st_size
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+
+        path.unlink(
+            missing_ok=True,
+        )
+        total_size -= size
+
+def __store_image(image_path: Path, cached_path: Path):
+    """ Decode an image and store its raw RGB data in the cache directory.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+            cached_path (Path): Path of the decoded image in the cache directory.
+    """
+    cached_path.parent.mkdir(
+        parents=True,
+        exist_ok=True,
+    )
+
+    # Decode the image into a temporary file of this process.
+    # Parallel processes may decode the same image, the last one replaces the others.
+    temporary_path = cached_path.parent / f'{cached_path.stem}.{os.getpid()}.tmp.npy'
+    with open(temporary_path, 'wb') as file:
+        np.save(
+            file,
+            np.asarray(
+                open_pil_image(
+                    image_path=image_path,
+                ).convert('RGB'),
+            ),
+        )
+
+    # Move the complete image to its final path.
+    os.replace(temporary_path, cached_path)
+    log('finish store cached image')
+
+    __evict_images(
+        directory=cached_path.parent,
+        max_size=cache_size,
+        keep=cached_path,
+    )
+
+def open_cached_image(image_path: Path) -> npt.NDArray[np.uint8] | None:
+    """ Open the decoded RGB data of an image from the cache directory.
+        The image is decoded and stored once, if it is not cached yet.
+        Repeated runs on the same image only map the raw data, which is usually in the page cache.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            np.array | None: Read only memory mapped RGB image or None, if no cache directory is used.
+    """
+    if cache_directory is None:
+        return None
+
+    cached_path = cache_directory / f'{__cache_key(image_path=image_path)}.npy'
+    log('finish hash image file')
+
+    try:
+        # Mark the image as recently used.
+        os.utime(cached_path)
+    except FileNotFoundError:
+        __store_image(
+            image_path=image_path,
+            cached_path=cached_path,
+        )
+
+    # Memory map the raw data, so the pages are shared between processes and runs.
+    cached_image = np.load(
+        cached_path,
+        mmap_mode='r',
+    )
+    log('finish open cached image')
+
+    return cached_image
+
+def warm_image_cache(directory: Path, max_size: int, image_paths: Iterable[Path]) -> int:
+    """ Decode images into a cache directory, which are not cached yet.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path): Cache directory of the decoded images.
+            max_size (int): Maximum size of all decoded images in bytes.
+            image_paths (Iterable[Path]): Paths to the images.
+
+        Returns:
+            int: Number of newly decoded images.
+    """
+    use_image_cache(
+        directory=directory,
+        max_size=max_size,
+    )
+
+    decoded = 0
+    for image_path in image_paths:
+        cached_path = directory / f'{__cache_key(image_path=image_path)}.npy'
+
+        if not cached_path.exists():
+            __store_image(
+                image_path=image_path,
+                cached_path=cached_path,
+            )
+            decoded += 1
+
+    return decoded
+
+def clear_image_cache(directory: Path) -> int:
+    """ Delete all decoded images of a cache directory.
+        Only files named by their cache key and left over temporary files are deleted, all other files are kept.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path): Cache directory of the decoded images.
+
+        Returns:
+            int: Number of deleted images.
+    """
+    if not directory.is_dir():
+        return 0
+
+    deleted = 0
+    for cached_path in directory.iterdir():
+        if CACHED_NAME_PATTERN.fullmatch(cached_path.name) is None and TEMPORARY_NAME_PATTERN.fullmatch(cached_path.name) is None:
+            continue
+
+        cached_path.unlink(
+            missing_ok=True,
+        )
+        deleted += 1
+
+    return deleted
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from PIL import Image as PILImage
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Codecs of the output images and the suffix of their files, None keeps the suffix of the input image.
+# pil writes RGB images in the format of the suffix, bit 1-bit PNG masks and gray 8-bit grayscale PNG masks.
+# npy writes the raw RGB data without compression and cv2 writes 8-bit grayscale PNG masks with the OpenCV encoder.
+CODECS = {
+    'pil': None,
+    'bit': '.png',
+    'gray': '.png',
+    'npy': '.npy',
+    'cv2': '.png',
+}
+
+# Codec and zlib compression level of PNG files for all following images.
+codec = 'pil'
+compression = 6
+
+def use_codec(name: str, compression_level: int):
+    """ Use a codec for all following output images.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            name (str): Name of the codec, one of CODECS.
+            compression_level (int): Compression level of PNG files from 0 (none) to 9 (best).
+
+        Raises:
+            ValueError: If the codec or the compression level is unknown.
+    """
+    global codec, compression
+
+    if name not in CODECS:
+        raise ValueError(f'Unknown codec {name}.')
+
+    if not 0 <= compression_level <= 9:
+        raise ValueError('The compression level must be in the range [0, 9].')
+
+    codec = name
+    compression = compression_level
+
+def output_image_path(image_path: Path, prefix: str) -> Path:
+    """ Get the path of the output image of an input image.
+        The suffix follows the codec, so a PNG codec never writes into a JPEG file.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the input image.
+            prefix (str): Prefix of the output image, for example the name of the algorithm.
+
+        Returns:
+            Path: Path to the output image next to the input image.
+    """
+    return image_path.parent / f'{prefix}_{image_path.stem}{CODECS[codec] or image_path.suffix}'
+
+def open_pil_image(image_path: Path) -> PILImage.Image:
+    """ Open an image file with the PIL library.
+        NPY files with raw RGB data, for example written by the npy codec, are loaded with numpy.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            PILImage.Image: PIL image.
+    """
+    if image_path.suffix == '.npy':
+        return PILImage.fromarray(
+            np.load(image_path),
+        )
+
+    return PILImage.open(
+        fp=image_path,
+        mode='r',
+    )
+
+def __png_options(image_path: Path) -> dict:
+    """ Get the PIL options of PNG files for the compression level.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+
+        Returns:
+            dict: Options of the save method.
+    """
+    if image_path.suffix.lower() == '.png':
+        return {
+            'compress_level': compression,
+        }
+
+    return {}
+
+def save_array_image(image_path: Path, array: npt.NDArray[np.uint8]):
+    """ Save an RGB image with the codec.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+            array (np.array): RGB image with 8 bit channels.
+
+        Raises:
+            ValueError: If OpenCV can not write the image.
+    """
+    if codec == 'npy':
+        # Write the raw RGB data.
+        np.save(
+            image_path,
+            array,
+        )
+    elif codec == 'pil':
+        save_pil_image(
+            image_path=image_path,
+            pil_image=PILImage.fromarray(
+                obj=array,
+            ),
+        )
+    else:
+        # Reduce the mask to a single channel.
+        gray = cv2.cvtColor(
+            array,
+            cv2.COLOR_RGB2GRAY,
+        )
+
+        if codec == 'cv2':
+            written = cv2.imwrite(
+                str(image_path),
+                gray,
+                [cv2.IMWRITE_PNG_COMPRESSION, compression],
+            )
+
+            if not written:
+                raise ValueError(f'The image {image_path} can not be written with OpenCV.')
+        else:
+            save_pil_image(
+                image_path=image_path,
+                pil_image=PILImage.fromarray(
+                    obj=gray,
+                ),
+            )
+
+def save_pil_image(image_path: Path, pil_image: PILImage.Image):
+    """ Save an RGB or grayscale PIL image with the codec.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the image.
+            pil_image (PILImage.Image): PIL image.
+
+        Raises:
+            ValueError: If OpenCV can not write the image.
+    """
+    if codec in ('npy', 'cv2'):
+        save_array_image(
+            image_path=image_path,
+            array=np.asarray(pil_image.convert('RGB')),
+        )
+        return
+
+    # Reduce the mask to a single channel or a single bit without dithering.
+    if codec == 'gray':
+        pil_image = pil_image.convert('L')
+    elif codec == 'bit':
+        pil_image = pil_image.convert(
+            '1',
+            dither=PILImage.Dither.NONE,
+        )
+
+    pil_image.save(
+        fp=image_path,
+        **__png_options(
+            image_path=image_path,
+        ),
+    )
@@ -8,12 +8,24 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
+from itertools import islice
 from pathlib import Path
 import pandas as pd
 import re
 
+# Pattern of a time tracking event as [timestamp] layer (module) message.
+# Each line of a chunk is matched on its own, so no field can span multiple lines.
+EVENT_PATTERN = re.compile(
+    r'^\[(\d+\.\d+)\] (\d+) \(([^)\n]+)\) (.+)$',
+    re.MULTILINE,
+)
+
+# Number of lines, which are parsed at once.
+CHUNK_LINES = 1 << 18
+
 def convert_to_dataframe(time_tracking_file: Path) -> pd.DataFrame:
     """ Convert time tracking file to pandas DataFrame.
+        The file is read in chunks of lines and each chunk is parsed with one compiled pattern in a single pass.
 
         Author:
             Benedikt Schwering <bes9584@thi.de>
@@ -23,32 +35,52 @@ def convert_to_dataframe(time_tracking_file: Path) -> pd.DataFrame:
     
         Returns:
             pd.DataFrame: Time tracking file as pandas DataFrame.
+
+        Raises:
+            ValueError: If a line is not a time tracking event.
     """
-    # Initialize empty lists
-    timestamps = []
-    layers = []
-    modules = []
-    messages = []
-
-    # Iterate over each line in the time tracking file
-    for line in time_tracking_file.read_text().splitlines():
-        timestamps.append(
-            float(re.findall(r'(?<=\[)\d+\.\d+(?=\])', line)[0])
-        )
-        layers.append(
-            int(re.findall(r'(?<=\]\s)\d+(?=\s\()', line)[0])
-        )
-        modules.append(
-            re.findall(r'(?<=\().+(?=\))', line)[0]
-        )
-        messages.append(
-            re.findall(r'(?<=\)\s).+', line)[0]
-        )
+    # Initialize empty list
+    chunks: list[pd.DataFrame] = []
+
+    with open(time_tracking_file) as file:
+        # Read the file chunk by chunk to bound the memory of the raw lines
+        while lines := list(islice(file, CHUNK_LINES)):
+            # Extract all fields of the chunk in a single pass of the compiled pattern
+            events = EVENT_PATTERN.findall(''.join(lines))
+
+            # Check that each line is a time tracking event
+            if len(events) != len(lines):
+                line_number = sum(len(chunk) for chunk in chunks) + next(
+                    index
+                        for index, line in enumerate(lines)
+                        if EVENT_PATTERN.fullmatch(line.rstrip('\n')) is None
+                ) + 1
+                raise ValueError(f'Invalid time tracking event in {time_tracking_file} at line {line_number}.')
+
+            # Convert the columns of the chunk at once
+            events = pd.DataFrame(
+                events,
+                columns=['Timestamp', 'Layer', 'Module', 'Message'],
+            )
+            chunks.append(
+                pd.DataFrame({
+                    'Layer': events['Layer'].astype(int),
+                    'Module': events['Module'],
+                    'Message': events['Message'],
+                    'Timestamp': events['Timestamp'].astype(float),
+                })
+            )
 
     # Create and return pandas DataFrame
-    return pd.DataFrame({
-        'Layer': layers,
-        'Module': modules,
-        'Message': messages,
-        'Timestamp': timestamps,
-    })
+    if not chunks:
+        return pd.DataFrame({
+            'Layer': [],
+            'Module': [],
+            'Message': [],
+            'Timestamp': [],
+        })
+
+    return pd.concat(
+        chunks,
+        ignore_index=True,
+    )
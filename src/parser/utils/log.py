@@ -8,19 +8,218 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
-from datetime import datetime
+from types import FrameType
 from rich import print
-import inspect
+import threading
+import atexit
+import time
+import sys
 
-reference = datetime.now()
+# Reference timestamp of the time tracking in nanoseconds.
+reference = time.perf_counter_ns()
+
+# Call stack depth, on which the algorithms called by a CLI command log on layer 0.
+base = 9
+
+# Thread, which records the events.
+# Events of other threads, for example of the reader and the writer of a batch, are dropped.
+# Their call stack depth does not match the base and the trace buffer is not synchronized.
+thread = threading.get_ident()
+
+# Print each event directly with rich.
+# Otherwise the events are recorded in the trace buffer.
+console = True
+
+# Preallocated trace buffer with one entry per event.
+capacity = 65536
+count = 0
+timestamps = [0] * capacity
+layers = [0] * capacity
+functions = [''] * capacity
+messages = [''] * capacity
+
+def __stack_depth(frame: FrameType | None) -> int:
+    """ Count the frames of a call stack without building it.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            frame (FrameType | None): Top frame of the call stack.
+
+        Returns:
+            int: Number of frames in the call stack.
+    """
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+
+    return depth
+
+def __format_event(timestamp: int, layer: int, function: str, message: str) -> str:
+    """ Format an event in the time tracking format.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            timestamp (int): Timestamp of the event in nanoseconds.
+            layer (int): Layer of the event.
+            function (str): Function of the event.
+            message (str): Message of the event.
+
+        Returns:
+            str: Event as [timestamp] layer (module) message.
+    """
+    # Format the elapsed time in seconds without scientific notation.
+    elapsed = timestamp - reference
+    return f'[{elapsed // 1_000_000_000}.{elapsed % 1_000_000_000:09d}] {layer} ({function}) {message}'
+
+def __record_event(timestamp: int, layer: int, function: str, message: str):
+    """ Record an event in the trace buffer or print it to the console.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            timestamp (int): Timestamp of the event in nanoseconds.
+            layer (int): Layer of the event.
+            function (str): Function of the event.
+            message (str): Message of the event.
+    """
+    global capacity, count
+
+    if console:
+        elapsed = timestamp - reference
+
+        print(
+            f'[blue][{elapsed // 1_000_000_000}.{elapsed % 1_000_000_000:09d}][/]',
+            f'[red]{layer}[/]',
+            f'[green]({function})[/]',
+            message,
+        )
+        return
+
+    # Grow the trace buffer if it is full.
+    if count == capacity:
+        timestamps.extend([0] * capacity)
+        layers.extend([0] * capacity)
+        functions.extend([''] * capacity)
+        messages.extend([''] * capacity)
+        capacity *= 2
+
+    timestamps[count] = timestamp
+    layers[count] = layer
+    functions[count] = function
+    messages[count] = message
+    count += 1
+
+def set_log_base():
+    """ Set the calling function as base for the log layers.
+        Functions called by the calling function log on layer 0, as if they were called by a CLI command.
+        Only the events of the calling thread are recorded.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+    """
+    global base, thread
+    base = __stack_depth(sys._getframe()) + 1
+    thread = threading.get_ident()
+
+def start_trace(trace_file: str | None, trace_reference: int | None = None):
+    """ Record the events in the trace buffer instead of printing them to the console.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            trace_file (str | None): File to write the events to at exit, '-' for stdout or None to keep them in the buffer.
+            trace_reference (int | None): Reference timestamp in nanoseconds, for example of a parent process.
+    """
+    global console, count, reference
+    console = False
+    count = 0
+
+    if trace_reference is not None:
+        reference = trace_reference
+
+    # Write the events to the trace file at exit.
+    if trace_file is not None:
+        atexit.register(
+            write_trace,
+            trace_file=trace_file,
+        )
+
+def collect_trace() -> list[tuple[int, int, str, str]]:
+    """ Remove all recorded events from the trace buffer.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Returns:
+            list[tuple[int, int, str, str]]: Timestamp, layer, function and message of each event.
+    """
+    global count
+
+    events = list(zip(timestamps[:count], layers[:count], functions[:count], messages[:count]))
+    count = 0
+
+    return events
+
+def extend_trace(events: list[tuple[int, int, str, str]]):
+    """ Record events, which were collected elsewhere, for example in a worker process.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            events (list[tuple[int, int, str, str]]): Timestamp, layer, function and message of each event.
+    """
+    for event in events:
+        __record_event(*event)
+
+def write_trace(trace_file: str):
+    """ Write all recorded events to a trace file and remove them from the trace buffer.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            trace_file (str): File to write the events to or '-' for stdout.
+    """
+    lines = [
+        __format_event(*event) + '\n'
+            for event in collect_trace()
+    ]
+
+    if trace_file == '-':
+        sys.stdout.writelines(lines)
+        sys.stdout.flush()
+    else:
+        with open(trace_file, 'w') as file:
+            file.writelines(lines)
 
 def log(message: str):
-    global reference
-    elapsed = datetime.now() - reference
+    """ Log a time tracking event.
+        The layer is calculated from the call stack depth and the module is the calling function.
+        Events of other threads than the one of set_log_base are dropped.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            message (str): Message of the event.
+    """
+    timestamp = time.perf_counter_ns()
+    if threading.get_ident() != thread:
+        return
+
+    frame = sys._getframe(1)
 
-    print(
-        f'[blue][{elapsed.total_seconds()}][/]',
-        f'[red]{len(inspect.stack()) - 9}[/]',
-        f'[green]({inspect.stack()[1].function})[/]',
+    __record_event(
+        timestamp,
+        __stack_depth(frame) + 1 - base,
+        frame.f_code.co_name,
         message,
     )
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.log import log
+from typing import Callable
+import numpy.typing as npt
+from pathlib import Path
+import numpy as np
+import os
+
+# Number of possible RGB pixels with 8 bit channels.
+LUT_SIZE = 1 << 24
+
+# Number of entries, which are built at once.
+# All pixels of one red value are built together.
+LUT_CHUNK_SIZE = 1 << 16
+
+def open_lut(directory: Path, name: str, dtype: npt.DTypeLike, build: Callable[[npt.NDArray[np.uint32], npt.NDArray], None]) -> npt.NDArray:
+    """ Open a lookup table with three values for each RGB pixel from its cache directory.
+        The table is built and saved once, if it is not cached yet.
+        The index of an RGB pixel is red << 16 | green << 8 | blue.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path): Cache directory of the lookup tables.
+            name (str): Name of the lookup table.
+            dtype (npt.DTypeLike): Data type of the values.
+            build (Callable): Function, which fills the values for a chunk of RGB pixel indices.
+
+        Returns:
+            np.array: Memory mapped lookup table with shape (2^24, 3).
+    """
+    lut_path = directory / f'{name}.npy'
+
+    if not lut_path.exists():
+        directory.mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+
+        # Build the table into a temporary file of this process.
+        # Parallel processes may build the same table, the last one replaces the others.
+        temporary_path = directory / f'{name}.{os.getpid()}.tmp.npy'
+        lut = np.lib.format.open_memmap(
+            temporary_path,
+            mode='w+',
+            dtype=dtype,
+            shape=(LUT_SIZE, 3),
+        )
+
+        # Build the table chunk by chunk to bound the memory of the intermediate arrays.
+        for start in range(0, LUT_SIZE, LUT_CHUNK_SIZE):
+            build(
+                np.arange(start, start + LUT_CHUNK_SIZE, dtype=np.uint32),
+                lut[start:start + LUT_CHUNK_SIZE],
+            )
+
+        lut.flush()
+        del lut
+
+        # Move the complete table to its final path.
+        os.replace(temporary_path, lut_path)
+        log('finish build lut')
+
+    # Memory map the table, so the pages are shared between processes.
+    lut = np.load(
+        lut_path,
+        mmap_mode='r',
+    )
+    log('finish open lut')
+
+    return lut
+
+def build_float_hsv_lut(indices: npt.NDArray[np.uint32], values: npt.NDArray[np.float64]):
+    """ Build the HSV values of the pure Python backends for a chunk of RGB pixel indices.
+        The calculation follows rgb_to_hsv_pixel step by step, so the values are exactly equal.
+        HUE values are in the range [0, 360), SATURATION and VALUE values are in the range [0, 1].
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            indices (np.array): RGB pixel indices.
+            values (np.array): HSV values, which are filled.
+    """
+    # Get the red, green, and blue values of the RGB pixels in the range [0, 1].
+    red = (indices >> 16 & 255) / 255
+    green = (indices >> 8 & 255) / 255
+    blue = (indices & 255) / 255
+
+    # Get the maximum, minimum and delta values of the RGB pixels.
+    max_value = np.maximum(np.maximum(red, green), blue)
+    min_value = np.minimum(np.minimum(red, green), blue)
+    delta = max_value - min_value
+
+    # Calculate the hue values in the same order of cases.
+    # The divisions by a zero delta are not selected.
+    with np.errstate(
+        divide='ignore',
+        invalid='ignore',
+    ):
+        values[:, 0] = np.select(
+            [
+                delta == 0,
+                max_value == red,
+                max_value == green,
+            ],
+            [
+                0.0,
+                60 * (((green - blue) / delta) % 6),
+                60 * (((blue - red) / delta) + 2),
+            ],
+            60 * (((red - green) / delta) + 4),
+        )
+
+        # Calculate the saturation values.
+        values[:, 1] = np.where(
+            max_value == 0,
+            0.0,
+            delta / max_value,
+        )
+
+    # The value is the maximum value.
+    values[:, 2] = max_value
@@ -8,10 +8,35 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
+from src.parser.utils.summary import LAST_MESSAGE
 import pandas as pd
 
-def merge_dataframes(dataframes: list[tuple[str, pd.DataFrame]]) -> dict[pd.DataFrame]:
+def __algorithm_name(messages: pd.Series) -> str:
+    """ Get the algorithm of a run from the stages of its first image.
+        A single algorithm has one stage, a pipeline has one stage per step, for example "background subtraction, erode".
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            messages (pd.Series): Messages of the first layer of a run.
+
+        Returns:
+            str: Names of the stages between the preprocessing and the postprocessing.
+    """
+    stages: list[str] = []
+    for message in messages.iloc[1:]:
+        if message == LAST_MESSAGE:
+            break
+
+        stages.append(message.replace('finish ', '').strip())
+
+    return ', '.join(stages)
+
+def merge_dataframes(dataframes: list[tuple[str, pd.DataFrame]]) -> dict[str, pd.DataFrame]:
     """ Merge DataFrames based on time tracking events.
+        All runs are stacked once and pivoted on the run, the occurrence index and the message.
+        A message, which repeats within a run, for example for each image of a batch, is aligned by its occurrence.
 
         Author:
             Benedikt Schwering <bes9584@thi.de>
@@ -20,48 +45,55 @@ def merge_dataframes(dataframes: list[tuple[str, pd.DataFrame]]) -> dict[pd.Data
             dataframes (list[tuple[str, pd.DataFrame]]): DataFrames with original filenames to merge.
 
         Returns:
-            dict[pd.DataFrame]: Merged DataFrames.
+            dict[str, pd.DataFrame]: Merged DataFrames by algorithm with one timestamp column per run.
+
+        Raises:
+            ValueError: If a run has less than two events on the first layer, for example because its trace is truncated.
     """
-    # Filter out the first layer
-    dataframes = [
-        (
-            df[0],
-            df[1][df[1]['Layer'] == 0],
-        )
-            for df in dataframes
-    ]
+    if not dataframes:
+        return {}
+
+    # Check if each run has the event of its algorithm, otherwise it could not be grouped
+    for name, df in dataframes:
+        if (df['Layer'] == 0).sum() < 2:
+            raise ValueError(f'The time tracking file {name} has less than two events on layer 0, so its algorithm is unknown.')
+
+    # Stack the first layer of all runs
+    events = pd.concat(
+        [
+            df[df['Layer'] == 0].assign(Run=name)
+                for name, df in dataframes
+        ],
+        ignore_index=True,
+    )
+    events['Message'] = events['Message'].str.strip()
 
-    # Group DataFrames by the used algorithm (second message - "finish <algorithm name>")
-    grouped_dfs = {}
-    for df in dataframes:
-        key = df[1]['Message'].iloc[1].replace('finish ', '').strip()
-        if key not in grouped_dfs:
-            grouped_dfs[key] = []
+    # Number the repeats of each message within its run
+    events['Occurrence'] = events.groupby(['Run', 'Message'], sort=False).cumcount()
 
-        grouped_dfs[key].append(df)
+    # Group runs by the used algorithm (all messages of the first image - "finish <algorithm name>")
+    # A pipeline is grouped by the sequence of its steps, so it is not mixed with its first algorithm
+    algorithms = events.groupby('Run', sort=False)['Message'].agg(__algorithm_name)
+    events['Algorithm'] = events['Run'].map(algorithms)
 
-    # Merge DataFrames based on the event messages and rename timestamps to original filenames
+    # Pivot the timestamps of each algorithm to one column per run
     merged_dfs = {}
-    for key, dfs in grouped_dfs.items():
-        # Copy the first DataFrame and rename the timestamp column
-        merged_df = dfs[0][1].copy()
-        merged_df['Message'] = merged_df['Message'].str.strip()
-        merged_df.rename(columns={'Timestamp': dfs[0][0]}, inplace=True)
-
-        # Merge the remaining DataFrames and rename the timestamp columns
-        for df in dfs[1:]:
-            # Only keep the relevant columns message and timestamp
-            temp_df = df[1][['Message', 'Timestamp']].copy()
-            temp_df['Message'] = temp_df['Message'].str.strip()
-            temp_df.rename(columns={'Timestamp': df[0]}, inplace=True)
-
-            # Merge the DataFrames based on the message column
-            merged_df = merged_df.merge(
-                temp_df,
-                on='Message',
-                how='left',                
-            )
-
-        merged_dfs[key] = merged_df
-    
+    for key, group in events.groupby('Algorithm', sort=False):
+        # Keep the rows in the order of their first appearance, starting with the first run
+        rows = group.drop_duplicates(['Occurrence', 'Message'])[['Layer', 'Module', 'Message', 'Occurrence']]
+
+        timestamps = group.pivot(
+            index=['Occurrence', 'Message'],
+            columns='Run',
+            values='Timestamp',
+        ).reindex(
+            columns=group['Run'].unique(),
+        )
+        timestamps.columns.name = None
+
+        merged_dfs[key] = rows.join(
+            timestamps,
+            on=['Occurrence', 'Message'],
+        ).reset_index(drop=True)
+
     return merged_dfs
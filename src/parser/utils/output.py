@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from pathlib import Path
+import pandas as pd
+import re
+
+# Output formats by file suffix.
+# Parquet and Feather require the optional pyarrow dependency.
+OUTPUT_FORMATS = ['.xlsx', '.csv', '.parquet', '.feather']
+
+# Excel sheet names have at most 31 characters and must not contain any of []:*?/\.
+SHEET_NAME_LENGTH = 31
+INVALID_SHEET_NAME_PATTERN = re.compile(r'[\[\]:*?/\\]')
+
+# Name of the sheet, which lists the full name of each renamed sheet.
+INDEX_SHEET_NAME = 'Index'
+
+def __sheet_names(names: list[str]) -> dict[str, str]:
+    """ Get a valid and unique Excel sheet name for each name.
+        Names, which are too long, contain invalid characters or collide case insensitively, are replaced by sheet_1, sheet_2 and so on.
+        Shortening them instead could make names with a common prefix collide, for example pipelines with the same first steps.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            names (list[str]): Names of the DataFrames.
+
+        Returns:
+            dict[str, str]: Sheet name by name.
+    """
+    used = {INDEX_SHEET_NAME.lower()}
+    sheet_names = {}
+
+    # Keep the valid names first, so a generated name never takes one of them
+    for name in names:
+        if name and len(name) <= SHEET_NAME_LENGTH and INVALID_SHEET_NAME_PATTERN.search(name) is None and name.lower() not in used:
+            sheet_names[name] = name
+            used.add(name.lower())
+
+    number = 0
+    for name in names:
+        if name in sheet_names:
+            continue
+
+        # Find the next free generated name
+        while True:
+            number += 1
+            sheet_name = f'sheet_{number}'
+            if sheet_name not in used:
+                break
+
+        sheet_names[name] = sheet_name
+        used.add(sheet_name)
+
+    return sheet_names
+
+def write_dataframes(output_path: Path, dataframes: dict[str, pd.DataFrame], key: str | None):
+    """ Write named DataFrames in the format of the output file suffix.
+        Excel gets one sheet per DataFrame.
+        A name, which is not a valid sheet name, gets a generated sheet name, which is listed with the full name on an index sheet.
+        The other formats get a single table, where the name of each DataFrame is stored in the key column.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            output_path (Path): Output file.
+            dataframes (dict[str, pd.DataFrame]): DataFrames by their name.
+            key (str | None): Name of the column, which stores the name of each DataFrame, or None to leave it out.
+
+        Raises:
+            ValueError: If the output format is not supported.
+    """
+    suffix = output_path.suffix.lower()
+    if suffix not in OUTPUT_FORMATS:
+        raise ValueError(f'Unsupported output format "{suffix}", expected one of {", ".join(OUTPUT_FORMATS)}.')
+
+    # Write each DataFrame to its own sheet
+    if suffix == '.xlsx':
+        sheet_names = __sheet_names(
+            names=list(dataframes),
+        )
+
+        with pd.ExcelWriter(output_path) as writer:
+            for name, df in dataframes.items():
+                df.to_excel(
+                    writer,
+                    sheet_name=sheet_names[name],
+                    index=False,
+                )
+
+            # List the full name of each renamed sheet
+            renamed = {
+                sheet_name: name
+                    for name, sheet_name in sheet_names.items()
+                    if sheet_name != name
+            }
+            if renamed:
+                pd.DataFrame({
+                    'Sheet': list(renamed),
+                    key or 'Name': list(renamed.values()),
+                }).to_excel(
+                    writer,
+                    sheet_name=INDEX_SHEET_NAME,
+                    index=False,
+                )
+        return
+
+    # Stack the DataFrames to a single table with the name as first column
+    if key is not None:
+        dataframes = {
+            name: df.assign(**{key: name})[[key, *df.columns]]
+                for name, df in dataframes.items()
+        }
+
+    if dataframes:
+        table = pd.concat(
+            list(dataframes.values()),
+            ignore_index=True,
+        )
+    else:
+        table = pd.DataFrame({key: []} if key is not None else {})
+
+    if suffix == '.csv':
+        table.to_csv(
+            output_path,
+            index=False,
+        )
+    elif suffix == '.parquet':
+        table.to_parquet(
+            output_path,
+            index=False,
+        )
+    elif suffix == '.feather':
+        table.to_feather(
+            output_path,
+        )
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+from src.parser.utils.log import log
+from pathlib import Path
+import threading
+import queue
+import time
+
+# Bounded queues of the running batch, None reads and writes each image in the processing thread.
+# The read queue holds images decoded ahead by the reader thread, the write queue images waiting for the writer thread.
+read_queue: queue.Queue | None = None
+write_queue: queue.Queue | None = None
+
+# Threads of the running batch and the read function of the reader.
+reader_thread: threading.Thread | None = None
+writer_thread: threading.Thread | None = None
+prefetch_reader: Callable | None = None
+
+# Images, which were taken from the read queue for a later path.
+prefetched: dict[Path, tuple[Any, BaseException | None]] = {}
+
+# First error of the writer thread, which is raised in the processing thread.
+write_error: BaseException | None = None
+
+# Signal for the reader thread to stop, for example if a job failed.
+stop_reading = threading.Event()
+
+def __read_ahead(read: Callable[[Path], Any], paths: list[Path]):
+    """ Read the images of a batch ahead into the read queue.
+        The reader waits while the queue is full and ends with None after the last image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            read (Callable[[Path], Any]): Read function of the backend.
+            paths (list[Path]): Paths of the images in the order of the jobs.
+    """
+    for path in [*paths, None]:
+        item = None
+        if path is not None:
+            # Keep the error of an image for the job, which opens it.
+            try:
+                item = (path, read(path), None)
+            except Exception as error:
+                item = (path, None, error)
+
+        # Wait for a free slot, but stop if the batch is finished early.
+        while not stop_reading.is_set():
+            try:
+                read_queue.put(
+                    item,
+                    timeout=0.1,
+                )
+                break
+            except queue.Full:
+                continue
+        else:
+            return
+
+def __write_behind():
+    """ Write the images of the write queue until None is queued.
+        After the first error the remaining images are dropped.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+    """
+    global write_error
+
+    while (item := write_queue.get()) is not None:
+        write, arguments = item
+
+        if write_error is None:
+            try:
+                write(**arguments)
+            except Exception as error:
+                write_error = error
+
+def take_prefetched(read: Callable[[Path], Any], image_path: Path) -> tuple[bool, Any]:
+    """ Take the image of a path from the reader thread of the batch.
+        Images of other paths are kept until they are opened.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            read (Callable[[Path], Any]): Read function of the backend, which calls this function first.
+            image_path (Path): Path of the image.
+
+        Returns:
+            (bool, Any): Flag if the image was prefetched and the image.
+
+        Raises:
+            Exception: Error of the reader thread for this image.
+    """
+    # Read the image directly without a reader, in the reader itself or with another read function.
+    if read_queue is None or read is not prefetch_reader or threading.current_thread() is reader_thread:
+        return False, None
+
+    # Wait for the reader until the image of the path is decoded.
+    occupancy = read_queue.qsize()
+    start = time.perf_counter_ns()
+    while image_path not in prefetched:
+        item = read_queue.get()
+
+        # The reader has finished without the path, so the image is read directly.
+        if item is None:
+            read_queue.put(None)
+            return False, None
+
+        prefetched[item[0]] = item[1:]
+
+    image, error = prefetched.pop(image_path)
+    if error is not None:
+        raise error
+
+    log(f'finish take prefetched image after {(time.perf_counter_ns() - start) / 1e6:.3f} ms stall with {occupancy} queued')
+    return True, image
+
+def write_behind(write: Callable[..., None], **arguments) -> bool:
+    """ Hand an image to the writer thread of the batch.
+        The image must not be changed after it is handed over.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            write (Callable[..., None]): Write function of the backend, which calls this function first.
+            arguments (dict): Keyword arguments of the write function.
+
+        Returns:
+            bool: True if the writer thread writes the image, False if it must be written directly.
+
+        Raises:
+            Exception: Error of the writer thread for a previous image.
+    """
+    # Write the image directly without a writer or in the writer itself.
+    if write_queue is None or threading.current_thread() is writer_thread:
+        return False
+
+    # Raise the error of a previous image in the job, which is currently processed.
+    if write_error is not None:
+        raise write_error
+
+    # Wait for a free slot of the writer.
+    occupancy = write_queue.qsize()
+    start = time.perf_counter_ns()
+    write_queue.put((write, arguments))
+    log(f'finish queue image for writing after {(time.perf_counter_ns() - start) / 1e6:.3f} ms stall with {occupancy} queued')
+
+    return True
+
+@contextmanager
+def overlapped_io(depth: int, read: Callable[[Path], Any] | None, paths: list[Path]) -> Iterator[None]:
+    """ Read and write the images of a batch in separate threads, while the jobs are processed.
+        The reader decodes the next images and the writer encodes the previous images with bounded queues of the given depth.
+        All images are written, when the context is left.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            depth (int): Number of images in each queue, 0 reads and writes each image in the processing thread.
+            read (Callable[[Path], Any] | None): Read function of the backend, which opens the image of each job, or None to only write behind.
+            paths (list[Path]): Paths of the images in the order of the jobs.
+
+        Raises:
+            Exception: First error of the writer thread.
+    """
+    global read_queue, write_queue, reader_thread, writer_thread, prefetch_reader, write_error
+
+    if depth <= 0:
+        yield
+        return
+
+    # Start the writer.
+    write_error = None
+    write_queue = queue.Queue(maxsize=depth)
+    writer_thread = threading.Thread(
+        target=__write_behind,
+        name='ipp_writer',
+    )
+    writer_thread.start()
+
+    # Start the reader, which reads the images with the read function of the backend.
+    if read is not None:
+        stop_reading.clear()
+        prefetched.clear()
+        prefetch_reader = read
+        read_queue = queue.Queue(maxsize=depth)
+        reader_thread = threading.Thread(
+            target=__read_ahead,
+            name='ipp_reader',
+            args=(read, paths),
+        )
+        reader_thread.start()
+
+    try:
+        yield
+    finally:
+        # Stop the reader and wait until all queued images are written.
+        stop_reading.set()
+        write_queue.put(None)
+        writer_thread.join()
+
+        if reader_thread is not None:
+            reader_thread.join()
+
+        read_queue = None
+        write_queue = None
+        reader_thread = None
+        writer_thread = None
+        prefetch_reader = None
+        prefetched.clear()
+
+    if write_error is not None:
+        raise write_error
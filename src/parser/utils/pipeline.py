@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+
+# Parameters of each pipeline stage with short key, name, type and default value.
+STAGES: dict[str, dict[str, tuple[str, type, float | int]]] = {
+    'bs': {
+        't': ('threshold', float, 20.0),
+    },
+    'erode': {
+        'r': ('radius', int, 2),
+    },
+    'dilate': {
+        'r': ('radius', int, 2),
+    },
+}
+
+def parse_pipeline(pipeline: str) -> list[tuple[str, dict]]:
+    """ Parse a pipeline of stages like bs:t=20,erode:r=2,dilate:r=2.
+        Stages are separated by commas, parameters by colons.
+        Missing parameters use their default values.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            pipeline (str): Pipeline of stages.
+
+        Returns:
+            list[tuple[str, dict]]: Name and parameters of each stage.
+
+        Raises:
+            ValueError: If a stage or a parameter is unknown or invalid.
+            ValueError: If background subtraction is not the first stage.
+    """
+    stages: list[tuple[str, dict]] = []
+
+    for stage in pipeline.split(','):
+        name, *parameters = stage.strip().split(':')
+
+        if name not in STAGES:
+            raise ValueError(f'Unknown pipeline stage {name}, expected one of {", ".join(STAGES)}.')
+
+        # Start with the default values of the stage.
+        values = {
+            parameter[0]: parameter[2]
+                for parameter in STAGES[name].values()
+        }
+
+        # Overwrite the default values with the given parameters.
+        for parameter in parameters:
+            key, _, value = parameter.partition('=')
+
+            if key not in STAGES[name]:
+                raise ValueError(f'Unknown parameter {key} of pipeline stage {name}.')
+
+            parameter_name, parameter_type, _ = STAGES[name][key]
+            values[parameter_name] = parameter_type(value)
+
+        stages.append((name, values))
+
+    # Background subtraction creates the mask, so it can only be the first stage.
+    if any(name == 'bs' for name, _ in stages[1:]):
+        raise ValueError('Background subtraction can only be the first pipeline stage.')
+
+    return stages
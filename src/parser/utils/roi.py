@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.codec import open_pil_image
+from itertools import chain
+from functools import lru_cache
+from typing import Any, Iterable
+from pathlib import Path
+import numpy as np
+
+# Regions of interest of all following images, empty to process every pixel.
+# Each region is a rectangle (x, y, width, height) or the path of a binary image, which is set where the pixel is not black.
+regions: tuple[tuple[int, int, int, int] | str, ...] = ()
+
+def parse_roi(value: str) -> tuple[int, int, int, int] | str:
+    """ Parse a region of interest like 100,50,640,480 or the path of a binary ROI image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            value (str): Rectangle as x,y,width,height or path of a binary ROI image.
+
+        Returns:
+            tuple[int, int, int, int] | str: Rectangle or path of the ROI image.
+
+        Raises:
+            ValueError: If the value is neither a valid rectangle nor an existing file.
+    """
+    parts = value.split(',')
+
+    if len(parts) == 4:
+        try:
+            x, y, width, height = (int(part) for part in parts)
+        except ValueError:
+            raise ValueError(f'Invalid ROI rectangle {value}, expected x,y,width,height.')
+
+        if x < 0 or y < 0 or width <= 0 or height <= 0:
+            raise ValueError(f'Invalid ROI rectangle {value}, the position must not be negative and the size must be positive.')
+
+        return x, y, width, height
+
+    if not Path(value).is_file():
+        raise ValueError(f'Invalid ROI {value}, expected x,y,width,height or an existing image file.')
+
+    return str(Path(value).resolve())
+
+def use_roi(roi: tuple[tuple[int, int, int, int] | str, ...]):
+    """ Use regions of interest for all following images.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Rectangles and paths of ROI images, empty to process every pixel.
+    """
+    global regions
+
+    regions = tuple(roi)
+
+@lru_cache(maxsize=16)
+def __build_spans(roi: tuple[tuple[int, int, int, int] | str, ...], width: int, height: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """ Build the spans of each row of an image, which are inside the regions of interest.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Rectangles and paths of ROI images.
+            width (int): Width of the image.
+            height (int): Height of the image.
+
+        Returns:
+            tuple[tuple[tuple[int, int], ...], ...]: Sorted and disjoint start and end columns of each row.
+
+        Raises:
+            ValueError: If a ROI image does not have the dimensions of the image.
+    """
+    rows: list[list[tuple[int, int]]] = [[] for _ in range(height)]
+
+    for region in roi:
+        if isinstance(region, tuple):
+            # Clip the rectangle to the image.
+            x, y, region_width, region_height = region
+            start, end = min(x, width), min(x + region_width, width)
+            if start < end:
+                for row in range(min(y, height), min(y + region_height, height)):
+                    rows[row].append((start, end))
+            continue
+
+        # Open the ROI image as grayscale mask, which is set where the pixel is not black.
+        roi_image = open_pil_image(
+            image_path=Path(region),
+        ).convert('L')
+
+        if roi_image.size != (width, height):
+            raise ValueError(f'The ROI image {region} must have the dimensions of the image.')
+
+        # Find the runs of set pixels in each row, a run starts at a rising and ends at a falling edge.
+        edges = np.diff(
+            np.pad(np.asarray(roi_image) > 0, ((0, 0), (1, 1))).view(np.int8),
+            axis=1,
+        )
+        run_rows, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+
+        for row, start, end in zip(run_rows.tolist(), starts.tolist(), ends.tolist()):
+            rows[row].append((start, end))
+
+    # Merge the overlapping and adjacent spans of each row.
+    spans: list[tuple[tuple[int, int], ...]] = []
+    for row in rows:
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted(row):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        spans.append(tuple(merged))
+
+    return tuple(spans)
+
+def roi_spans(width: int, height: int) -> tuple[tuple[tuple[int, int], ...], ...] | None:
+    """ Get the spans of each row of an image, which are inside the regions of interest.
+        The spans are built once per size of the image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            width (int): Width of the image.
+            height (int): Height of the image.
+
+        Returns:
+            tuple[tuple[tuple[int, int], ...], ...] | None: Start and end columns of each row or None to process every pixel.
+
+        Raises:
+            ValueError: If a ROI image does not have the dimensions of the image.
+    """
+    if not regions:
+        return None
+
+    return __build_spans(
+        roi=regions,
+        width=width,
+        height=height,
+    )
+
+def roi_columns(spans: tuple[tuple[tuple[int, int], ...], ...] | None, row: int, width: int) -> Iterable[int]:
+    """ Get the columns of a row, which are inside the regions of interest.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            spans (tuple[tuple[tuple[int, int], ...], ...] | None): Spans of each row or None for every pixel.
+            row (int): Row of the image.
+            width (int): Width of the image.
+
+        Returns:
+            Iterable[int]: Columns of the row in ascending order.
+    """
+    if spans is None:
+        return range(width)
+
+    return chain.from_iterable(
+        range(start, end)
+            for start, end in spans[row]
+    )
+
+def roi_indices(spans: tuple[tuple[tuple[int, int], ...], ...] | None, width: int, height: int) -> Iterable[int]:
+    """ Get the flat indices of the pixels, which are inside the regions of interest.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            spans (tuple[tuple[tuple[int, int], ...], ...] | None): Spans of each row or None for every pixel.
+            width (int): Width of the image.
+            height (int): Height of the image.
+
+        Returns:
+            Iterable[int]: Indices row by row in ascending order.
+    """
+    if spans is None:
+        return range(width * height)
+
+    return chain.from_iterable(
+        range(row * width + start, row * width + end)
+            for row in range(height)
+                for start, end in spans[row]
+    )
+
+def roi_bounds(spans: tuple[tuple[tuple[int, int], ...], ...] | None, width: int, height: int, margin: int = 0) -> tuple[int, int, int, int]:
+    """ Get the bounding box of the regions of interest extended by a margin.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            spans (tuple[tuple[tuple[int, int], ...], ...] | None): Spans of each row or None for every pixel.
+            width (int): Width of the image.
+            height (int): Height of the image.
+            margin (int): Margin around the regions, for example the radius of a neighborhood.
+
+        Returns:
+            (int, int, int, int): Left, top, right and bottom of the box clipped to the image, empty if there is no region.
+    """
+    if spans is None:
+        return 0, 0, width, height
+
+    rows = [row for row in range(height) if spans[row]]
+    if not rows:
+        return 0, 0, 0, 0
+
+    return (
+        max(min(spans[row][0][0] for row in rows) - margin, 0),
+        max(rows[0] - margin, 0),
+        min(max(spans[row][-1][1] for row in rows) + margin, width),
+        min(rows[-1] + 1 + margin, height),
+    )
+
+def roi_gaps(spans: tuple[tuple[tuple[int, int], ...], ...], row: int, width: int) -> list[tuple[int, int]]:
+    """ Get the spans of a row, which are outside the regions of interest.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            spans (tuple[tuple[tuple[int, int], ...], ...]): Spans of each row.
+            row (int): Row of the image.
+            width (int): Width of the image.
+
+        Returns:
+            list[tuple[int, int]]: Start and end columns of each gap.
+    """
+    gaps: list[tuple[int, int]] = []
+
+    column = 0
+    for start, end in spans[row]:
+        if column < start:
+            gaps.append((column, start))
+        column = end
+
+    if column < width:
+        gaps.append((column, width))
+
+    return gaps
+
+def fill_outside_roi(values: list[Any] | bytearray, spans: tuple[tuple[tuple[int, int], ...], ...] | None, width: int, fill: list[Any] | bytes, size: int = 1):
+    """ Fill the values of all pixels outside the regions of interest with slice assignments.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            values (list[Any] | bytearray): Flat values of an image or a mask, which are filled.
+            spans (tuple[tuple[tuple[int, int], ...], ...] | None): Spans of each row or None for every pixel.
+            width (int): Width of the image.
+            fill (list[Any] | bytes): Values of a single pixel, for example [BLACK_PIXEL] or 3 bytes.
+            size (int): Number of values of a single pixel.
+    """
+    if spans is None:
+        return
+
+    for row in range(len(spans)):
+        for start, end in roi_gaps(
+            spans=spans,
+            row=row,
+            width=width,
+        ):
+            values[size * (row * width + start):size * (row * width + end)] = fill * (end - start)
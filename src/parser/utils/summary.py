@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+import pandas as pd
+import re
+
+# Messages, which enclose the stages of each algorithm.
+FIRST_MESSAGE = 'finish preprocessing'
+LAST_MESSAGE = 'finish postprocessing'
+
+def run_backend(run: str) -> str:
+    """ Get the backend of a run from its name, which may end with a repeat number.
+        For example numpy, numpy_2 and numpy-3 are repeats of the backend numpy.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            run (str): Name of the run.
+
+        Returns:
+            str: Name of the backend.
+    """
+    return re.sub(r'[_-]?\d+$', '', run) or run
+
+def stage_durations(df: pd.DataFrame) -> pd.DataFrame:
+    """ Calculate the duration of each stage of a time tracking DataFrame.
+        A stage ends with an event on layer 0 and starts with the previous event on layer 0.
+        Each image of a run ends with the postprocessing event.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            df (pd.DataFrame): Time tracking DataFrame of a run.
+
+        Returns:
+            pd.DataFrame: Algorithm, stage and duration of each stage.
+    """
+    # Filter out the first layer
+    events = df[df['Layer'] == 0].reset_index(drop=True)
+    messages = events['Message'].str.strip()
+
+    # The first stage starts at the reference timestamp of the time tracking
+    durations = events['Timestamp'].diff().fillna(events['Timestamp'])
+
+    # Number the images, each image starts after the postprocessing event of the previous one
+    images = (messages == LAST_MESSAGE).shift(fill_value=False).cumsum()
+
+    # Name the algorithm of each image by its stages, for example "erode" or "background subtraction+erode"
+    algorithms = messages[~messages.isin([FIRST_MESSAGE, LAST_MESSAGE])].str.replace('finish ', '', regex=False)
+    algorithms = algorithms.groupby(images).agg('+'.join)
+
+    return pd.DataFrame({
+        'Algorithm': images.map(algorithms).fillna(''),
+        'Stage': messages,
+        'Duration': durations,
+    })
+
+def summarize_dataframes(dataframes: list[tuple[str, pd.DataFrame]]) -> pd.DataFrame:
+    """ Summarize the stage durations of all runs per backend, algorithm and stage.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            dataframes (list[tuple[str, pd.DataFrame]]): DataFrames with original filenames to summarize.
+
+        Returns:
+            pd.DataFrame: Count, minimum, median, 95th percentile and standard deviation of the durations in seconds.
+    """
+    # Collect the stage durations of all runs
+    durations = [
+        stage_durations(
+            df=df,
+        ).assign(Backend=run_backend(name))
+            for name, df in dataframes
+    ]
+
+    if not durations:
+        return pd.DataFrame(columns=['Backend', 'Algorithm', 'Stage', 'Count', 'Min', 'Median', 'P95', 'Stdev'])
+
+    # Aggregate the repeats of each stage in the order of their first occurrence
+    return pd.concat(
+        durations,
+        ignore_index=True,
+    ).groupby(
+        ['Backend', 'Algorithm', 'Stage'],
+        sort=False,
+    )['Duration'].agg(
+        Count='count',
+        Min='min',
+        Median='median',
+        P95=lambda duration: duration.quantile(0.95),
+        Stdev='std',
+    ).reset_index()
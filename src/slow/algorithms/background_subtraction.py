@@ -8,7 +8,9 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
-from src.slow.utils.image import open_project_image, save_project_image
+from src.slow.utils.image import open_project_image, save_project_image, fill_outside_roi_pixels
+from src.parser.utils.roi import roi_spans, roi_columns
+from src.slow.models.reference import ReferenceImage
 from src.slow.utils.hsv import rgb_to_hsv_image, weighted_hsv_distance
 from src.slow.models.image import Pixel
 from src.parser.utils.log import log
@@ -17,7 +19,7 @@ from pathlib import Path
 WHITE_PIXEL = Pixel.white()
 BLACK_PIXEL = Pixel.black()
 
-def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image_path: Path, input_image_path: Path, output_image_path: Path):
+def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image: ReferenceImage, input_image_path: Path, output_image_path: Path):
     """ Apply Background Subtraction on an image.
 
         Author:
@@ -27,39 +29,51 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): Flag to convert the image to HSV.
             hsv_weights (tuple[float, float, float]): HSV weights for background subtraction.
-            reference_image_path (Path): Reference path for image file.
+            reference_image (ReferenceImage): Reference image opened once for the batch.
             input_image_path (Path): Input path for image file.
             output_image_path (Path): Output path for image file.
 
         Raises:
             ValueError: If the reference image and the input image do not have the same dimensions.
+            ValueError: If the HSV flag is set but the reference image has no HSV form.
     """
-    # Open the reference image and the input image.
-    reference_image = open_project_image(
-        image_path=reference_image_path,
-    )
+    # Open the input image.
+    # The reference image is already opened once for the whole batch.
     image = open_project_image(
         image_path=input_image_path,
     )
     log('finish preprocessing')
 
     # Check if the reference image and the input image have the same dimensions.
-    if reference_image.width != image.width or reference_image.height != image.height:
+    if reference_image.image.width != image.width or reference_image.image.height != image.height:
         raise ValueError('The reference image and the input image must have the same dimensions.')
 
-    # Convert the reference image and the input image to HSV if the flag is set.
+    # Check if the reference image was converted to HSV if the flag is set.
+    if hsv and reference_image.hsv_image is None:
+        raise ValueError('The reference image must be opened with HSV mode to use HSV mode.')
+
+    # Convert the input image to HSV if the flag is set.
+    # The reference image is already converted once for the whole batch.
     # This provides better time tracking for the algorithm.
     if hsv:
-        hsv_reference_image = rgb_to_hsv_image(
-            rgb_image=reference_image,
-        )
+        hsv_reference_image = reference_image.hsv_image
         hsv_image = rgb_to_hsv_image(
             rgb_image=image,
         )
 
-    # Iterate over each pixel in the image.
+    # Get the spans of the regions of interest, pixels outside are black.
+    spans = roi_spans(
+        width=image.width,
+        height=image.height,
+    )
+
+    # Iterate over each pixel in the regions of interest of the image.
     for row in range(image.height):
-        for column in range(image.width):
+        for column in roi_columns(
+            spans=spans,
+            row=row,
+            width=image.width,
+        ):
             # Use the HSV pixels if the flag is set.
             # Otherwise, use the RGB pixels.
             if hsv:
@@ -73,7 +87,7 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
                     weights=hsv_weights,
                 )
             else:
-                reference_pixel = reference_image.pixels[row][column]
+                reference_pixel = reference_image.image.pixels[row][column]
                 pixel = image.pixels[row][column]
 
                 # Calculate the difference between the RGB pixels.
@@ -85,6 +99,13 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
                 image.pixels[row][column] = WHITE_PIXEL
             else:
                 image.pixels[row][column] = BLACK_PIXEL
+
+    # Set the pixels outside the regions of interest to black.
+    fill_outside_roi_pixels(
+        image=image,
+        spans=spans,
+        pixel=BLACK_PIXEL,
+    )
     log('finish background subtraction')
 
     # Save the image to the output path.
@@ -8,7 +8,8 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
-from src.slow.utils.image import open_project_image, save_project_image, get_neighbor_pixels
+from src.slow.utils.image import open_project_image, save_project_image, copy_project_image, get_neighbor_pixels, fill_outside_roi_pixels
+from src.parser.utils.roi import roi_spans, roi_columns
 from src.slow.models.image import Pixel
 from src.parser.utils.log import log
 from pathlib import Path
@@ -33,14 +34,29 @@ def dilate(radius: int, input_image_path: Path, output_image_path: Path):
     )
 
     # Create a copy of the input input image as output image.
-    output_image = input_image.model_copy(
-        deep=True,
+    output_image = copy_project_image(
+        project_image=input_image,
+    )
+
+    # Get the spans of the regions of interest, pixels outside are black.
+    spans = roi_spans(
+        width=input_image.width,
+        height=input_image.height,
+    )
+    fill_outside_roi_pixels(
+        image=output_image,
+        spans=spans,
+        pixel=BLACK_PIXEL,
     )
     log('finish preprocessing')
 
-    # Iterate over each pixel in the image.
+    # Iterate over each pixel in the regions of interest of the image.
     for row in range(input_image.height):
-        for column in range(input_image.width):
+        for column in roi_columns(
+            spans=spans,
+            row=row,
+            width=input_image.width,
+        ):
             # Get the neighbor pixels of the current pixel.
             neighbor_pixels = get_neighbor_pixels(
                 image=input_image,
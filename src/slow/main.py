@@ -11,17 +11,212 @@ Author Benedikt SCHWERING <bes9584@thi.de>
 from src.slow.algorithms.background_subtraction import background_subtraction as background_subtraction_algorithm
 from src.slow.algorithms.dilate import dilate as dilate_algorithm
 from src.slow.algorithms.erode import erode as erode_algorithm
+from src.slow.utils.reference import open_reference_image
+from src.slow.utils.image import open_project_image
+from src.slow.utils.construct import use_validation
+from src.slow.utils.hsv import use_hsv_lut
+from src.parser.utils.log import set_log_base, start_trace
+from src.parser.utils.codec import use_codec, output_image_path, CODECS
+from src.parser.utils.roi import use_roi, parse_roi
+from src.parser.utils.cache import use_image_cache
+from src.parser.utils.batch import run_batch
 from pathlib import Path
 import click
 
+# Shared parameters of a batch, set once per process by the batch initializer.
+batch_parameters = {}
+
+def __init_batch(**parameters):
+    """ Initialize the shared parameters of a batch.
+        The reference image file is opened once and replaced by the reference image.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            parameters (dict): Shared parameters of the batch.
+    """
+    set_log_base()
+    batch_parameters.clear()
+    batch_parameters.update(parameters)
+
+    # Write all output images of the batch with the selected codec.
+    use_codec(
+        name=batch_parameters.pop('codec', 'pil'),
+        compression_level=batch_parameters.pop('compression', 6),
+    )
+
+    # Process only the regions of interest of all images of the batch.
+    use_roi(
+        roi=batch_parameters.pop('roi', ()),
+    )
+
+    # Map the decoded input images of the batch from the image cache.
+    image_cache = batch_parameters.pop('image_cache', None)
+    use_image_cache(
+        directory=Path(image_cache) if image_cache is not None else None,
+        max_size=batch_parameters.pop('image_cache_size', 1024) << 20,
+    )
+
+    # Construct the models with or without validation for the whole batch.
+    use_validation(
+        enabled=not batch_parameters.pop('no_validation', False),
+    )
+
+    # Use the HSV lookup table for all conversions of the batch.
+    # The table is built once into its cache directory and memory mapped by each process.
+    hsv_lut = batch_parameters.pop('hsv_lut', None)
+    if hsv_lut is not None and parameters['hsv']:
+        use_hsv_lut(
+            directory=Path(hsv_lut),
+        )
+
+    # Open the reference image once for the whole batch.
+    if 'reference_image_file' in parameters:
+        batch_parameters['reference_image'] = open_reference_image(
+            image_path=Path(batch_parameters.pop('reference_image_file')),
+            hsv=parameters['hsv'],
+        )
+
+def __background_subtraction_job(image_file: str):
+    """ Background Subtraction on a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform background subtraction on the image.
+    background_subtraction_algorithm(
+        threshold=batch_parameters['threshold'],
+        hsv=batch_parameters['hsv'],
+        hsv_weights=batch_parameters['hsv_weights'],
+        reference_image=batch_parameters['reference_image'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='background_subtraction',
+        ),
+    )
+
+def __erode_job(image_file: str):
+    """ Erode a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform erosion on the image.
+    erode_algorithm(
+        radius=batch_parameters['radius'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='erode',
+        ),
+    )
+
+def __dilate_job(image_file: str):
+    """ Dilate a single image of a batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_file (str): Image file.
+    """
+    set_log_base()
+
+    # Convert the image file to a Path object.
+    image_path = Path(image_file)
+
+    # Perform dilation on the image.
+    dilate_algorithm(
+        radius=batch_parameters['radius'],
+        input_image_path=image_path,
+        output_image_path=output_image_path(
+            image_path=image_path,
+            prefix='dilate',
+        ),
+    )
+
+def __parse_roi_option(context: click.Context, parameter: click.Parameter, value: tuple[str, ...]) -> tuple[tuple[int, int, int, int] | str, ...]:
+    """ Parse the regions of interest of a CLI command.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            context (click.Context): Context of the CLI command.
+            parameter (click.Parameter): ROI option.
+            value (tuple[str, ...]): Rectangles as x,y,width,height or paths of binary ROI images.
+
+        Returns:
+            tuple[tuple[int, int, int, int] | str, ...]: Rectangles and paths of the ROI images.
+
+        Raises:
+            click.BadParameter: If a region is invalid.
+    """
+    try:
+        return tuple(
+            parse_roi(
+                value=region,
+            )
+                for region in value
+        )
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
 @click.group()
-def cli():
+@click.option(
+    '--console',
+    '-c',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Print the time tracking events directly with rich.'
+)
+@click.option(
+    '--trace-file',
+    '-T',
+    type=click.Path(
+        dir_okay=False,
+        file_okay=True,
+        allow_dash=True,
+    ),
+    default='-',
+    show_default=True,
+    help='File for the recorded time tracking events, written at exit.'
+)
+def cli(console: bool, trace_file: str):
     """ Image Processing Performance - Slow Implementation
 
         Author:
             Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            console (bool): Print the time tracking events directly with rich.
+            trace_file (str): File for the recorded time tracking events, written at exit.
     """
-    pass
+    # Record the time tracking events in the trace buffer unless the console is requested.
+    # This keeps the overhead of the time tracking low.
+    if not console:
+        start_trace(
+            trace_file=trace_file,
+        )
 
 @cli.command(
     name='background_subtraction',
@@ -51,6 +246,81 @@ def cli():
     show_default=True,
     help='HSV weights for background subtraction.'
 )
+@click.option(
+    '--hsv-lut',
+    '-L',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the HSV lookup table, which replaces the HSV conversion.'
+)
+@click.option(
+    '--no-validation',
+    '-N',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Construct the pydantic images without validation, with shared pixels and shallow copies.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'reference_image_file',
     type=click.Path(
@@ -68,7 +338,7 @@ def cli():
     required=True,
     nargs=-1,
 )
-def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], reference_image_file: str, image_files: tuple[str, ...]):
+def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float, float, float], hsv_lut: str | None, no_validation: bool, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, reference_image_file: str, image_files: tuple[str, ...]):
     """ Background Subtraction on a set of images.
 
         Author:
@@ -78,25 +348,41 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
             threshold (float): Threshold value for background subtraction.
             hsv (bool): HSV mode for background subtraction.
             hsv_weights (tuple[float, float, float]): HSV weights for background subtraction.
+            hsv_lut (str | None): Cache directory of the HSV lookup table.
+            no_validation (bool): Construct the pydantic images without validation.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             reference_image_file (str): Reference image file.
             image_files (tuple[str, ...]): List of image files.
     """
-    # Convert the reference image file to a Path object.
-    reference_image_path = Path(reference_image_file)
-
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform background subtraction on the image.
-        background_subtraction_algorithm(
-            threshold=threshold,
-            hsv=hsv,
-            hsv_weights=hsv_weights,
-            reference_image_path=reference_image_path,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'background_subtraction_{image_path.name}',
-        )
+    # Perform background subtraction on each image.
+    # The reference image is opened once per process.
+    run_batch(
+        function=__background_subtraction_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'threshold': threshold,
+            'hsv': hsv,
+            'hsv_weights': hsv_weights,
+            'hsv_lut': hsv_lut,
+            'reference_image_file': reference_image_file,
+            'no_validation': no_validation,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
 
 @cli.command(
     name='erode',
@@ -110,6 +396,71 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     show_default=True,
     help='Radius value for erosion.'
 )
+@click.option(
+    '--no-validation',
+    '-N',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Construct the pydantic images without validation, with shared pixels and shallow copies.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'image_files',
     type=click.Path(
@@ -119,7 +470,7 @@ def background_subtraction(threshold: float, hsv: bool, hsv_weights: tuple[float
     required=True,
     nargs=-1,
 )
-def erode(radius: int, image_files: tuple[str, ...]):
+def erode(radius: int, no_validation: bool, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, image_files: tuple[str, ...]):
     """ Erode a set of images.
 
         Author:
@@ -127,18 +478,34 @@ def erode(radius: int, image_files: tuple[str, ...]):
 
         Args:
             radius (int): Radius value for erosion.
+            no_validation (bool): Construct the pydantic images without validation.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             image_files (tuple[str, ...]): List of image files.
     """
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform erosion on the image.
-        erode_algorithm(
-            radius=radius,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'erode_{image_path.name}',
-        )
+    # Perform erosion on each image.
+    run_batch(
+        function=__erode_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'radius': radius,
+            'no_validation': no_validation,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
 
 @cli.command(
     name='dilate',
@@ -152,6 +519,71 @@ def erode(radius: int, image_files: tuple[str, ...]):
     show_default=True,
     help='Radius value for dilation.'
 )
+@click.option(
+    '--no-validation',
+    '-N',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Construct the pydantic images without validation, with shared pixels and shallow copies.'
+)
+@click.option(
+    '--roi',
+    '-R',
+    multiple=True,
+    callback=__parse_roi_option,
+    help='Region of interest as x,y,width,height or binary ROI image, repeat for multiple regions. Only pixels inside are processed, all others are black.'
+)
+@click.option(
+    '--codec',
+    '-C',
+    type=click.Choice(list(CODECS)),
+    default='pil',
+    show_default=True,
+    help='Codec of the output images: RGB with PIL, 1-bit PNG, grayscale PNG, raw RGB NPY or grayscale PNG with OpenCV.'
+)
+@click.option(
+    '--compression',
+    '-z',
+    type=click.IntRange(0, 9),
+    default=6,
+    show_default=True,
+    help='Compression level of PNG output images.'
+)
+@click.option(
+    '--image-cache',
+    '-I',
+    type=click.Path(
+        file_okay=False,
+        resolve_path=True,
+    ),
+    default=None,
+    help='Cache directory of the decoded input images, which are memory mapped instead of decoded again.'
+)
+@click.option(
+    '--image-cache-size',
+    '-S',
+    type=click.IntRange(min=1),
+    default=1024,
+    show_default=True,
+    help='Maximum size of the image cache in MiB, the least recently used images are evicted first.'
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='Number of processes.'
+)
+@click.option(
+    '--overlap',
+    '-O',
+    type=int,
+    default=0,
+    show_default=True,
+    help='Depth of the queues to read the next and write the previous images in separate threads, 0 reads and writes sequentially.'
+)
 @click.argument(
     'image_files',
     type=click.Path(
@@ -161,7 +593,7 @@ def erode(radius: int, image_files: tuple[str, ...]):
     required=True,
     nargs=-1,
 )
-def dilate(radius: int, image_files: tuple[str, ...]):
+def dilate(radius: int, no_validation: bool, roi: tuple[tuple[int, int, int, int] | str, ...], codec: str, compression: int, image_cache: str | None, image_cache_size: int, jobs: int, overlap: int, image_files: tuple[str, ...]):
     """ Dilate a set of images.
 
         Author:
@@ -169,15 +601,31 @@ def dilate(radius: int, image_files: tuple[str, ...]):
 
         Args:
             radius (int): Radius value for dilation.
+            no_validation (bool): Construct the pydantic images without validation.
+            roi (tuple[tuple[int, int, int, int] | str, ...]): Regions of interest, empty to process every pixel.
+            codec (str): Codec of the output images.
+            compression (int): Compression level of PNG output images.
+            image_cache (str | None): Cache directory of the decoded input images, None to decode each image.
+            image_cache_size (int): Maximum size of the image cache in MiB.
+            jobs (int): Number of processes to use for parallel processing.
+            overlap (int): Depth of the read and write queues of a single process, 0 reads and writes sequentially.
             image_files (tuple[str, ...]): List of image files.
     """
-    for image_file in image_files:
-        # Convert the image file to a Path object.
-        image_path = Path(image_file)
-
-        # Perform dilation on the image.
-        dilate_algorithm(
-            radius=radius,
-            input_image_path=image_path,
-            output_image_path=image_path.parent / f'dilate_{image_path.name}',
-        )
+    # Perform dilation on each image.
+    run_batch(
+        function=__dilate_job,
+        arguments=list(image_files),
+        jobs=jobs,
+        initializer=__init_batch,
+        parameters={
+            'radius': radius,
+            'no_validation': no_validation,
+            'roi': roi,
+            'codec': codec,
+            'compression': compression,
+            'image_cache': image_cache,
+            'image_cache_size': image_cache_size,
+        },
+        overlap=overlap,
+        read=open_project_image,
+    )
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.slow.models.hsv import HSVImage
+from src.slow.models.image import Image
+from pydantic import BaseModel
+
+class ReferenceImage(BaseModel):
+    """ Reference Image class for the project.
+        Holds the decoded reference image and its HSV form for a whole batch.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+    """
+    image: Image
+    hsv_image: HSVImage | None = None
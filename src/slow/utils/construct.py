@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from contextlib import contextmanager
+from typing import Iterator, TypeVar
+from pydantic import BaseModel
+import gc
+
+Model = TypeVar('Model', bound=BaseModel)
+
+# Validate the image models on construction.
+# Otherwise the images are constructed from trusted pixels without validation, pixels are shared and copies are shallow.
+validate = True
+
+def use_validation(enabled: bool):
+    """ Enable or disable the validation for all following model constructions.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            enabled (bool): Validate the models on construction.
+    """
+    global validate
+    validate = enabled
+
+def is_validating() -> bool:
+    """ Check if the models are validated on construction.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Returns:
+            bool: True if the models are validated, False otherwise.
+    """
+    return validate
+
+def create_model(model: type[Model], **fields) -> Model:
+    """ Create a model with or without validation.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            model (type[Model]): Pydantic model class.
+            fields (dict): Fields of the model.
+
+        Returns:
+            Model: New model instance.
+    """
+    if validate:
+        return model(**fields)
+
+    return model.model_construct(**fields)
+
+@contextmanager
+def paused_garbage_collection() -> Iterator[None]:
+    """ Pause the cyclic garbage collection while many pixels are created.
+        The pixels do not form cycles, but each collection would scan all pixels created so far.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
@@ -9,9 +9,42 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
 from src.slow.models.hsv import HSVImage, HSVPixel
+from src.parser.utils.lut import open_lut, build_float_hsv_lut
+from src.slow.utils.construct import create_model, is_validating, paused_garbage_collection
 from src.slow.models.image import Image, Pixel
+from pathlib import Path
+import numpy as np
 import math
 
+# Lookup table of the HSV values, which replaces the conversion if it is set.
+# The three values of the RGB pixel index i are at the offsets 3 * i, 3 * i + 1 and 3 * i + 2.
+hsv_lut: memoryview | None = None
+
+def use_hsv_lut(directory: Path | None):
+    """ Use a lookup table from a cache directory for all following HSV conversions.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            directory (Path | None): Cache directory of the lookup table or None to calculate the values.
+    """
+    global hsv_lut
+
+    if directory is None:
+        hsv_lut = None
+        return
+
+    lut = open_lut(
+        directory=directory,
+        name='hsv_lut_float',
+        dtype=np.float64,
+        build=build_float_hsv_lut,
+    )
+
+    # View the memory mapped table as flat floats, so no numpy scalars are created on lookup.
+    hsv_lut = memoryview(lut).cast('B').cast('d')
+
 def rgb_to_hsv_pixel(rgb_pixel: Pixel) -> HSVPixel:
     """ Convert an RGB pixel to an HSV pixel.
         Algorithm reference from http://alvyray.com/Papers/CG/color78.pdf.
@@ -26,6 +59,16 @@ def rgb_to_hsv_pixel(rgb_pixel: Pixel) -> HSVPixel:
         Returns:
             HSVPixel: HSV pixel.
     """
+    if hsv_lut is not None:
+        # Look up the HSV values with the index red << 16 | green << 8 | blue.
+        offset = 3 * (rgb_pixel.red << 16 | rgb_pixel.green << 8 | rgb_pixel.blue)
+
+        return HSVPixel(
+            hue=hsv_lut[offset],
+            saturation=hsv_lut[offset + 1],
+            value=hsv_lut[offset + 2],
+        )
+
     # Get the red, green, and blue values of the RGB pixel in the range [0, 1].
     red = rgb_pixel.red / 255
     green = rgb_pixel.green / 255
@@ -90,18 +133,36 @@ def rgb_to_hsv_image(rgb_image: Image) -> HSVImage:
     height = rgb_image.height
 
     # Get the HSV pixels of the RGB image pixels.
-    hsv_pixels = [
-        [
-            rgb_to_hsv_pixel(
-                rgb_pixel=pixel,
-            )
-                for pixel in row
+    if is_validating():
+        hsv_pixels = [
+            [
+                rgb_to_hsv_pixel(
+                    rgb_pixel=pixel,
+                )
+                    for pixel in row
+            ]
+                for row in rgb_image.pixels
         ]
-            for row in rgb_image.pixels
-    ]
+    else:
+        # Convert each distinct pixel only once and share its HSV pixel as flyweight.
+        flyweights: dict[tuple[int, int, int], HSVPixel] = {}
+        with paused_garbage_collection():
+            hsv_pixels = [
+                [
+                    flyweights.get((pixel.red, pixel.green, pixel.blue)) or flyweights.setdefault(
+                        (pixel.red, pixel.green, pixel.blue),
+                        rgb_to_hsv_pixel(
+                            rgb_pixel=pixel,
+                        ),
+                    )
+                        for pixel in row
+                ]
+                    for row in rgb_image.pixels
+            ]
 
     # Create a new HSV image and return it.
-    return HSVImage(
+    return create_model(
+        HSVImage,
         width=width,
         height=height,
         pixels=hsv_pixels,
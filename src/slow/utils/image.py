@@ -8,7 +8,12 @@ It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
 
 Author Benedikt SCHWERING <bes9584@thi.de>
 """
+from src.slow.utils.construct import create_model, is_validating, paused_garbage_collection
 from src.slow.models.image import Image, Pixel
+from src.parser.utils.codec import open_pil_image, save_pil_image
+from src.parser.utils.cache import open_cached_image
+from src.parser.utils.overlap import take_prefetched, write_behind
+from src.parser.utils.roi import roi_gaps
 from src.parser.utils.log import log
 from PIL import Image as PILImage
 from pathlib import Path
@@ -25,35 +30,72 @@ def open_project_image(image_path: Path) -> Image:
         Returns:
             Image: Project image.
     """
-    # Open the image with the PIL library.
-    pil_image = PILImage.open(
-        fp=image_path,
-        mode='r',
+    # Take the image from the reader of the batch, if it was read ahead.
+    taken, project_image = take_prefetched(
+        read=open_project_image,
+        image_path=image_path,
     )
-    log('finish open pil image')
+    if taken:
+        return project_image
 
-    # Convert the image to RGB if it is not already.
-    # This is necessary because the image is not always in RGB format.
-    # For example, the image could be in RGBA with an alpha channel in PNG format.
-    pil_image = pil_image.convert('RGB')
-    log('finish convert pil image')
+    # Load the decoded image from the cache, if it is used.
+    cached_image = open_cached_image(
+        image_path=image_path,
+    )
+    if cached_image is not None:
+        # Get the width and height of the image.
+        height, width = cached_image.shape[:2]
+
+        # Group the raw RGB data into the flat data of the image.
+        data = cached_image.tobytes()
+        flat_data = list(zip(data[0::3], data[1::3], data[2::3]))
+    else:
+        # Open the image with the PIL library, NPY files are loaded with numpy.
+        pil_image = open_pil_image(
+            image_path=image_path,
+        )
+        log('finish open pil image')
 
-    # Get the width and height of the image.
-    width, height = pil_image.size
+        # Convert the image to RGB if it is not already.
+        # This is necessary because the image is not always in RGB format.
+        # For example, the image could be in RGBA with an alpha channel in PNG format.
+        pil_image = pil_image.convert('RGB')
+        log('finish convert pil image')
+
+        # Get the width and height of the image.
+        width, height = pil_image.size
 
-    # Get the flat data of the image.
-    flat_data = list(pil_image.getdata())
+        # Get the flat data of the image.
+        flat_data = list(pil_image.getdata())
     log('finish extract flat data')
 
     # Convert the flat data to a list of pixels.
-    flat_pixels = [
-        Pixel(
-            red=flat_pixel[0],
-            green=flat_pixel[1],
-            blue=flat_pixel[2],
-        )
-            for flat_pixel in flat_data
-    ]
+    if is_validating():
+        flat_pixels = [
+            Pixel(
+                red=flat_pixel[0],
+                green=flat_pixel[1],
+                blue=flat_pixel[2],
+            )
+                for flat_pixel in flat_data
+        ]
+    else:
+        # Create each distinct pixel only once and share it as flyweight.
+        # The white and black pixels of masks are the same instances for the whole image.
+        # A single pixel is created with validation, because pydantic validates its three integers faster than model_construct sets them.
+        flyweights: dict[tuple[int, int, int], Pixel] = {}
+        with paused_garbage_collection():
+            flat_pixels = [
+                flyweights.get(flat_pixel) or flyweights.setdefault(
+                    flat_pixel,
+                    Pixel(
+                        red=flat_pixel[0],
+                        green=flat_pixel[1],
+                        blue=flat_pixel[2],
+                    ),
+                )
+                    for flat_pixel in flat_data
+            ]
     log('finish create flat pixels')
 
     # Convert the pixels to a two dimensional list.
@@ -64,12 +106,40 @@ def open_project_image(image_path: Path) -> Image:
     log('finish reshape pixels')
 
     # Create a new project image and return it.
-    return Image(
+    return create_model(
+        Image,
         width=width,
         height=height,
         pixels=pixels,
     )
 
+def copy_project_image(project_image: Image) -> Image:
+    """ Copy a project image, so its pixels can be replaced without changing the original.
+        Without validation only the rows are copied and the pixels are shared, because the algorithms replace pixels instead of changing them.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            project_image (Image): Project image.
+
+        Returns:
+            Image: Copy of the project image.
+    """
+    if is_validating():
+        return project_image.model_copy(
+            deep=True,
+        )
+
+    return Image.model_construct(
+        width=project_image.width,
+        height=project_image.height,
+        pixels=[
+            row.copy()
+                for row in project_image.pixels
+        ],
+    )
+
 def save_project_image(image_path: Path, project_image: Image):
     """ Save a project image to a file.
 
@@ -80,6 +150,14 @@ def save_project_image(image_path: Path, project_image: Image):
             image_path (Path): Path to the image.
             project_image (Image): Project image.
     """
+    # Hand the image to the writer of the batch, if it writes behind.
+    if write_behind(
+        write=save_project_image,
+        image_path=image_path,
+        project_image=project_image,
+    ):
+        return
+
     # Create a new PIL image with the same width and height as the project image.
     pil_image = PILImage.new(
         mode='RGB',
@@ -109,9 +187,10 @@ def save_project_image(image_path: Path, project_image: Image):
     )
     log('finish put data to pil image')
 
-    # Save the PIL image to the file.
-    pil_image.save(
-        fp=image_path,
+    # Save the PIL image to the file with the codec of the batch.
+    save_pil_image(
+        image_path=image_path,
+        pil_image=pil_image,
     )
     log('finish save pil image')
 
@@ -151,3 +230,26 @@ def get_neighbor_pixels(image: Image, radius: int, row: int, column: int) -> lis
 
     # Return the neighbor pixels list.
     return neighbor_pixels
+
+def fill_outside_roi_pixels(image: Image, spans: tuple[tuple[tuple[int, int], ...], ...] | None, pixel: Pixel):
+    """ Replace all pixels of an image outside the regions of interest.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image (Image): Project image, which is changed in place.
+            spans (tuple[tuple[tuple[int, int], ...], ...] | None): Spans of each row inside the regions of interest or None for every pixel.
+            pixel (Pixel): Pixel outside the regions of interest.
+    """
+    if spans is None:
+        return
+
+    # Replace the gaps between the spans of each row.
+    for row in range(image.height):
+        for start, end in roi_gaps(
+            spans=spans,
+            row=row,
+            width=image.width,
+        ):
+            image.pixels[row][start:end] = [pixel] * (end - start)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.slow.models.reference import ReferenceImage
+from src.slow.utils.image import open_project_image
+from src.slow.utils.hsv import rgb_to_hsv_image
+from src.slow.utils.construct import create_model
+from pathlib import Path
+
+def open_reference_image(image_path: Path, hsv: bool) -> ReferenceImage:
+    """ Open a reference image once for a whole batch of images.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            image_path (Path): Path to the reference image.
+            hsv (bool): Flag to also convert the reference image to HSV.
+
+        Returns:
+            ReferenceImage: Reference image with its optional HSV form.
+    """
+    # Open the reference image.
+    image = open_project_image(
+        image_path=image_path,
+    )
+
+    # Convert the reference image to HSV if the flag is set.
+    hsv_image = None
+    if hsv:
+        hsv_image = rgb_to_hsv_image(
+            rgb_image=image,
+        )
+
+    # Create a new reference image and return it.
+    return create_model(
+        ReferenceImage,
+        image=image,
+        hsv_image=hsv_image,
+    )
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.dataframe import convert_to_dataframe
+from pandas.testing import assert_frame_equal
+from src.parser.utils import dataframe
+from pathlib import Path
+import pandas as pd
+import random
+import pytest
+import re
+
+# Modules and messages of the generated time tracking events.
+MODULES = ['background_subtraction', 'open_project_image', 'save_project_image', 'map_chunks']
+MESSAGES = [
+    'finish preprocessing',
+    'finish background subtraction',
+    'finish postprocessing',
+    'finish 4 chunks with queue wait 0.012 ms and compute 1.234-2.345 ms',
+]
+
+def __reference_dataframe(time_tracking_file: Path) -> pd.DataFrame:
+    """ Convert a time tracking file with the previous parser, which matches each field with its own pattern.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            time_tracking_file (Path): Time tracking file to convert.
+
+        Returns:
+            pd.DataFrame: Time tracking file as pandas DataFrame.
+    """
+    timestamps = []
+    layers = []
+    modules = []
+    messages = []
+
+    for line in time_tracking_file.read_text().splitlines():
+        timestamps.append(
+            float(re.findall(r'(?<=\[)\d+\.\d+(?=\])', line)[0])
+        )
+        layers.append(
+            int(re.findall(r'(?<=\]\s)\d+(?=\s\()', line)[0])
+        )
+        modules.append(
+            re.findall(r'(?<=\().+(?=\))', line)[0]
+        )
+        messages.append(
+            re.findall(r'(?<=\)\s).+', line)[0]
+        )
+
+    return pd.DataFrame({
+        'Layer': layers,
+        'Module': modules,
+        'Message': messages,
+        'Timestamp': timestamps,
+    })
+
+def __write_trace(time_tracking_file: Path, lines: int, seed: int = 0):
+    """ Write a generated time tracking file.
+
+        Author:
+            Benedikt Schwering <bes9584@thi.de>
+
+        Args:
+            time_tracking_file (Path): Time tracking file to write.
+            lines (int): Number of events.
+            seed (int): Seed of the generated events.
+    """
+    generator = random.Random(seed)
+
+    with open(time_tracking_file, 'w') as file:
+        for index in range(lines):
+            file.write(f'[{index // 1000}.{generator.randrange(1_000_000_000):09d}] {generator.randrange(3)} ({generator.choice(MODULES)}) {generator.choice(MESSAGES)}\n')
+
+def test_empty_file(tmp_path: Path):
+    time_tracking_file = tmp_path / 'empty.txt'
+    time_tracking_file.write_text('')
+
+    assert_frame_equal(
+        convert_to_dataframe(
+            time_tracking_file=time_tracking_file,
+        ),
+        __reference_dataframe(
+            time_tracking_file=time_tracking_file,
+        ),
+        check_exact=True,
+    )
+
+@pytest.mark.parametrize('chunk_lines', [7, 1000, dataframe.CHUNK_LINES])
+def test_equal_to_reference(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, chunk_lines: int):
+    # The trace is longer than the chunks, so it ends in a partial chunk after several full ones.
+    time_tracking_file = tmp_path / 'trace.txt'
+    __write_trace(
+        time_tracking_file=time_tracking_file,
+        lines=2 * chunk_lines + 3,
+    )
+    monkeypatch.setattr(dataframe, 'CHUNK_LINES', chunk_lines)
+
+    assert_frame_equal(
+        convert_to_dataframe(
+            time_tracking_file=time_tracking_file,
+        ),
+        __reference_dataframe(
+            time_tracking_file=time_tracking_file,
+        ),
+        check_exact=True,
+    )
+
+@pytest.mark.parametrize('line_number', [1, 7, 8, 15, 20])
+def test_invalid_line(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, line_number: int):
+    # Replace a single event of a trace, which spans three chunks.
+    time_tracking_file = tmp_path / 'trace.txt'
+    __write_trace(
+        time_tracking_file=time_tracking_file,
+        lines=20,
+    )
+    lines = time_tracking_file.read_text().splitlines(keepends=True)
+    lines[line_number - 1] = 'not a time tracking event\n'
+    time_tracking_file.write_text(''.join(lines))
+    monkeypatch.setattr(dataframe, 'CHUNK_LINES', 7)
+
+    with pytest.raises(ValueError, match=f'at line {line_number}\\.$'):
+        convert_to_dataframe(
+            time_tracking_file=time_tracking_file,
+        )
+
+def test_message_with_parenthesis(tmp_path: Path):
+    time_tracking_file = tmp_path / 'trace.txt'
+    time_tracking_file.write_text('[0.000000001] 0 (erode) finish erode (radius 2)\n')
+
+    events = convert_to_dataframe(
+        time_tracking_file=time_tracking_file,
+    )
+    reference_events = __reference_dataframe(
+        time_tracking_file=time_tracking_file,
+    )
+
+    # The module ends at the first closing parenthesis, the previous parser matched up to the last one.
+    assert events['Module'].tolist() == ['erode']
+    assert reference_events['Module'].tolist() == ['erode) finish erode (radius 2']
+
+    # All other fields are equal.
+    assert_frame_equal(
+        events.drop(columns='Module'),
+        reference_events.drop(columns='Module'),
+        check_exact=True,
+    )
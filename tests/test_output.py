@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Image Processing Performance Python
+Copyright (C) 2024 Benedikt Schwering
+
+This software is distributed under the terms of the MIT license.
+It can be found in the LICENSE file or at https://opensource.org/licenses/MIT.
+
+Author Benedikt SCHWERING <bes9584@thi.de>
+"""
+from src.parser.utils.output import write_dataframes, SHEET_NAME_LENGTH
+from pathlib import Path
+import pandas as pd
+import pytest
+
+def test_excel_sheet_names(tmp_path: Path):
+    pytest.importorskip('openpyxl')
+
+    # Pipelines with the same first steps must not collide after renaming.
+    names = [
+        'background subtraction',
+        'background subtraction, erode, dilate',
+        'background subtraction, erode, erode',
+        'sheet_1',
+        'Index',
+    ]
+    output_path = tmp_path / 'merged.xlsx'
+    write_dataframes(
+        output_path=output_path,
+        dataframes={
+            name: pd.DataFrame({'Value': [number]})
+                for number, name in enumerate(names)
+        },
+        key='Algorithm',
+    )
+
+    sheets = pd.read_excel(
+        output_path,
+        sheet_name=None,
+    )
+    index = sheets.pop('Index')
+
+    # Each sheet is valid and each name is found by its sheet, directly or with the index sheet.
+    assert len(sheets) == len(names)
+    assert all(len(sheet_name) <= SHEET_NAME_LENGTH for sheet_name in sheets)
+    full_names = dict(zip(index['Sheet'], index['Algorithm']))
+    for sheet_name, df in sheets.items():
+        assert names[df['Value'].iloc[0]] == full_names.get(sheet_name, sheet_name)